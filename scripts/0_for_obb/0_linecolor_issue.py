@@ -1,8 +1,13 @@
 # input: 2_raw_json
 # output: 3_new_raw_json
 import os
+import sys
 import json
 
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from labelme_stream import load_labelme
+
 # JSON 파일이 저장된 디렉터리 경로
 json_dir = '../dataset2/2_raw_json'
 
@@ -17,8 +22,8 @@ for filename in os.listdir(json_dir):
     if filename.endswith('.json'):
         filepath = os.path.join(json_dir, filename)
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            # imageData는 어차피 제거하므로 디코딩하지 않고 건너뛰며 읽는다
+            data = load_labelme(filepath)
             
             # 불필요한 필드 제거
             data.pop('lineColor', None)
@@ -1,7 +1,11 @@
 # input: 2_raw_json
 # output: 3_new_raw_json
 import os
-import json
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from labelme_stream import load_labelme, dump_labelme
 
 def process_json_files(input_folder, output_folder, classes_to_keep, new_class_name):
     if not os.path.exists(output_folder):
@@ -10,8 +14,8 @@ def process_json_files(input_folder, output_folder, classes_to_keep, new_class_n
     for filename in os.listdir(input_folder):
         if filename.endswith(".json"):
             file_path = os.path.join(input_folder, filename)
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            # imageData는 디코딩하지 않고 읽는다 (저장할 때 원본 바이트를 그대로 복사한다)
+            data = load_labelme(file_path)
             
             new_shapes = []
             for shape in data.get("shapes", []):
@@ -27,8 +31,7 @@ def process_json_files(input_folder, output_folder, classes_to_keep, new_class_n
 
             # 변경된 JSON을 출력 폴더에 저장
             output_file_path = os.path.join(output_folder, filename)
-            with open(output_file_path, 'w', encoding='utf-8') as output_file:
-                json.dump(data, output_file, indent=4, ensure_ascii=False)
+            dump_labelme(data, output_file_path, image_data_source=file_path, ensure_ascii=False)
 
 # 사용 예제
 input_folder = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/2_raw_json"  # JSON 파일들이 담긴 폴더 경로
@@ -1,8 +1,14 @@
 # input: 3_new_raw_json / 1_images
 # output: 1_2_800images, 4_800labels
 import os
-import json
-from PIL import Image
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from image_resize import build_pyramid, export_level
+from label_codec import write_labels
+from labelme_stream import load_labelme_header
+from labelme_to_yolo import shapes_to_polygons
 
 # 원본 해상도
 ORIGINAL_WIDTH = 3904
@@ -22,41 +28,38 @@ JSON_INPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/3_new_raw_json'
 IMAGE_INPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_images'
 IMAGE_OUTPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_2_800images'
 LABEL_OUTPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/4_800labels'
+# 원본 sha1 기준 해상도 피라미드 캐시 (800 외의 imgsz 실험에도 원본을 다시 디코딩하지 않는다)
+PYRAMID_CACHE_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/pyramid_cache'
+PYRAMID_LEVELS = (TARGET_WIDTH, 1280, 1600)
+NUM_WORKERS = None
 
 # 출력 디렉토리 생성
 os.makedirs(IMAGE_OUTPUT_DIR, exist_ok=True)
 os.makedirs(LABEL_OUTPUT_DIR, exist_ok=True)
 
-def convert_and_resize(json_path):
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # JSON 파일명으로부터 이미지명 추론
-    base_name = os.path.splitext(os.path.basename(json_path))[0]
+def find_image(base_name):
     # 확장자는 사용자가 jpg, png 등 다양할 수 있으므로 뒤에서 찾는다
-    image_file = None
     for ext in ['.jpg', '.png', '.jpeg']:
         candidate = os.path.join(IMAGE_INPUT_DIR, base_name + ext)
         if os.path.exists(candidate):
-            image_file = candidate
-            break
+            return candidate
+    return None
+
+def convert_and_resize(json_path, resized):
+    # shapes / imageWidth / imageHeight만 필요하므로 imageData는 건너뛰며 읽는다
+    data = load_labelme_header(json_path)
     
+    # JSON 파일명으로부터 이미지명 추론
+    base_name = os.path.splitext(os.path.basename(json_path))[0]
+    image_file = find_image(base_name)
     if not image_file:
         print(f"⚠️ 이미지가 없습니다: {base_name}")
         return
     
-    # 이미지 로드 후 리사이즈
-    try:
-        img = Image.open(image_file)
-        img_resized = img.resize((TARGET_WIDTH, TARGET_HEIGHT), Image.LANCZOS)
-    except Exception as e:
-        print(f"❌ 이미지 리사이즈 실패: {image_file}\n{e}")
+    # 이미지 리사이즈는 main에서 피라미드 캐시로 한꺼번에 처리한다 (실패한 이미지는 라벨도 만들지 않는다)
+    if os.path.abspath(image_file) not in resized:
         return
     
-    # 리사이즈된 이미지 저장 (이름은 원본과 동일, 경로만 변경)
-    resized_image_path = os.path.join(IMAGE_OUTPUT_DIR, os.path.basename(image_file))
-    img_resized.save(resized_image_path)
-    
     # 라벨 파일로 저장할 경로
     label_path = os.path.join(LABEL_OUTPUT_DIR, base_name + ".txt")
     
@@ -64,43 +67,13 @@ def convert_and_resize(json_path):
     image_width = data.get('imageWidth', ORIGINAL_WIDTH)
     image_height = data.get('imageHeight', ORIGINAL_HEIGHT)
     
-    # 라벨 파일 생성
-    with open(label_path, 'w', encoding='utf-8') as out_f:
-        for shape in data.get('shapes', []):
-            label = shape.get('label', 'unknown')
-            points = shape.get('points', [])
-
-            if label not in CLASS_NAMES:
-                print(f"⚠️ 알 수 없는 라벨: '{label}' → {json_path}, 스킵")
-                continue
-            class_id = CLASS_NAMES[label]
-
-            # 좌표 정규화 (0..1)
-            if len(points) == 4:  # 꼭짓점 4개 → OBB
-                x_coords = [p[0] / image_width for p in points]
-                y_coords = [p[1] / image_height for p in points]
-                out_f.write(
-                    f"{class_id} " +
-                    " ".join([f"{x:.6f} {y:.6f}" for x, y in zip(x_coords, y_coords)]) + "\n"
-                )
-            elif len(points) == 2:  # 두 점만 있는 경우 → 사각형
-                x1, y1 = points[0]
-                x2, y2 = points[1]
-                rect_points = [
-                    [x1 / image_width, y1 / image_height],  # 좌상단
-                    [x2 / image_width, y1 / image_height],  # 우상단
-                    [x2 / image_width, y2 / image_height],  # 우하단
-                    [x1 / image_width, y2 / image_height],  # 좌하단
-                ]
-                out_f.write(
-                    f"{class_id} " +
-                    " ".join([f"{p[0]:.6f} {p[1]:.6f}" for p in rect_points]) + "\n"
-                )
-            else:
-                print(f"❌ 지원하지 않는 도형 (points = {len(points)}개): {json_path}, 스킵")
-                continue
+    # 꼭짓점 4개(OBB)와 2개(사각형 → 4개 꼭짓점)를 한 번에 정규화해서 라벨 파일로 저장한다
+    class_ids, points, skipped = shapes_to_polygons(data.get('shapes', []), CLASS_NAMES, image_width, image_height)
+    for reason, count in skipped.items():
+        print(f"⚠️ {reason} × {count}: {json_path}, 스킵")
+    write_labels(label_path, class_ids, points.reshape(-1, 8))
     
-    print(f"✅ 변환 완료: {json_path} → {label_path}, 이미지 리사이즈 완료")
+    print(f"✅ 변환 완료: {json_path} → {label_path}")
 
 def main():
     # 모든 JSON 파일 순회
@@ -109,9 +82,14 @@ def main():
         print("❗ JSON 파일이 없습니다.")
         return
     
+    # 원본을 draft 모드 + 프로세스 풀로 한 번만 디코딩해 피라미드를 만들고, 800 해상도를 출력 폴더에 배치한다
+    image_files = [find_image(os.path.splitext(f)[0]) for f in json_files]
+    pyramid = build_pyramid([f for f in image_files if f], PYRAMID_CACHE_DIR, PYRAMID_LEVELS, workers=NUM_WORKERS)
+    export_level(pyramid, (TARGET_WIDTH, TARGET_HEIGHT), IMAGE_OUTPUT_DIR)
+    
     for json_file in json_files:
         json_path = os.path.join(JSON_INPUT_DIR, json_file)
-        convert_and_resize(json_path)
+        convert_and_resize(json_path, pyramid)
 
     print("✅ 모든 변환 및 리사이즈를 완료했습니다.")
 
@@ -2,9 +2,14 @@
 # output: 6_lets_visualize_coco
 # 색상별 바운딩 박스 시각화
 import os
+import sys
 import cv2
 import numpy as np
 
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from label_store import open_labels
+
 # 예시 클래스 매핑 (추가 가능)
 
 CLASS_NAMES = {
@@ -24,11 +29,12 @@ def get_coco_size_label(w, h):
 def visualize_labels(label_dir, image_dir, output_dir, is_obb=True):
     # output 폴더 생성
     os.makedirs(output_dir, exist_ok=True)
+    # label_dir에는 txt 라벨 폴더 또는 라벨 저장소 경로를 줄 수 있다.
+    label_source = open_labels(label_dir, fmt="obb" if is_obb else "yolo")
 
-    for label_file in os.listdir(label_dir):
-        if label_file.endswith('.txt'):
-            base_name = os.path.splitext(label_file)[0]
-            label_path = os.path.join(label_dir, label_file)
+    for base_name in label_source.stems:
+        labels = label_source.get(base_name, "obb" if is_obb else "yolo")
+        if labels is not None:
 
             # 이미지 파일 검색
             for ext in ['.jpg', '.png', '.jpeg']:
@@ -45,19 +51,16 @@ def visualize_labels(label_dir, image_dir, output_dir, is_obb=True):
                 print(f"이미지를 불러올 수 없습니다: {image_path}")
                 continue
 
-            # 라벨 파일 읽기
-            with open(label_path, 'r') as f:
-                labels = f.readlines()
+            # 라벨 읽기 (클래스 ID 배열, 좌표 배열)
+            class_ids, coords = labels
 
-            for label in labels:
-                parts = label.strip().split()
-                class_id = int(parts[0])
+            for class_id, row in zip(class_ids.tolist(), coords):
                 class_name = CLASS_NAMES.get(class_id, f"cls_{class_id}")
 
                 if is_obb:
                     # OBB (Oriented Bounding Box)
-                    # parts[1:] = x1 y1 x2 y2 x3 y3 x4 y4 (정규화)
-                    points = np.array(list(map(float, parts[1:])), dtype=np.float32).reshape(-1, 2)
+                    # row = x1 y1 x2 y2 x3 y3 x4 y4 (정규화)
+                    points = np.array(row, dtype=np.float32).reshape(-1, 2)
                     # 이미지 크기에 맞게 복원
                     points[:, 0] *= image.shape[1]
                     points[:, 1] *= image.shape[0]
@@ -97,7 +100,7 @@ def visualize_labels(label_dir, image_dir, output_dir, is_obb=True):
 
                 else:
                     # YOLO (x_center, y_center, width, height) 정규화
-                    x_center, y_center, w, h = map(float, parts[1:])
+                    x_center, y_center, w, h = map(float, row)
                     iw, ih = image.shape[1], image.shape[0]
                     x_center *= iw
                     y_center *= ih
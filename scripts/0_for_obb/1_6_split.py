@@ -1,7 +1,10 @@
 import os
-import shutil
+import sys
 import random
-from PIL import Image
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from split_backend import place_files
 
 # 디버깅 모드 활성화
 DEBUG = True
@@ -24,6 +27,10 @@ VAL_LABELS = os.path.join(VAL_DIR, "labels")
 # ⚖️ 데이터 분할 비율
 TRAIN_RATIO = 0.8
 
+# 🔗 파일 배치 방식: auto(reflink → hardlink → copy), reflink, hardlink, symlink, copy
+SPLIT_MODE = "auto"
+COPY_WORKERS = 8
+
 # 📂 디렉터리 생성
 for dir_path in [TRAIN_IMAGES, TRAIN_LABELS, VAL_IMAGES, VAL_LABELS]:
     os.makedirs(dir_path, exist_ok=True)
@@ -52,21 +59,23 @@ val_files = matched_files[train_count:]
 if DEBUG:
     print(f"[DEBUG] 학습 데이터: {len(train_files)}, 검증 데이터: {len(val_files)}")
 
-# 📥 파일 복사 함수
-def copy_files(files, image_dst, label_dst):
+# 📥 배치할 (원본, 대상) 목록
+def collect_pairs(files, image_dst, label_dst):
+    pairs = []
     for file in files:
         image_src = os.path.join(IMAGES_DIR, file + ".jpg")
         label_src = os.path.join(LABELS_DIR, file + ".txt")
         
         if os.path.exists(image_src) and os.path.exists(label_src):
-            shutil.copy2(image_src, os.path.join(image_dst, file + ".jpg"))
-            shutil.copy2(label_src, os.path.join(label_dst, file + ".txt"))
+            pairs.append((image_src, os.path.join(image_dst, file + ".jpg")))
+            pairs.append((label_src, os.path.join(label_dst, file + ".txt")))
         else:
             print(f"⚠️ 누락된 파일: {file}")
+    return pairs
 
-# 🚀 파일 복사 실행
-copy_files(train_files, TRAIN_IMAGES, TRAIN_LABELS)
-copy_files(val_files, VAL_IMAGES, VAL_LABELS)
+# 🚀 파일 배치 실행
+pairs = collect_pairs(train_files, TRAIN_IMAGES, TRAIN_LABELS) + collect_pairs(val_files, VAL_IMAGES, VAL_LABELS)
+place_files(pairs, mode=SPLIT_MODE, workers=COPY_WORKERS, name="데이터셋 분할")
 
 print("✅ 데이터셋 분할 완료")
 print(f" - 학습 데이터: {len(train_files)}개")
@@ -1,8 +1,15 @@
 # input: 2_raw_json
 # output: 3_new_raw_json
 import os
+import sys
 import json
 
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from build_manifest import StageManifest
+from labelme_pipeline import clean_fields
+from labelme_stream import load_labelme
+
 # JSON 파일이 저장된 디렉터리 경로
 json_dir = '../dataset/2_raw_json'
 
@@ -10,32 +17,34 @@ json_dir = '../dataset/2_raw_json'
 output_dir = '../dataset/2_raw_json'
 os.makedirs(output_dir, exist_ok=True)
 
+# 증분 빌드 매니페스트 (이미 정리된 파일은 다시 쓰지 않는다)
+manifest = StageManifest('0_linecolor_issue', output_dir,
+                         params={'json_dir': os.path.abspath(json_dir), 'indent': 4})
+
 # 변환된 파일 수 카운트
 converted_count = 0
+skipped_count = 0
 
 for filename in os.listdir(json_dir):
     if filename.endswith('.json'):
         filepath = os.path.join(json_dir, filename)
+        output_filepath = os.path.join(output_dir, filename)
+        if manifest.is_current(filename, [filepath], [output_filepath]):
+            skipped_count += 1
+            continue
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            # imageData는 어차피 제거하므로 디코딩하지 않고 건너뛰며 읽는다
+            data = load_labelme(filepath)
             
-            # 불필요한 필드 제거
-            data.pop('lineColor', None)
-            data.pop('fillColor', None)
-            data.pop('imageData', None)  # 필요에 따라 제거
-            
-            # 'shapes' 내의 각 객체에서 불필요한 필드 제거
-            for shape in data.get('shapes', []):
-                shape.pop('lineColor', None)
-                shape.pop('fillColor', None)
-                shape.pop('flags', None)  # 필요에 따라 제거
+            # 불필요한 필드 제거 (최상위 lineColor/fillColor/imageData, shapes의 lineColor/fillColor/flags)
+            data = clean_fields(data)
             
             # 변환된 JSON 파일 저장
-            output_filepath = os.path.join(output_dir, filename)
             with open(output_filepath, 'w', encoding='utf-8') as file:
                 json.dump(data, file, indent=4)
             
+            # 입력과 출력이 같은 폴더면 정리된 파일의 해시가 기록되므로 다음 실행에서는 스킵된다
+            manifest.record(filename, [filepath], [output_filepath])
             print(f"✅ {filename} 변환 완료")
             converted_count += 1
         
@@ -44,4 +53,8 @@ for filename in os.listdir(json_dir):
         except Exception as e:
             print(f"❌ 오류 발생: {filename} - {e}")
 
-print(f"\n✅ 총 {converted_count}개의 JSON 파일이 변환되었습니다.")
+for key in manifest.stale_keys():
+    manifest.forget(key)
+manifest.save()
+
+print(f"\n✅ 총 {converted_count}개의 JSON 파일이 변환되었습니다. (변경 없음 스킵: {skipped_count}개)")
@@ -1,7 +1,13 @@
 # convert_json.py
 
 import os
-import json
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from build_manifest import StageManifest
+from labelme_pipeline import filter_classes
+from labelme_stream import load_labelme, dump_labelme
 
 # 클래스 이름과 ID 매핑
 category_map = {
@@ -22,28 +28,38 @@ def process_json_files(input_folder, output_folder, category_map):
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
+    # 클래스 매핑이 바뀌면 전체를, 아니면 바뀐 JSON만 다시 처리한다
+    manifest = StageManifest('1_0_convert_json_to_11_class', output_folder,
+                             params={'category_map': category_map})
+    converted_count = 0
+    skipped_count = 0
+
     for filename in os.listdir(input_folder):
         if filename.endswith(".json"):
             file_path = os.path.join(input_folder, filename)
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-            
-            new_shapes = []
-            for shape in data.get("shapes", []):
-                label = shape["label"]
-                
-                # category_map에 존재하는 클래스만 남기기
-                if label in category_map:
-                    # label을 그대로 두고, category_id를 매핑된 값으로 저장
-                    shape["category_id"] = category_map[label]
-                    new_shapes.append(shape)
+            output_file_path = os.path.join(output_folder, filename)
+            if manifest.is_current(filename, [file_path], [output_file_path]):
+                skipped_count += 1
+                continue
+
+            # imageData는 디코딩하지 않고 읽는다 (저장할 때 원본 바이트를 그대로 복사한다)
+            data = load_labelme(file_path)
             
-            data["shapes"] = new_shapes
+            # category_map에 존재하는 클래스만 남기고, label은 그대로 두고 category_id를 매핑된 값으로 저장
+            data = filter_classes(data, category_map)
 
             # 변경된 JSON을 출력 폴더에 저장
-            output_file_path = os.path.join(output_folder, filename)
-            with open(output_file_path, 'w', encoding='utf-8') as output_file:
-                json.dump(data, output_file, indent=4, ensure_ascii=False)
+            dump_labelme(data, output_file_path, image_data_source=file_path, ensure_ascii=False)
+
+            manifest.record(filename, [file_path], [output_file_path])
+            converted_count += 1
+
+    # 원본이 삭제된 JSON의 출력도 정리한다
+    for key in manifest.stale_keys():
+        manifest.forget(key, remove_outputs=True)
+    manifest.save()
+
+    print(f"✅ 변환 {converted_count}개, 변경 없음 스킵 {skipped_count}개")
 
 if __name__ == "__main__":
     input_folder = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/2_raw_json_labels"
@@ -0,0 +1,65 @@
+# input: 2_raw_json_labels
+# output: 3_new_raw_json_labels (선택), 4_0_800size_txt_labels
+# 0_linecolor_issue.py → 1_0_convert_json_to_11_class.py → 1_2_0_convert_jsonlabel_to_txt.py 를
+# 한 번의 JSON 읽기로 처리하는 통합 단계이다.
+import os
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from labelme_pipeline import clean_fields, class_filter
+from labelme_to_yolo import convert_directory
+from build_manifest import StageManifest
+
+# 원본 해상도 (원본은 3904, 변환된 해상도는 800)
+ORIGINAL_WIDTH = 3904
+ORIGINAL_HEIGHT = 3904
+TARGET_WIDTH = 800
+TARGET_HEIGHT = 800
+
+# 클래스 매핑 (YOLO 형식은 숫자 클래스 ID를 사용함)
+CLASS_NAMES = {
+    'Chip': 0,
+    'Solder': 1,
+    '2sideIC': 2,
+    'SOD': 3,
+    'Circle': 4,
+    '4sideIC': 5,
+    'Tantalum': 6,
+    'BGA': 7,
+    'MELF': 8,
+    'Crystal': 9,
+    'Array': 10
+}
+
+# 디렉토리 설정
+JSON_INPUT_DIR = '/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/2_raw_json_labels'
+# 정리/필터된 JSON이 필요 없으면 None으로 두면 YOLO txt만 만든다.
+JSON_OUTPUT_DIR = '/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/3_new_raw_json_labels'
+LABEL_OUTPUT_DIR = '/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/4_0_800size_txt_labels'
+
+# 적용할 단계 (순서대로 적용되며, 필요 없는 단계는 빼거나 다른 함수를 끼워 넣을 수 있다)
+STAGES = [
+    clean_fields,               # lineColor / fillColor / imageData / flags 제거
+    class_filter(CLASS_NAMES),  # CLASS_NAMES에 있는 클래스만 남기고 category_id 기록
+]
+
+# 병렬 변환 설정 (None이면 CPU 코어 수만큼 워커를 사용)
+NUM_WORKERS = None
+CHUNK_SIZE = 64
+
+def main():
+    manifest = StageManifest('1_0_fused_clean_filter_convert', LABEL_OUTPUT_DIR, params={
+        'ORIGINAL_WIDTH': ORIGINAL_WIDTH, 'ORIGINAL_HEIGHT': ORIGINAL_HEIGHT,
+        'TARGET_WIDTH': TARGET_WIDTH, 'TARGET_HEIGHT': TARGET_HEIGHT,
+        'CLASS_NAMES': CLASS_NAMES,
+        'STAGES': [getattr(stage, 'func', stage).__name__ for stage in STAGES],
+        'JSON_OUTPUT_DIR': JSON_OUTPUT_DIR
+    })
+    convert_directory(JSON_INPUT_DIR, LABEL_OUTPUT_DIR, CLASS_NAMES,
+                      ORIGINAL_WIDTH, ORIGINAL_HEIGHT,
+                      workers=NUM_WORKERS, chunk_size=CHUNK_SIZE, manifest=manifest,
+                      stages=STAGES, json_output_dir=JSON_OUTPUT_DIR)
+
+if __name__ == "__main__":
+    main()
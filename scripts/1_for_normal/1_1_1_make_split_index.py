@@ -0,0 +1,113 @@
+# input: 1_1_800images, 4_0_800size_txt_labels
+# output: pool/images, pool/labels (링크), splits/<버전>/{train,val,test}.txt, split.json, dataset.yaml
+# 1_1_split_jsons_to_train&valid.py 처럼 train/val 폴더로 복사하지 않고 목록 파일만 만든다.
+# 학습할 때는 splits/<버전>/dataset.yaml을 data로 넘긴다.
+import os
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from split_backend import place_files
+from split_index import build_pool, create_kfold, create_split, next_version, write_split
+from stratified_split import stratified_kfold, stratified_split, stems_to_paths
+
+DATASET_DIR = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset"
+IMAGES_DIR = os.path.join(DATASET_DIR, "1_1_800images")
+LABELS_DIR = os.path.join(DATASET_DIR, "4_0_800size_txt_labels")
+
+# ultralytics가 이미지 경로의 /images/를 /labels/로 바꿔 라벨을 찾으므로 이미지 풀은 images/labels 구조로 둔다
+POOL_DIR = os.path.join(DATASET_DIR, "pool")
+SPLIT_ROOT = os.path.join(DATASET_DIR, "splits")
+BASE_YAML = os.path.join(DATASET_DIR, "dataset.yaml")
+
+SEED = 0
+RATIOS = {"train": 0.8, "val": 0.2, "test": 0.0}
+KFOLD = 0          # 0이면 단일 분할, 2 이상이면 k-fold 분할을 만든다
+VERSION = None     # None이면 v001, v002 ... 순서로 새 버전을 만든다
+SPLIT_MODE = "auto"
+
+# 클래스 × 크기(small/medium/large) 층화 분할 (False면 시드 고정 무작위 분할)
+STRATIFY = True
+NUM_CLASSES = 11
+CLASS_NAMES = ['Chip', 'CSolder', '2sideIC', 'SOD', 'Circle', '4sideIC', 'Tantalum', 'BGA', 'MELF', 'Crystal', 'Array']
+
+
+def is_stale(src_stat, dst):
+    """풀 파일이 없거나(깨진 링크 포함) 원본과 크기/수정 시각이 다르면 True (copy2/reflink는 수정 시각을 그대로 옮긴다)."""
+    try:
+        dst_stat = os.stat(dst)
+    except OSError:
+        return True
+    return dst_stat.st_size != src_stat.st_size or dst_stat.st_mtime_ns != src_stat.st_mtime_ns
+
+
+def sync_pool():
+    """
+    원본 이미지/라벨 폴더를 이미지 풀로 링크한다.
+    바뀌지 않은 파일은 건너뛰고, 원본이 바뀐 파일(예: 다시 라벨링한 txt)은 다시 배치하며, 원본에서 지운 파일은 풀에서도 지운다.
+    """
+    pairs, removed = [], 0
+    for src_dir, sub, ext in [(IMAGES_DIR, "images", ".jpg"), (LABELS_DIR, "labels", ".txt")]:
+        dst_dir = os.path.join(POOL_DIR, sub)
+        os.makedirs(dst_dir, exist_ok=True)
+        with os.scandir(src_dir) as entries:
+            sources = {e.name: e for e in entries if e.name.lower().endswith(ext)}
+        with os.scandir(dst_dir) as entries:
+            for e in entries:
+                if e.name.lower().endswith(ext) and e.name not in sources:
+                    os.unlink(e.path)
+                    removed += 1
+        for name, e in sources.items():
+            dst = os.path.join(dst_dir, name)
+            if is_stale(e.stat(), dst):
+                pairs.append((e.path, dst))
+    if removed:
+        print(f"🗑️ 원본에서 지워진 풀 파일 {removed}개를 지웠습니다.")
+    if pairs:
+        place_files(pairs, mode=SPLIT_MODE, name="이미지 풀 동기화")
+
+
+def make_stratified():
+    """이미지 풀의 라벨로 층화 분할을 만든다."""
+    image_dir = os.path.join(POOL_DIR, "images")
+    label_dir = os.path.join(POOL_DIR, "labels")
+    pool_stems = [os.path.splitext(os.path.basename(p))[0] for p in build_pool(POOL_DIR)]
+    version = VERSION or next_version(SPLIT_ROOT)
+    meta = {'version': version, 'pool': os.path.abspath(POOL_DIR), 'seed': SEED, 'stratified': True}
+
+    if KFOLD >= 2:
+        folds = stratified_kfold(label_dir, KFOLD, NUM_CLASSES, seed=SEED, class_names=CLASS_NAMES,
+                                 only=pool_stems)
+        split_dirs = []
+        for i, fold in enumerate(folds):
+            split_dir = os.path.join(SPLIT_ROOT, version, f"fold{i}")
+            write_split(split_dir, {name: stems_to_paths(stems, image_dir) for name, stems in fold.items()},
+                        BASE_YAML, meta={**meta, 'fold': i, 'k': KFOLD})
+            split_dirs.append(split_dir)
+        return split_dirs
+
+    names = [n for n in ("train", "val", "test") if RATIOS.get(n, 0) > 0]
+    fold_of, _ = stratified_split(label_dir, [RATIOS[n] for n in names], NUM_CLASSES, seed=SEED,
+                                  fold_names=names, class_names=CLASS_NAMES, only=pool_stems)
+    splits = {name: stems_to_paths(sorted(s for s, f in fold_of.items() if f == i), image_dir)
+              for i, name in enumerate(names)}
+    return [create_split(POOL_DIR, SPLIT_ROOT, ratios=RATIOS, seed=SEED, base_yaml=BASE_YAML,
+                         version=version, splits=splits)]
+
+
+def main():
+    sync_pool()
+    if STRATIFY:
+        split_dirs = make_stratified()
+    elif KFOLD >= 2:
+        split_dirs = create_kfold(POOL_DIR, SPLIT_ROOT, k=KFOLD, seed=SEED, base_yaml=BASE_YAML, version=VERSION)
+    else:
+        split_dirs = [create_split(POOL_DIR, SPLIT_ROOT, ratios=RATIOS, seed=SEED, base_yaml=BASE_YAML, version=VERSION)]
+
+    print("✅ 분할 생성 완료")
+    for split_dir in split_dirs:
+        print(f" - {os.path.join(split_dir, 'dataset.yaml')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 import os
-import shutil
+import sys
 import random
 
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from build_manifest import StageManifest
+from split_backend import place_files
+from stratified_split import stratified_split
+
 DEBUG = True
 
 # 📁 데이터셋 경로 설정
@@ -18,6 +24,16 @@ VAL_IMAGES_DIR   = os.path.join(DATASET_DIR, "4_4_val_image")
 # ⚖️ 데이터 분할 비율 (학습:검증 = 80:20)
 TRAIN_RATIO = 0.8
 
+# 📊 클래스 × 크기(small/medium/large) 층화 분할 (False면 기존처럼 무작위 분할)
+STRATIFY = True
+NUM_CLASSES = 11
+CLASS_NAMES = ['Chip', 'CSolder', '2sideIC', 'SOD', 'Circle', '4sideIC', 'Tantalum', 'BGA', 'MELF', 'Crystal', 'Array']
+SEED = 0
+
+# 🔗 파일 배치 방식: auto(reflink → hardlink → copy), reflink, hardlink, symlink, copy
+SPLIT_MODE = "auto"
+COPY_WORKERS = 8
+
 # 📂 출력 디렉터리 생성
 for dir_path in [TRAIN_LABELS_DIR, VAL_LABELS_DIR, TRAIN_IMAGES_DIR, VAL_IMAGES_DIR]:
     os.makedirs(dir_path, exist_ok=True)
@@ -39,31 +55,83 @@ if DEBUG:
 if not matched_files:
     raise ValueError("⚠️ 이미지와 라벨이 매칭된 파일이 없습니다. 파일 이름을 확인하세요.")
 
-# 🔄 데이터 분할 (무작위 섞은 후 80%는 학습용, 20%는 검증용)
-random.shuffle(matched_files)
-train_count = int(len(matched_files) * TRAIN_RATIO)
-train_files = matched_files[:train_count]
-val_files = matched_files[train_count:]
+# 🧾 증분 분할 매니페스트: 이미 분할된 파일은 기존 배정(train/val)을 그대로 유지하고,
+# 새로 추가된 파일만 (층화 또는 무작위로) 배정해서 전체 비율이 TRAIN_RATIO에 가깝도록 맞춘다.
+manifest = StageManifest("1_1_split_jsons", DATASET_DIR, params={
+    "TRAIN_RATIO": TRAIN_RATIO,
+    "IMAGES_DIR": IMAGES_DIR,
+    "LABELS_DIR": LABELS_DIR
+}, output_dirs=[TRAIN_LABELS_DIR, VAL_LABELS_DIR, TRAIN_IMAGES_DIR, VAL_IMAGES_DIR])
+
+assignment = {}
+new_files = []
+for file in matched_files:
+    entry = manifest.get(file)
+    if entry is not None:
+        assignment[file] = entry["split"]
+    else:
+        new_files.append(file)
+
+# 🔄 데이터 분할 (새 파일만 학습/검증에 배정)
+if STRATIFY:
+    # 기존 배정은 고정한 채로, 새 파일을 클래스/크기 분포가 비율에 맞도록 배정한다
+    split_ids = {"train": 0, "val": 1}
+    fold_of, _ = stratified_split(LABELS_DIR, [TRAIN_RATIO, 1 - TRAIN_RATIO], NUM_CLASSES, seed=SEED,
+                                  fixed={f: split_ids[s] for f, s in assignment.items()},
+                                  fold_names=["train", "val"], class_names=CLASS_NAMES, only=matched_files)
+    for file in new_files:
+        assignment[file] = "train" if fold_of[file] == 0 else "val"
+else:
+    random.shuffle(new_files)
+    target_train = int(len(matched_files) * TRAIN_RATIO)
+    existing_train = sum(1 for split in assignment.values() if split == "train")
+    new_train_count = min(max(target_train - existing_train, 0), len(new_files))
+    for i, file in enumerate(new_files):
+        assignment[file] = "train" if i < new_train_count else "val"
+
+train_files = [f for f in matched_files if assignment[f] == "train"]
+val_files = [f for f in matched_files if assignment[f] == "val"]
 
 if DEBUG:
-    print(f"[DEBUG] 학습 데이터: {len(train_files)}개, 검증 데이터: {len(val_files)}개")
+    print(f"[DEBUG] 학습 데이터: {len(train_files)}개, 검증 데이터: {len(val_files)}개 (신규 {len(new_files)}개)")
 
-# 📥 파일 복사 함수
-def copy_files(files, image_dst, label_dst):
+# 📥 배치할 파일 목록 (내용이 바뀌지 않았고 배치된 파일이 남아 있으면 건너뛴다)
+def collect_pairs(files, image_dst, label_dst, split):
+    jobs = []
     for file in files:
         image_src = os.path.join(IMAGES_DIR, file + ".jpg")
         label_src = os.path.join(LABELS_DIR, file + ".txt")
+        image_out = os.path.join(image_dst, file + ".jpg")
+        label_out = os.path.join(label_dst, file + ".txt")
         
         if os.path.exists(image_src) and os.path.exists(label_src):
-            shutil.copy2(image_src, os.path.join(image_dst, file + ".jpg"))
-            shutil.copy2(label_src, os.path.join(label_dst, file + ".txt"))
+            if manifest.is_current(file, [image_src, label_src], [image_out, label_out]):
+                continue
+            jobs.append((file, split, [image_src, label_src], [image_out, label_out]))
         else:
             print(f"⚠️ 누락된 파일: {file}")
+    return jobs
+
+# 🚀 파일 배치 실행 (학습 데이터와 검증 데이터 각각)
+jobs = collect_pairs(train_files, TRAIN_IMAGES_DIR, TRAIN_LABELS_DIR, "train")
+jobs += collect_pairs(val_files, VAL_IMAGES_DIR, VAL_LABELS_DIR, "val")
+pairs = [pair for _, _, srcs, dsts in jobs for pair in zip(srcs, dsts)]
+placed, _, _ = place_files(pairs, mode=SPLIT_MODE, workers=COPY_WORKERS, name="데이터셋 분할")
+placed = set(placed)
+
+copied = 0
+for file, split, srcs, dsts in jobs:
+    # 이미지와 라벨이 모두 배치된 경우에만 기록한다
+    if all(pair in placed for pair in zip(srcs, dsts)):
+        manifest.record(file, srcs, dsts, split=split)
+        copied += 1
 
-# 🚀 파일 복사 실행 (학습 데이터와 검증 데이터 각각)
-copy_files(train_files, TRAIN_IMAGES_DIR, TRAIN_LABELS_DIR)
-copy_files(val_files, VAL_IMAGES_DIR, VAL_LABELS_DIR)
+# 🧹 원본에서 사라진 파일은 분할 결과에서도 삭제한다
+for key in manifest.stale_keys():
+    manifest.forget(key, remove_outputs=True)
+manifest.save()
 
 print("✅ 데이터셋 분할 완료")
 print(f" - 학습 데이터: {len(train_files)}개")
 print(f" - 검증 데이터: {len(val_files)}개")
+print(f" - 새로 배치한 파일: {copied}개 (나머지는 변경 없음)")
@@ -1,101 +1,89 @@
 import os
-import cv2
+import sys
+import hashlib
 import albumentations as A
 from glob import glob
 
-print("Initializing Data Augmentation...")
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from build_manifest import StageManifest
+from label_store import open_labels
+from pcb_augment import SAMPLE_INDEX_NAME, get_augmentation, run_augmentation, write_sample_index
 
 # 원본 이미지와 라벨, 출력 디렉토리 경로를 설정한다.
+# input_labels는 txt 라벨 폴더 또는 label_store.py로 만든 라벨 저장소 경로이다.
 input_images = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/1_1_800images"
 input_labels = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/4_1_train_txt"
 output_dir = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/yolo_augmented_output"
 
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
-    print(f"Created output directory: {output_dir}")
+NUM_AUGMENTATIONS = 10
+BASE_SEED = 0            # 같은 시드면 워커 수와 상관없이 같은 증강 결과가 나온다
+NUM_WORKERS = None       # None이면 CPU 코어 수만큼, 1이면 현재 프로세스에서 실행한다
+CHUNK_SIZE = 4           # 워커에 한 번에 넘기는 이미지 수
+WRITE_QUEUE_SIZE = 32    # 워커별 저장 대기열 크기 (가득 차면 증강이 저장을 기다린다)
+# False면 증강 이미지를 저장하지 않고 샘플별 시드/변환 기록(aug_samples.jsonl)만 남긴다.
+# 필요한 샘플은 1_2_3_aug_regenerate.py로 언제든 같은 결과로 다시 만들 수 있다.
+MATERIALIZE = True
 
-# 다양한 증강 기법을 적용한다.
-def get_augmentation():
-    return A.Compose([
-        A.HorizontalFlip(p=0.5),
-        A.VerticalFlip(p=0.2),
-        A.RandomRotate90(p=0.5),
-        A.ShiftScaleRotate(shift_limit=0.0625, scale_limit=0.1, rotate_limit=15,
-                           interpolation=cv2.INTER_LINEAR, border_mode=cv2.BORDER_CONSTANT, p=0.5),
-        A.RandomSizedBBoxSafeCrop(height=640, width=640, p=0.5),
-        A.RandomBrightnessContrast(brightness_limit=0.3, contrast_limit=0.3, p=0.5),
-        A.HueSaturationValue(hue_shift_limit=20, sat_shift_limit=20, val_shift_limit=20, p=0.5),
-        A.MotionBlur(blur_limit=7, p=0.3),
-        A.GaussNoise(var_limit=(5.0, 20.0), p=0.3),
-        A.CLAHE(clip_limit=2.0, tile_grid_size=(8, 8), p=0.3)
-    ], bbox_params=A.BboxParams(format='yolo', label_fields=['category']))
 
-# 한 이미지에 대해 증강을 적용하는 함수이다.
-def augment_data(image_path, label_path, output_dir, num_augmentations=10):
-    print(f"Processing: {image_path}")
-    image = cv2.imread(image_path)
-    if image is None:
-        print(f"Error: Could not read image {image_path}")
-        return
-    print(f"Loaded image: {image_path} with shape {image.shape}")
-    
-    with open(label_path, "r") as f:
-        labels = f.readlines()
-    
-    bboxes = []
-    categories = []
-    for label in labels:
-        data = label.strip().split()
-        if len(data) < 5:
-            print(f"Warning: Skipping invalid label {label} in {label_path}")
+def main():
+    print("Initializing Data Augmentation...")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"Created output directory: {output_dir}")
+
+    # 증강 설정, 증강 횟수, 시드가 바뀌면 전체를, 아니면 새로 추가되거나 바뀐 이미지만 증강한다.
+    manifest = StageManifest("1_2_1_yolo_aug", output_dir, params={
+        "augmentation": A.to_dict(get_augmentation()),
+        "num_augmentations": NUM_AUGMENTATIONS,
+        "base_seed": BASE_SEED,
+        "materialize": MATERIALIZE
+    }, output_dirs=[output_dir])
+
+    # 원본 이미지 목록을 가져와서 각 이미지에 대해 증강을 적용한다.
+    image_paths = sorted(glob(os.path.join(input_images, "*.jpg")))
+    print(f"Found {len(image_paths)} images")
+
+    # 라벨은 txt 폴더든 라벨 저장소든 같은 방식으로 읽는다.
+    label_source = open_labels(input_labels)
+
+    tasks = []
+    label_digests = {}
+    skipped = 0
+    for img_path in image_paths:
+        # 이미지 파일의 기본 이름으로 대응되는 라벨을 찾는다.
+        base_name = os.path.splitext(os.path.basename(img_path))[0]
+        labels = label_source.get(base_name)
+        if labels is None:
+            print(f"Warning: Label file not found for {img_path}")
             continue
-        class_id = int(data[0])
-        bbox = list(map(float, data[1:]))
-        bboxes.append(bbox)
-        categories.append(class_id)
-        
-    if not bboxes:
-        print(f"Warning: No valid bounding boxes found in {label_path}")
-        return
-        
-    print(f"Applying augmentations to {image_path}")
-    successful = 0
-    attempts = 0
-    max_attempts = num_augmentations * 3  # 실패 시 재시도 최대 횟수 설정
-    while successful < num_augmentations and attempts < max_attempts:
-        attempts += 1
-        transform = get_augmentation()
-        try:
-            augmented = transform(image=image, bboxes=bboxes, category=categories)
-        except ValueError as e:
-            print(f"Warning: Augmentation failed with error: {e}. Retrying...")
+        key = os.path.basename(img_path)
+        # 라벨은 파일이 아닐 수도 있으므로 내용 해시로 변경 여부를 판단한다.
+        label_digest = hashlib.sha1(labels[0].tobytes() + labels[1].tobytes()).hexdigest()
+        if manifest.is_current(key, [img_path], label_digest=label_digest):
+            skipped += 1
             continue
-        
-        aug_image = augmented['image']
-        aug_bboxes = augmented['bboxes']
-        aug_labels = augmented['category']
-        
-        aug_image_path = os.path.join(output_dir, f"aug_{successful+1}_" + os.path.basename(image_path))
-        cv2.imwrite(aug_image_path, aug_image)
-        
-        aug_label_path = os.path.join(output_dir, f"aug_{successful+1}_" + os.path.basename(label_path))
-        with open(aug_label_path, "w") as f:
-            for bbox, cls in zip(aug_bboxes, aug_labels):
-                f.write(f"{cls} " + " ".join(map(str, bbox)) + "\n")
-        print(f"Saved: {aug_image_path}")
-        successful += 1
-    if successful < num_augmentations:
-        print(f"Warning: Only {successful} augmentations were generated for {image_path} after {attempts} attempts.")
+        label_digests[img_path] = label_digest
+        # 저장소 라벨은 mmap 슬라이스이므로 워커로 넘기기 전에 복사한다.
+        tasks.append((img_path, labels[0].copy(), labels[1].copy(), base_name + ".txt"))
+    print(f"Skipped {skipped} unchanged images, augmenting {len(tasks)} images")
+
+    for img_path, outputs, samples in run_augmentation(tasks, output_dir, NUM_AUGMENTATIONS, BASE_SEED,
+                                                       workers=NUM_WORKERS, chunk_size=CHUNK_SIZE,
+                                                       queue_size=WRITE_QUEUE_SIZE, materialize=MATERIALIZE):
+        manifest.record(os.path.basename(img_path), [img_path], outputs,
+                        label_digest=label_digests[img_path], samples=samples)
+
+    # 원본이 사라진 이미지의 증강 결과는 삭제한다.
+    for key in manifest.stale_keys():
+        manifest.forget(key, remove_outputs=True)
+    manifest.save()
+
+    # 샘플별 시드와 적용된 변환을 한 줄에 하나씩 기록한다 (재생성/추적용).
+    index_path = os.path.join(output_dir, SAMPLE_INDEX_NAME)
+    write_sample_index(manifest, index_path)
+    print(f"Sample index: {index_path}")
 
-# 원본 이미지 목록을 가져와서 각 이미지에 대해 증강을 적용한다.
-image_paths = glob(os.path.join(input_images, "*.jpg"))
-print(f"Found {len(image_paths)} images")
 
-for img_path in image_paths:
-    # 이미지 파일의 기본 이름을 추출하여 대응되는 라벨 파일을 구성한다.
-    base_name = os.path.splitext(os.path.basename(img_path))[0]
-    label_path = os.path.join(input_labels, base_name + ".txt")
-    if os.path.exists(label_path):
-        augment_data(img_path, label_path, output_dir, num_augmentations=10)
-    else:
-        print(f"Warning: Label file not found for {img_path}")
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,20 @@
 import os
+import sys
 import random
 import cv2
 import matplotlib.pyplot as plt
 from glob import glob
 
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from label_store import open_labels
+
 print("바운딩 박스 시각화 코드를 실행한다.")
 
 # 증강된 이미지와 라벨이 저장된 폴더 경로를 지정한다.
 augmented_dir = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/5_1_yolo_augmented_output"
+# 라벨은 증강 폴더의 txt를 읽는다 (label_store.py로 만든 라벨 저장소 경로로 바꿔도 된다).
+label_source = open_labels(augmented_dir)
 # 시각화 결과를 저장할 폴더가 필요할 경우 생성한다.
 visualized_output_dir = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/5_2_yolo_augmented_visualized"
 if not os.path.exists(visualized_output_dir):
@@ -33,22 +40,15 @@ for ax, img_path in zip(axes, sample_images):
         continue
     image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
     
-    # 이미지 파일명에서 확장자를 제거하여 라벨 파일명을 구성한다.
+    # 이미지 파일명에서 확장자를 제거하여 라벨 이름을 구성한다.
     base_name = os.path.splitext(os.path.basename(img_path))[0]
-    label_path = os.path.join(augmented_dir, base_name + ".txt")
+    labels = label_source.get(base_name)
     
-    # 라벨 파일이 존재하면 YOLO 형식의 바운딩 박스 정보를 읽는다.
-    if os.path.exists(label_path):
-        with open(label_path, "r") as f:
-            lines = f.readlines()
+    # 라벨이 존재하면 YOLO 형식의 바운딩 박스 정보를 읽는다.
+    if labels is not None:
         img_h, img_w, _ = image.shape
-        for line in lines:
-            parts = line.strip().split()
-            if len(parts) != 5:
-                continue
-            # 첫 번째 값은 클래스 번호, 이후 값들은 x_center, y_center, width, height이다.
-            cls = parts[0]
-            x_center, y_center, w, h = map(float, parts[1:])
+        # 클래스 번호와 x_center, y_center, width, height 배열이다.
+        for cls, (x_center, y_center, w, h) in zip(labels[0].tolist(), labels[1].tolist()):
             # YOLO 좌표를 픽셀 좌표로 변환한다.
             x_min = int((x_center - w / 2) * img_w)
             y_min = int((y_center - h / 2) * img_h)
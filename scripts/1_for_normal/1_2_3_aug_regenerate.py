@@ -0,0 +1,43 @@
+# input: yolo_augmented_output/aug_samples.jsonl (1_2_1_yolo_aug.py가 남긴 샘플 기록), 1_1_800images, 4_1_train_txt
+# output: yolo_augmented_output (기록된 이름 그대로 증강 이미지/라벨을 다시 만든다)
+import os
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pcb_augment import SAMPLE_INDEX_NAME, load_sample_index, regenerate_samples
+
+# 1_2_1_yolo_aug.py 와 같은 경로를 사용한다.
+input_labels = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/4_1_train_txt"
+augmented_dir = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/yolo_augmented_output"
+output_dir = augmented_dir
+
+# 다시 만들 증강 이미지 이름 목록 (예: ["aug_3_board_001.jpg"]). None이면 디스크에 없는 샘플을 모두 만든다.
+SAMPLES = None
+NUM_WORKERS = None
+
+
+def main():
+    index_path = os.path.join(augmented_dir, SAMPLE_INDEX_NAME)
+    if not os.path.exists(index_path):
+        print(f"❌ 샘플 기록이 없습니다: {index_path} (먼저 1_2_1_yolo_aug.py를 실행하세요)")
+        return
+    index = load_sample_index(index_path)
+
+    if SAMPLES is None:
+        records = [r for name, r in index.items()
+                   if not (os.path.exists(os.path.join(output_dir, name))
+                           and os.path.exists(os.path.join(output_dir, r['label'])))]
+    else:
+        missing = [name for name in SAMPLES if name not in index]
+        for name in missing:
+            print(f"⚠️ 기록에 없는 샘플: {name}")
+        records = [index[name] for name in SAMPLES if name in index]
+
+    print(f"ℹ️ 전체 샘플 {len(index)}개 중 {len(records)}개를 다시 만든다.")
+    if records:
+        regenerate_samples(records, input_labels, output_dir, workers=NUM_WORKERS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# input: 원본 이미지(3904×3904), 4_800size_txt_labels (정규화 좌표라 원본 해상도에도 그대로 맞는다)
+# output: 5_tiles/images, 5_tiles/labels (원본을 겹치는 타일로 자른 학습 데이터)
+import os
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from build_manifest import StageManifest
+from tile_dataset import tile_dataset
+
+# 디렉토리 설정
+IMAGE_INPUT_DIR = '/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/1_images'
+LABEL_INPUT_DIR = '/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/4_800size_txt_labels'
+OUTPUT_DIR = '/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/5_tiles'
+
+# 타일 설정 (원본 픽셀 기준)
+LABEL_FORMAT = 'yolo'   # 0_for_obb 라벨이면 'obb'
+TILE_SIZE = 1600        # 원본에서 잘라낼 타일 크기
+TILE_OVERLAP = 0.2      # 이웃 타일과 겹치는 비율
+OUTPUT_SIZE = 800       # 저장할 타일 크기 (None이면 TILE_SIZE 그대로)
+MIN_VISIBILITY = 0.5    # 잘린 뒤 원래 면적의 이 비율 이상 남은 박스만 남긴다
+KEEP_EMPTY = False      # 박스가 없는 타일도 저장할지
+
+# 병렬 처리 설정 (None이면 CPU 코어 수만큼 워커를 사용)
+NUM_WORKERS = None
+CHUNK_SIZE = 4
+
+def main():
+    # 타일 설정이 바뀌면 예전 타일을 지우고 전체를, 아니면 원본 이미지나 라벨이 바뀐 이미지만 다시 자른다
+    manifest = StageManifest('1_2_4_make_tiles', OUTPUT_DIR, params={
+        'LABEL_FORMAT': LABEL_FORMAT, 'TILE_SIZE': TILE_SIZE, 'TILE_OVERLAP': TILE_OVERLAP,
+        'OUTPUT_SIZE': OUTPUT_SIZE, 'MIN_VISIBILITY': MIN_VISIBILITY, 'KEEP_EMPTY': KEEP_EMPTY
+    }, output_dirs=[os.path.join(OUTPUT_DIR, 'images'), os.path.join(OUTPUT_DIR, 'labels')])
+    tile_dataset(IMAGE_INPUT_DIR, LABEL_INPUT_DIR, OUTPUT_DIR, fmt=LABEL_FORMAT,
+                 tile_size=TILE_SIZE, overlap=TILE_OVERLAP, output_size=OUTPUT_SIZE,
+                 min_visibility=MIN_VISIBILITY, keep_empty=KEEP_EMPTY,
+                 workers=NUM_WORKERS, chunk_size=CHUNK_SIZE, manifest=manifest)
+
+if __name__ == "__main__":
+    main()
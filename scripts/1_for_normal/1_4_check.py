@@ -1,40 +1,30 @@
 # input: 1_2_800images, 4_800labels
-# output: ✅ 모든 이미지와 라벨 파일이 정확히 일치합니다.
+# output: ✅ 모든 검사를 통과했습니다. (문제 목록은 REPORT_PATH의 JSON 보고서에 기록된다)
 import os
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_audit import audit_dataset, load_num_classes, print_report
 
 # 경로 설정
 IMAGES_DIR = '/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/1_1_800images'
 LABELS_DIR = '/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/4_800size_txt_labels'
+REPORT_PATH = os.path.join(os.path.dirname(LABELS_DIR), 'audit_1_4_check.json')
 
-# 지원하는 이미지 확장자
-IMAGE_EXTENSIONS = ['.jpg', '.png', '.jpeg']
+# 라벨 형식, 기대 이미지 크기와 클래스 개수(nc)를 읽을 dataset.yaml (학습에 쓰는 설정과 같아야 한다)
+LABEL_FORMAT = 'yolo'
+EXPECTED_SIZE = (800, 800)
+DATASET_YAML = '/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/dataset.yaml'
 
 def check_image_label_matching():
-    # 이미지 파일 이름 (확장자 제거)
-    image_files = {os.path.splitext(f)[0] for f in os.listdir(IMAGES_DIR) if os.path.splitext(f)[1] in IMAGE_EXTENSIONS}
-    
-    # 라벨 파일 이름 (.txt 제거)
-    label_files = {os.path.splitext(f)[0] for f in os.listdir(LABELS_DIR) if f.endswith('.txt')}
-    
-    # 일치하지 않는 이미지 및 라벨 확인
-    unmatched_images = image_files - label_files
-    unmatched_labels = label_files - image_files
-    
-    print(f"🔍 총 이미지 파일 수: {len(image_files)}")
-    print(f"🔍 총 라벨 파일 수: {len(label_files)}")
-    
-    if unmatched_images:
-        print(f"⚠️ 매칭되지 않은 이미지 파일: {len(unmatched_images)}")
-        for img in unmatched_images:
-            print(f" - {img}")
-    
-    if unmatched_labels:
-        print(f"⚠️ 매칭되지 않은 라벨 파일: {len(unmatched_labels)}")
-        for lbl in unmatched_labels:
-            print(f" - {lbl}")
-    
-    if not unmatched_images and not unmatched_labels:
-        print("✅ 모든 이미지와 라벨 파일이 정확히 일치합니다.")
+    # 파일 이름 매칭과 라벨 내용(클래스 범위, 좌표 범위, 면적 0, 중복), 이미지 크기를 한 번에 검사한다
+    report = audit_dataset(IMAGES_DIR, LABELS_DIR, fmt=LABEL_FORMAT, num_classes=load_num_classes(DATASET_YAML),
+                           expected_size=EXPECTED_SIZE, report_path=REPORT_PATH)
+    print_report(report)
+    print(f"📝 보고서: {REPORT_PATH}")
+    return report['ok']
 
 if __name__ == '__main__':
-    check_image_label_matching()
+    ok = check_image_label_matching()
+    sys.exit(0 if ok else 1)
@@ -1,7 +1,12 @@
 import os
-import shutil
+import sys
 from glob import glob
 
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from build_manifest import StageManifest
+from split_backend import place_files
+
 # 소스 폴더 경로 설정
 train_source = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/5_1_yolo_augmented_output"
 val_txt_source = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/4_2_val_txt"
@@ -13,37 +18,50 @@ train_images_dest = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/train/images
 val_labels_dest = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/val/labels"
 val_images_dest = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/val/images"
 
+# 파일 배치 방식: auto(reflink → hardlink → copy), reflink, hardlink, symlink, copy
+SPLIT_MODE = "auto"
+COPY_WORKERS = 8
+
 # 대상 폴더가 없으면 생성한다.
 for folder in [train_labels_dest, train_images_dest, val_labels_dest, val_images_dest]:
     os.makedirs(folder, exist_ok=True)
     print(f"생성된 폴더: {folder}")
 
-# 5_1_yolo_augmented_output 내의 txt 파일을 train/labels로 복사한다.
-train_txt_files = glob(os.path.join(train_source, "*.txt"))
-for file_path in train_txt_files:
-    dest_path = os.path.join(train_labels_dest, os.path.basename(file_path))
-    print(f"복사: {file_path} -> {dest_path}")
-    shutil.copy2(file_path, dest_path)
-
-# 5_1_yolo_augmented_output 내의 jpg 파일을 train/images로 복사한다.
-train_jpg_files = glob(os.path.join(train_source, "*.jpg"))
-for file_path in train_jpg_files:
-    dest_path = os.path.join(train_images_dest, os.path.basename(file_path))
-    print(f"복사: {file_path} -> {dest_path}")
-    shutil.copy2(file_path, dest_path)
-
-# 4_2_val_txt 내의 txt 파일을 val/labels로 복사한다.
-val_txt_files = glob(os.path.join(val_txt_source, "*.txt"))
-for file_path in val_txt_files:
-    dest_path = os.path.join(val_labels_dest, os.path.basename(file_path))
-    print(f"복사: {file_path} -> {dest_path}")
-    shutil.copy2(file_path, dest_path)
-
-# 4_4_val_image 내의 jpg 파일을 val/images로 복사한다.
-val_jpg_files = glob(os.path.join(val_img_source, "*.jpg"))
-for file_path in val_jpg_files:
-    dest_path = os.path.join(val_images_dest, os.path.basename(file_path))
-    print(f"복사: {file_path} -> {dest_path}")
-    shutil.copy2(file_path, dest_path)
-
-print("파일 복사 완료")
+# 증분 복사 매니페스트: 내용이 바뀌지 않았고 대상 파일이 남아 있으면 다시 복사하지 않는다.
+manifest = StageManifest("1_6_split", "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset")
+
+skipped_count = 0
+pairs = []
+
+def collect_all(pattern, dest_dir):
+    global skipped_count
+    for file_path in glob(pattern):
+        dest_path = os.path.join(dest_dir, os.path.basename(file_path))
+        if manifest.is_current(dest_path, [file_path], [dest_path]):
+            skipped_count += 1
+            continue
+        pairs.append((file_path, dest_path))
+
+# 5_1_yolo_augmented_output 내의 txt 파일을 train/labels로 배치한다.
+collect_all(os.path.join(train_source, "*.txt"), train_labels_dest)
+
+# 5_1_yolo_augmented_output 내의 jpg 파일을 train/images로 배치한다.
+collect_all(os.path.join(train_source, "*.jpg"), train_images_dest)
+
+# 4_2_val_txt 내의 txt 파일을 val/labels로 배치한다.
+collect_all(os.path.join(val_txt_source, "*.txt"), val_labels_dest)
+
+# 4_4_val_image 내의 jpg 파일을 val/images로 배치한다.
+collect_all(os.path.join(val_img_source, "*.jpg"), val_images_dest)
+
+placed, _, _ = place_files(pairs, mode=SPLIT_MODE, workers=COPY_WORKERS, name="train/val 배치")
+for file_path, dest_path in placed:
+    manifest.record(dest_path, [file_path], [dest_path])
+copied_count = len(placed)
+
+# 소스에서 사라진 파일은 대상 폴더에서도 삭제한다.
+for key in manifest.stale_keys():
+    manifest.forget(key, remove_outputs=True)
+manifest.save()
+
+print(f"파일 복사 완료 (복사: {copied_count}개, 변경 없음 스킵: {skipped_count}개)")
@@ -1,5 +1,9 @@
 import os
-from PIL import Image
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_audit import audit_dataset, load_num_classes, print_report
 
 # ======= 데이터셋 경로 설정 =======
 DATASET_DIR = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset"
@@ -11,62 +15,35 @@ TRAIN_LABELS = os.path.join(TRAIN_DIR, "labels")
 VAL_IMAGES = os.path.join(VAL_DIR, "images")
 VAL_LABELS = os.path.join(VAL_DIR, "labels")
 
+# False면 헤더/종료 마커만 빠르게 확인하고, True면 모든 이미지를 끝까지 디코딩한다
+FULL_DECODE = False
+NUM_WORKERS = None
+
+# 라벨 형식, 기대 이미지 크기와 클래스 개수(nc)를 읽을 dataset.yaml (학습에 쓰는 설정과 같아야 한다)
+LABEL_FORMAT = "yolo"
+EXPECTED_SIZE = (800, 800)
+DATASET_YAML = os.path.join(DATASET_DIR, "dataset.yaml")
+
 def check_integrity(image_dir, label_dir):
     """
     1. 이미지와 라벨 디렉터리 내의 파일 이름(확장자 제거)이 올바르게 대응하는지 확인합니다.
-    2. 각 이미지 파일을 Pillow의 load()를 통해 메모리로 완전히 로드할 수 있는지(손상 여부)를 체크합니다.
+    2. 라벨 내용(열 개수, 클래스 범위, 좌표 범위, 면적 0, 중복 박스)을 확인합니다.
+    3. 각 이미지 파일이 손상되지 않았는지 체크합니다 (헤더/종료 마커 확인, FULL_DECODE면 전체 디코딩).
+       검사 결과는 이미지 폴더의 캐시에 남겨서, 바뀌지 않은 이미지는 다시 검사하지 않습니다.
     """
-    allowed_img_exts = ('.jpg', '.jpeg', '.png')
-    
-    # 이미지와 라벨 파일 목록 수집
-    image_list = [f for f in os.listdir(image_dir) if f.lower().endswith(allowed_img_exts)]
-    label_list = [f for f in os.listdir(label_dir) if f.lower().endswith('.txt')]
-    
-    # 기본 이름(확장자 제거) 추출
-    image_basenames = {os.path.splitext(f)[0] for f in image_list}
-    label_basenames = {os.path.splitext(f)[0] for f in label_list}
-    
-    print(f">> 검증 중: {image_dir} 와 {label_dir}")
-    print(f" - 이미지 파일 수: {len(image_list)} (기본 이름: {len(image_basenames)}개)")
-    print(f" - 라벨 파일 수: {len(label_list)} (기본 이름: {len(label_basenames)}개)")
-    
-    # 이름 매칭 체크
-    missing_labels = image_basenames - label_basenames
-    missing_images = label_basenames - image_basenames
-    
-    if missing_labels:
-        print("‼️ 아래 이미지에 대응하는 라벨 파일이 없습니다:")
-        for name in sorted(missing_labels):
-            print("  -", name)
-    if missing_images:
-        print("‼️ 아래 라벨에 대응하는 이미지 파일이 없습니다:")
-        for name in sorted(missing_images):
-            print("  -", name)
-    if not missing_labels and not missing_images:
-        print("✅ 이미지와 라벨의 파일 이름 매칭이 정확합니다.")
-    
-    # 이미지 무결성 체크
-    integrity_errors = []
-    for image_file in image_list:
-        image_path = os.path.join(image_dir, image_file)
-        try:
-            with Image.open(image_path) as img:
-                img.load()
-        except Exception as e:
-            integrity_errors.append(f"이미지 로드 실패: {image_path} (에러: {e})")
-    
-    if integrity_errors:
-        print("‼️ 이미지 무결성 오류 발생:")
-        for err in integrity_errors:
-            print("  -", err)
-    else:
-        print("✅ 모든 이미지가 정상적으로 로드됩니다.")
+    split = os.path.basename(os.path.dirname(image_dir))
+    report = audit_dataset(image_dir, label_dir, fmt=LABEL_FORMAT, num_classes=load_num_classes(DATASET_YAML),
+                           expected_size=EXPECTED_SIZE, full_decode=FULL_DECODE, workers=NUM_WORKERS,
+                           report_path=os.path.join(DATASET_DIR, f"audit_{split}.json"))
+    print_report(report)
+    return report['ok']
 
 def main():
     print("===== Train 데이터셋 검증 =====")
-    check_integrity(TRAIN_IMAGES, TRAIN_LABELS)
+    train_ok = check_integrity(TRAIN_IMAGES, TRAIN_LABELS)
     print("\n===== Validation 데이터셋 검증 =====")
-    check_integrity(VAL_IMAGES, VAL_LABELS)
+    val_ok = check_integrity(VAL_IMAGES, VAL_LABELS)
+    sys.exit(0 if train_ok and val_ok else 1)
     
 if __name__ == "__main__":
     main()
@@ -0,0 +1,37 @@
+# input: dataset/train/images, dataset/val/images
+# output: dedup_report.json (train/val 누수 쌍, train 안의 중복 쌍), EXCLUDE=True면 누수된 train 이미지/라벨을 격리 폴더로 옮긴다
+import os
+import sys
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from image_dedup import check_leakage, exclude_images, print_pairs
+
+# 경로 설정
+DATASET_DIR = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset"
+TRAIN_IMAGES = os.path.join(DATASET_DIR, "train", "images")
+TRAIN_LABELS = os.path.join(DATASET_DIR, "train", "labels")
+VAL_IMAGES = os.path.join(DATASET_DIR, "val", "images")
+REPORT_PATH = os.path.join(DATASET_DIR, "dedup_report.json")
+QUARANTINE_DIR = os.path.join(DATASET_DIR, "dedup_excluded")
+
+# 두 해시의 해밍 거리(0~64)가 모두 이 값 이하면 같은 보드 이미지로 본다
+PHASH_THRESHOLD = 8
+DHASH_THRESHOLD = 10
+# True면 val과 겹치는 train 이미지와 train 안의 중복(두 번째 이미지)을 QUARANTINE_DIR로 옮긴다 (val은 그대로 둔다)
+EXCLUDE = False
+NUM_WORKERS = None
+
+def main():
+    result = check_leakage(TRAIN_IMAGES, VAL_IMAGES, PHASH_THRESHOLD, DHASH_THRESHOLD,
+                           workers=NUM_WORKERS, report_path=REPORT_PATH)
+    print_pairs("train/val 누수 의심", result['leaked'])
+    print_pairs("train 안의 중복", result['duplicates'])
+    print(f"📝 보고서: {REPORT_PATH}")
+
+    if EXCLUDE:
+        targets = [train for _, train, _, _ in result['leaked']] + [b for _, b, _, _ in result['duplicates']]
+        exclude_images(targets, label_dir=TRAIN_LABELS, quarantine_dir=QUARANTINE_DIR)
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,14 @@
 import os
 import json
 import numpy as np
-from pycocotools.coco import COCO
-from pycocotools.cocoeval import COCOeval
+
+from label_store import open_labels
+from fast_coco_eval import DENSE_MAX_DETS
+from obb_geometry import obb_coco_evaluate, polygon_area, rbox_to_polygons
 
 # 1. YOLO OBB 라벨 -> COCO GT 변환 (픽셀 좌표 사용)
+# labels_dir에는 txt 라벨 폴더 또는 label_store.py로 만든 OBB 라벨 저장소 경로를 줄 수 있다.
+# 평가는 회전 박스 기준이므로 꼭짓점 8개(poly)와 다각형 넓이(area)를 그대로 남기고, bbox는 감싸는 축 정렬 박스로 둔다.
 def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_names, img_width, img_height):
     coco_data = {
         "images": [],
@@ -17,10 +21,9 @@ def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_name
     annotation_id = 1
     image_id = 1
 
-    for label_file in sorted(os.listdir(labels_dir)):
-        if not label_file.endswith(".txt"):
-            continue
-        img_name = label_file.replace(".txt", ".jpg")
+    labels = open_labels(labels_dir, fmt="obb")
+    for stem in labels.stems:
+        img_name = stem + ".jpg"
         img_path = os.path.join(image_dir, img_name)
         if not os.path.exists(img_path):
             print(f"⚠ Warning: 이미지 {img_path} 없음. 건너뜀.")
@@ -31,28 +34,14 @@ def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_name
             "width": img_width,
             "height": img_height
         })
-        with open(os.path.join(labels_dir, label_file), "r") as f:
-            lines = f.readlines()
-        for line in lines:
-            parts = line.strip().split()
-            cls_id = int(parts[0]) + 1
-            coords = list(map(float, parts[1:]))
-
-            if len(coords) != 8:
-                print(f"⚠ Warning: {label_file} 라벨 데이터 오류 (좌표 개수 불일치). 건너뜀.")
-                continue
-
-            x1, y1, x2, y2, x3, y3, x4, y4 = coords
-            x1, y1 = x1 * img_width, y1 * img_height
-            x2, y2 = x2 * img_width, y2 * img_height
-            x3, y3 = x3 * img_width, y3 * img_height
-            x4, y4 = x4 * img_width, y4 * img_height
-
-            x_min = min(x1, x2, x3, x4)
-            y_min = min(y1, y2, y3, y4)
-            x_max = max(x1, x2, x3, x4)
-            y_max = max(y1, y2, y3, y4)
-
+        # 좌표 개수가 8개가 아닌 줄은 읽을 때 걸러진다
+        class_ids, coords = labels.get(stem)
+        pts = coords.astype(np.float64).reshape(-1, 4, 2) * [img_width, img_height]
+        mins = pts.min(axis=1)
+        maxs = pts.max(axis=1)
+        areas = polygon_area(pts)
+        for cls_id, poly, (x_min, y_min), (x_max, y_max), area in zip(
+                class_ids.tolist(), pts.reshape(-1, 8).tolist(), mins.tolist(), maxs.tolist(), areas.tolist()):
             width = x_max - x_min
             height = y_max - y_min
 
@@ -60,9 +49,10 @@ def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_name
             coco_data["annotations"].append({
                 "id": annotation_id,
                 "image_id": image_id,
-                "category_id": cls_id,
+                "category_id": cls_id + 1,
                 "bbox": bbox,
-                "area": width * height,
+                "poly": poly,
+                "area": area,
                 "iscrowd": 0
             })
             annotation_id += 1
@@ -73,30 +63,29 @@ def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_name
     print(f"✅ GT COCO JSON 변환 완료: {coco_output_file}")
 
 # 2. YOLO 예측(rbox) -> COCO 예측(픽셀 좌표) 변환
+# theta까지 살려 꼭짓점 8개(poly)로 바꾸고, bbox는 그 다각형을 감싸는 축 정렬 박스로 둔다.
 def convert_yolo_pred_to_coco(yolo_pred_file, coco_output_file, img_width, img_height):
     with open(yolo_pred_file, "r") as f:
         yolo_preds = json.load(f)
+    if not yolo_preds:
+        print(f"⚠ Warning: 예측이 없음: {yolo_pred_file}")
+    # rbox = [x_center, y_center, w, h, theta] (정규화 좌표) -> 꼭짓점을 구한 뒤 픽셀 단위로 변환
+    rboxes = np.array([pred["rbox"] for pred in yolo_preds], dtype=np.float64).reshape(-1, 5)
+    polygons = rbox_to_polygons(rboxes) * [img_width, img_height]
+    mins = polygons.min(axis=1)
+    maxs = polygons.max(axis=1)
+    areas = polygon_area(polygons)
     coco_results = []
-    for pred in yolo_preds:
+    for pred, poly, (x_min, y_min), (x_max, y_max), area in zip(
+            yolo_preds, polygons.reshape(-1, 8).tolist(), mins.tolist(), maxs.tolist(), areas.tolist()):
         # pred["image_id"]가 이미지 파일 이름이라고 가정
-        file_name = pred["image_id"]
-        category_id = pred["category_id"] + 1
-        score = pred["score"]
-        # rbox = [x_center, y_center, w, h, theta]
-        rbox = pred["rbox"]
-        x_center, y_center, w, h, _ = rbox
-        x = x_center - (w / 2)
-        y = y_center - (h / 2)
-        # 픽셀 단위로 변환
-        x *= img_width
-        y *= img_height
-        w *= img_width
-        h *= img_height
         coco_results.append({
-            "image_id": file_name,
-            "category_id": category_id,
-            "bbox": [x, y, w, h],
-            "score": score
+            "image_id": pred["image_id"],
+            "category_id": pred["category_id"] + 1,
+            "bbox": [x_min, y_min, x_max - x_min, y_max - y_min],
+            "poly": poly,
+            "area": area,
+            "score": pred["score"]
         })
     with open(coco_output_file, "w") as f:
         json.dump(coco_results, f, indent=4)
@@ -143,16 +132,9 @@ def fix_category_id(gt_file, pred_file, output_file):
         json.dump(pred_data, f, indent=4)
     print(f"✅ category_id 통일 완료: {output_file}")
 
-# 5. COCO AP/AR 평가
-def coco_evaluation(gt_file, dt_file):
-    coco_gt = COCO(gt_file)
-    coco_dt = coco_gt.loadRes(dt_file)
-    coco_eval = COCOeval(coco_gt, coco_dt, "bbox")
-    coco_eval.params.iouThrs = np.linspace(0.5, 0.95, 10)
-    coco_eval.evaluate()
-    coco_eval.accumulate()
-    coco_eval.summarize()
-    return coco_eval.stats
+# 5. COCO AP/AR 평가 (회전 박스 IoU 기준)
+def coco_evaluation(gt_file, dt_file, max_dets=DENSE_MAX_DETS):
+    return obb_coco_evaluate(gt_file, dt_file, max_dets=max_dets)["stats"]
 
 # 6. 메인 실행부
 if __name__ == "__main__":
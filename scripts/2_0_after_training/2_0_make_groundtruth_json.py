@@ -1,7 +1,12 @@
 import os
+import sys
 import json
 from PIL import Image
 
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from label_store import open_labels
+
 def create_ground_truth_json(
     image_dir = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/val/images",
     label_dir = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/val/labels",
@@ -10,7 +15,9 @@ def create_ground_truth_json(
     """
     YOLO 라벨(txt) 파일을 COCO 형식의 ground_truth.json으로 변환한다.
     이미지 해상도가 800×800이라고 가정하고, 라벨에 있는 x_center, y_center, w, h는 (0~1) 정규화된 좌표라고 가정한다.
+    label_dir에는 txt 라벨 폴더 대신 label_store.py로 만든 라벨 저장소 경로를 줄 수도 있다.
     """
+    labels = open_labels(label_dir)
 
     image_files = sorted([
         f for f in os.listdir(image_dir)
@@ -36,34 +43,17 @@ def create_ground_truth_json(
         })
 
         base_name, _ = os.path.splitext(img_file)
-        label_file = os.path.join(label_dir, base_name + ".txt")
-        if not os.path.exists(label_file):
+        item = labels.get(base_name)
+        if item is None:
             image_id += 1
             continue
 
-        with open(label_file, "r") as lf:
-            lines = lf.readlines()
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = line.split()
-            class_id = int(parts[0])
-            x_center = float(parts[1])
-            y_center = float(parts[2])
-            w = float(parts[3])
-            h = float(parts[4])
-
-            x_center_abs = x_center * width
-            y_center_abs = y_center * height
-            w_abs = w * width
-            h_abs = h * height
-
-            x_min = x_center_abs - (w_abs / 2.0)
-            y_min = y_center_abs - (h_abs / 2.0)
+        # 이미지 하나의 박스를 한 번에 픽셀 좌표로 바꾼다
+        class_ids, xywh = item
+        boxes = xywh.astype("float64") * [width, height, width, height]
+        boxes[:, :2] -= boxes[:, 2:] / 2.0
 
+        for class_id, (x_min, y_min, w_abs, h_abs) in zip(class_ids.tolist(), boxes.tolist()):
             annotations.append({
                 "id": annotation_id,
                 "image_id": image_id,
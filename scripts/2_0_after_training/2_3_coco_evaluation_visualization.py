@@ -1,32 +1,14 @@
 import json
 import os
+import sys
 import cv2
 import matplotlib.pyplot as plt
 import random
 
-def calculate_iou(boxA, boxB):
-    """
-    두 박스(boxA, boxB)는 (x, y, w, h)의 픽셀 좌표이다.
-    두 박스의 IoU(교집합 비율)를 계산한다.
-    """
-    xA = max(boxA[0], boxB[0])
-    yA = max(boxA[1], boxB[1])
-    xB = min(boxA[0] + boxA[2], boxB[0] + boxB[2])
-    yB = min(boxA[1] + boxA[3], boxB[1] + boxB[3])
-
-    interW = max(0, xB - xA)
-    interH = max(0, yB - yA)
-    interArea = interW * interH
-
-    boxAArea = boxA[2] * boxA[3]
-    boxBArea = boxB[2] * boxB[3]
-
-    unionArea = float(boxAArea + boxBArea - interArea)
-    if unionArea <= 0:
-        return 0.0
-
-    iou = interArea / unionArea
-    return iou
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from annotation_index import AnnotationIndex
+from box_geometry import iou_matrix
 
 def get_size_category(w, h):
     """
@@ -55,6 +37,10 @@ def visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5):
     with open(pred_file, "r") as f:
         pred_data = json.load(f)
 
+    # 이미지 ID별 GT/예측 인덱스 (이미지마다 전체 목록을 훑지 않는다)
+    gt_index = AnnotationIndex(gt_data["annotations"])
+    pred_index = AnnotationIndex(pred_data)
+
     # GT images의 {image_id: file_name} 매핑
     image_id_to_file = {}
     for img_info in gt_data["images"]:
@@ -79,9 +65,9 @@ def visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5):
         h_img, w_img, _ = img.shape
 
         # GT bboxes
-        gt_bboxes = [ann["bbox"] for ann in gt_data["annotations"] if ann["image_id"] == image_id]
+        gt_bboxes = gt_index.boxes(image_id)
         # 예측 bboxes
-        pred_bboxes = [dt["bbox"] for dt in pred_data if dt["image_id"] == image_id]
+        pred_bboxes = pred_index.boxes(image_id)
 
         plt.figure(figsize=(10, 10))
         plt.imshow(img)
@@ -128,13 +114,9 @@ def visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5):
             # px, py, pw, ph = px*w_img, py*h_img, pw*w_img, ph*h_img
             pred_pixels.append((px, py, pw, ph))
 
-        iou_scores = []
-        for gbox in gt_pixels:
-            for pbox in pred_pixels:
-                iou_val = calculate_iou(gbox, pbox)
-                iou_scores.append(iou_val)
-
-        avg_iou = sum(iou_scores) / len(iou_scores) if iou_scores else 0
+        # 모든 (GT, 예측) 쌍의 IoU를 행렬로 한 번에 계산한다
+        iou_scores = iou_matrix(gt_pixels, pred_pixels)
+        avg_iou = float(iou_scores.mean()) if iou_scores.size else 0
         plt.title(f"{img_file} - 평균 IoU: {avg_iou:.3f}", fontsize=11)
         plt.axis("off")
         plt.show()
@@ -1,24 +1,18 @@
-import numpy as np
-from pycocotools.coco import COCO
-from pycocotools.cocoeval import COCOeval
+import os
+import sys
 
-def coco_evaluation(gt_file, dt_file):
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fast_coco_eval import coco_evaluate, DENSE_MAX_DETS
+
+def coco_evaluation(gt_file, dt_file, max_dets=DENSE_MAX_DETS):
     """
     COCO AP/AR 평가를 COCO 공식 기준(IoU 0.50~0.95, 0.05 간격)으로 수행한다.
     gt_file과 dt_file은 모두 COCO 형식을 따르는 JSON 경로이다.
     bbox는 [x_min, y_min, width, height] 픽셀 좌표라고 가정한다.
+    보드당 박스가 수천 개이므로 maxDets는 max_dets로 늘려서 평가한다 (클래스별 AP도 함께 출력된다).
     """
-    coco_gt = COCO(gt_file)
-    coco_dt = coco_gt.loadRes(dt_file)
-
-    coco_eval = COCOeval(coco_gt, coco_dt, "bbox")
-    coco_eval.params.iouThrs = np.linspace(0.5, 0.95, 10)
-
-    coco_eval.evaluate()
-    coco_eval.accumulate()
-    coco_eval.summarize()
-
-    return coco_eval.stats
+    return coco_evaluate(gt_file, dt_file, max_dets=max_dets)["stats"]
 
 if __name__ == "__main__":
     gt_path = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/ground_truth.json"
@@ -3,22 +3,15 @@
 
 import json
 import os
+import sys
 import cv2
 import matplotlib.pyplot as plt
 import random
 
-def calculate_iou(boxA, boxB):
-    xA = max(boxA[0], boxB[0])
-    yA = max(boxA[1], boxB[1])
-    xB = min(boxA[0] + boxA[2], boxB[0] + boxB[2])
-    yB = min(boxA[1] + boxA[3], boxB[1] + boxB[3])
-
-    interArea = max(0, xB - xA) * max(0, yB - yA)
-    boxAArea = boxA[2] * boxA[3]
-    boxBArea = boxB[2] * boxB[3]
-    
-    iou = interArea / float(boxAArea + boxBArea - interArea) if (boxAArea + boxBArea - interArea) > 0 else 0
-    return iou
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from annotation_index import AnnotationIndex
+from box_geometry import iou_matrix
 
 # 데이터 로드
 gt_file = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/ground_truth.json"
@@ -31,6 +24,10 @@ with open(gt_file, "r") as f:
 with open(pred_file, "r") as f:
     pred_data = json.load(f)
 
+# 이미지 ID별 GT/예측 인덱스 (이미지마다 전체 목록을 훑지 않는다)
+gt_index = AnnotationIndex(gt_data["annotations"])
+pred_index = AnnotationIndex(pred_data)
+
 # GT에서 image_id와 file_name 매핑
 image_id_to_filename = {img["id"]: img["file_name"] for img in gt_data["images"]}
 
@@ -52,8 +49,8 @@ for image_id in sample_images:
     img_h, img_w, _ = img.shape
 
     # GT와 Prediction BBox 찾기
-    gt_bboxes = [ann["bbox"] for ann in gt_data["annotations"] if ann["image_id"] == image_id]
-    pred_bboxes = [pred["bbox"] for pred in pred_data if pred["image_id"] == image_id]
+    gt_bboxes = gt_index.boxes(image_id)
+    pred_bboxes = pred_index.boxes(image_id)
 
     plt.figure(figsize=(10, 10))
     plt.imshow(img)
@@ -85,10 +82,11 @@ for image_id in sample_images:
 
     # IoU 계산 (IoU는 픽셀 단위로 해석하는 게 일반적)
     # GT도 픽셀 단위 변환한 뒤 IoU 계산하는 편이 좋다.
-    gt_bboxes_pixel = [(box[0]*img_w, box[1]*img_h, box[2]*img_w, box[3]*img_h) for box in gt_bboxes]
-    pred_bboxes_pixel = [(box[0]*img_w, box[1]*img_h, box[2]*img_w, box[3]*img_h) for box in pred_bboxes]
-    iou_scores = [calculate_iou(gtb, pb) for gtb in gt_bboxes_pixel for pb in pred_bboxes_pixel]
-    avg_iou = sum(iou_scores) / len(iou_scores) if iou_scores else 0
+    scale = [img_w, img_h, img_w, img_h]
+    gt_bboxes_pixel = gt_bboxes * scale
+    pred_bboxes_pixel = pred_bboxes * scale
+    iou_scores = iou_matrix(gt_bboxes_pixel, pred_bboxes_pixel)
+    avg_iou = float(iou_scores.mean()) if iou_scores.size else 0
 
     plt.title(f"{image_name}\nAvg IoU: {avg_iou:.2f}")
     # 범례 중복 추가 방지를 위해 별도 legend는 생략하거나 필요시 그리기
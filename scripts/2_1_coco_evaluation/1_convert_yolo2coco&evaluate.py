@@ -1,14 +1,21 @@
 import os
+import sys
 import glob
 import json
 from PIL import Image
 import numpy as np
 from pycocotools.coco import COCO
-from pycocotools.cocoeval import COCOeval
 
-def yolo_to_coco(dataset_dir, output_json):
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from label_store import open_labels
+from fast_coco_eval import coco_evaluate, DENSE_MAX_DETS
+
+def yolo_to_coco(dataset_dir, output_json, label_dir=None):
+    # label_dir를 주면 dataset_dir/labels 대신 그 txt 폴더 또는 라벨 저장소를 사용한다.
     image_dir = os.path.join(dataset_dir, "images")
-    label_dir = os.path.join(dataset_dir, "labels")
+    label_dir = label_dir or os.path.join(dataset_dir, "labels")
+    labels = open_labels(label_dir)
     category_names = [
         "Chip", "CSolder", "2sideIC", "SOD", "Circle",
         "4sideIC", "Tantalum", "BGA", "MELF", "Crystal", "Array"
@@ -40,7 +47,6 @@ def yolo_to_coco(dataset_dir, output_json):
     for img_path in image_paths:
         file_name = os.path.basename(img_path)
         stem, _ = os.path.splitext(file_name)
-        label_path = os.path.join(label_dir, stem + ".txt")
 
         with Image.open(img_path) as img:
             w_img, h_img = img.size
@@ -52,33 +58,22 @@ def yolo_to_coco(dataset_dir, output_json):
             "height": h_img
         })
 
-        if os.path.exists(label_path):
-            with open(label_path, "r") as f:
-                lines = f.readlines()
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    parts = line.split()
-                    class_id = int(parts[0])
-                    x_center = float(parts[1])
-                    y_center = float(parts[2])
-                    w_norm = float(parts[3])
-                    h_norm = float(parts[4])
-                    x_min = (x_center - w_norm/2) * w_img
-                    y_min = (y_center - h_norm/2) * h_img
-                    bbox_w = w_norm * w_img
-                    bbox_h = h_norm * h_img
-
-                    coco_data["annotations"].append({
-                        "id": annotation_id,
-                        "image_id": image_id,
-                        "category_id": class_id,
-                        "bbox": [x_min, y_min, bbox_w, bbox_h],
-                        "area": bbox_w * bbox_h,
-                        "iscrowd": 0
-                    })
-                    annotation_id += 1
+        item = labels.get(stem)
+        if item is not None:
+            class_ids, xywh = item
+            boxes = xywh.astype(np.float64)
+            boxes[:, :2] -= boxes[:, 2:] / 2
+            boxes *= [w_img, h_img, w_img, h_img]
+            for class_id, (x_min, y_min, bbox_w, bbox_h) in zip(class_ids.tolist(), boxes.tolist()):
+                coco_data["annotations"].append({
+                    "id": annotation_id,
+                    "image_id": image_id,
+                    "category_id": class_id,
+                    "bbox": [x_min, y_min, bbox_w, bbox_h],
+                    "area": bbox_w * bbox_h,
+                    "iscrowd": 0
+                })
+                annotation_id += 1
 
         image_id += 1
 
@@ -147,19 +142,9 @@ def fix_predictions(dt_json_path, gt_json_path, is_normalized=False):
     print("총 예측 수:", len(dt_data), "/ 유효 매칭 수:", len(fixed))
     return dt_fixed_path
 
-def coco_evaluation(gt_json_path, dt_json_path):
-    coco_gt = COCO(gt_json_path)
-    coco_dt = coco_gt.loadRes(dt_json_path)
-    coco_eval = COCOeval(coco_gt, coco_dt, "bbox")
-
-    # DETR과 동일하게 IoU 임계값 설정
-    coco_eval.params.iouThrs = np.linspace(0.5, 0.95, 10)
-
-    coco_eval.evaluate()
-    coco_eval.accumulate()
-    coco_eval.summarize()
-
-    return coco_eval.stats
+def coco_evaluation(gt_json_path, dt_json_path, max_dets=DENSE_MAX_DETS):
+    # COCOeval과 같은 규칙(IoU 0.50:0.95)으로 평가하되, 보드당 박스 수에 맞춰 maxDets를 늘린다
+    return coco_evaluate(gt_json_path, dt_json_path, max_dets=max_dets)["stats"]
 
 if __name__ == "__main__":
     dataset_dir = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/val"
@@ -1,40 +1,20 @@
 # 파일명: /home/a/A_2024_selfcode/CLASS-PCB_Yolo/scripts/visualize_and_print_summary.py
 
 import os
+import sys
 import json
 import cv2
-import numpy as np
-from pycocotools.coco import COCO
-from pycocotools.cocoeval import COCOeval
+
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from annotation_index import AnnotationIndex
+from box_geometry import best_overlap
+from fast_coco_eval import coco_evaluate, DENSE_MAX_DETS
 
 def load_json(json_path):
     with open(json_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def compute_iou(box1, box2):
-    # box 형식: [x, y, w, h]
-    x1, y1, w1, h1 = box1
-    x2, y2, w2, h2 = box2
-    x1_max = x1 + w1
-    y1_max = y1 + h1
-    x2_max = x2 + w2
-    y2_max = y2 + h2
-
-    xi1 = max(x1, x2)
-    yi1 = max(y1, y2)
-    xi2 = min(x1_max, x2_max)
-    yi2 = min(y1_max, y2_max)
-    inter_w = max(0, xi2 - xi1)
-    inter_h = max(0, yi2 - yi1)
-    inter_area = inter_w * inter_h
-
-    area1 = w1 * h1
-    area2 = w2 * h2
-    union_area = area1 + area2 - inter_area
-    if union_area == 0:
-        return 0.0
-    return inter_area / union_area
-
 def draw_boxes(image, boxes, color, thickness=1):
     for box_info in boxes:
         x, y, w, h = map(int, box_info["bbox"])
@@ -48,31 +28,19 @@ def overlay_text(image, lines, start_pos=(5,20), font_scale=0.3, color=(255,255,
         y += line_height
     return image
 
-def evaluate_coco(gt_json_path, pred_json_path):
-    coco_gt = COCO(gt_json_path)
-    coco_dt = coco_gt.loadRes(pred_json_path)
-    coco_eval = COCOeval(coco_gt, coco_dt, "bbox")
-    # mAP IoU=0.50:0.95 평가
-    coco_eval.params.iouThrs = np.linspace(0.5, 0.95, 10)
-    coco_eval.evaluate()
-    coco_eval.accumulate()
-    coco_eval.summarize()
-    return coco_eval.stats
+def evaluate_coco(gt_json_path, pred_json_path, max_dets=DENSE_MAX_DETS):
+    # mAP IoU=0.50:0.95 평가 (maxDets는 보드당 박스 수에 맞춰 늘린다)
+    return coco_evaluate(gt_json_path, pred_json_path, max_dets=max_dets)["stats"]
 
 def visualize_and_print_summary(gt_json_path, pred_json_path, images_dir, output_dir, iou_threshold=0.5):
     gt_data = load_json(gt_json_path)
     pred_data = load_json(pred_json_path)
     
     # 이미지 ID별로 GT와 예측 박스를 분류한다.
-    gt_boxes = {}
-    for ann in gt_data["annotations"]:
-        image_id = ann["image_id"]
-        gt_boxes.setdefault(image_id, []).append(ann)
-    
-    pred_boxes = {}
-    for ann in pred_data:
-        image_id = ann["image_id"]
-        pred_boxes.setdefault(image_id, []).append(ann)
+    gt_index = AnnotationIndex(gt_data["annotations"])
+    pred_index = AnnotationIndex(pred_data)
+    # category_id -> 이름 (GT마다 categories를 훑지 않도록 미리 만든다)
+    category_names = {cat["id"]: cat["name"] for cat in gt_data["categories"]}
     
     # 이미지 ID와 파일명을 매핑한다.
     image_id_to_file = {}
@@ -97,26 +65,22 @@ def visualize_and_print_summary(gt_json_path, pred_json_path, images_dir, output
             print("이미지를 불러오지 못함:", image_path)
             continue
         
-        gt_list = gt_boxes.get(image_id, [])
-        pred_list = pred_boxes.get(image_id, [])
+        gt_list = gt_index.records(image_id)
+        pred_list = pred_index.records(image_id)
         
         # 이미지에 GT 박스(초록색)와 예측 박스(빨간색)를 그림
         image = draw_boxes(image, gt_list, (0, 255, 0), thickness=1)
         image = draw_boxes(image, pred_list, (0, 0, 255), thickness=1)
         
-        # 각 GT 박스에 대해 최고 IoU가 iou_threshold 미만이면 미스된 것으로 간주
+        # 각 GT 박스에 대해 최고 IoU가 iou_threshold 미만이면 미스된 것으로 간주 (GT × 예측 IoU를 한 번에 계산)
+        max_ious, _ = best_overlap(gt_index.boxes(image_id), pred_index.boxes(image_id))
         missed_count = 0
-        for gt in gt_list:
-            max_iou = 0.0
-            for pred in pred_list:
-                iou = compute_iou(gt["bbox"], pred["bbox"])
-                if iou > max_iou:
-                    max_iou = iou
+        for gt, max_iou in zip(gt_list, max_ious):
             if max_iou < iou_threshold:
                 missed_count += 1
                 cat_id = gt["category_id"]
                 # gt_data["categories"]에 기록된 category_id는 0부터 시작한다.
-                cat_name = next((cat["name"] for cat in gt_data["categories"] if cat["id"] == cat_id), str(cat_id))
+                cat_name = category_names.get(cat_id, str(cat_id))
                 missed_classes[cat_name] = missed_classes.get(cat_name, 0) + 1
         
         total_gt_boxes += len(gt_list)
@@ -1,49 +1,25 @@
 import os
+import sys
 import json
 import cv2
 import numpy as np
 from collections import defaultdict
 
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import box_matching
+from annotation_index import AnnotationIndex
+
 def load_json(json_path):
     with open(json_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def compute_iou(box1, box2):
-    x1, y1, w1, h1 = map(float, box1)
-    x2, y2, w2, h2 = map(float, box2)
-    
-    x_left = max(x1, x2)
-    y_top = max(y1, y2)
-    x_right = min(x1 + w1, x2 + w2)
-    y_bottom = min(y1 + h1, y2 + h2)
-    
-    if x_right <= x_left or y_bottom <= y_top:
-        return 0.0
-    
-    intersection_area = (x_right - x_left) * (y_bottom - y_top)
-    union_area = (w1 * h1) + (w2 * h2) - intersection_area
-    if union_area < 1e-7:
-        return 0.0
-    
-    iou = intersection_area / union_area
-    return min(iou, 1.0)
-
-def match_boxes(gt_list, pred_list, iou_threshold=0.75):
-    matched_gt, matched_pred = set(), set()
-    for gt_idx, gt in enumerate(gt_list):
-        best_iou = 0.0
-        best_pred_idx = -1
-        for pred_idx, pred in enumerate(pred_list):
-            if pred_idx in matched_pred:
-                continue
-            iou_val = compute_iou(gt["bbox"], pred["bbox"])
-            if iou_val > best_iou:
-                best_iou = iou_val
-                best_pred_idx = pred_idx
-        if best_iou >= iou_threshold and best_pred_idx != -1:
-            matched_gt.add(gt_idx)
-            matched_pred.add(best_pred_idx)
-    return matched_gt, matched_pred
+def match_boxes(gt_index, pred_index, image_id, iou_threshold=0.75, method='greedy'):
+    # 점수 높은 예측부터(greedy, COCO 방식) 또는 IoU 합이 최대가 되게(hungarian) 같은 클래스끼리만 1:1 매칭한다
+    gt_match, pred_match, _ = box_matching.match_boxes(
+        gt_index.boxes(image_id), pred_index.boxes(image_id), pred_index.scores(image_id), iou_threshold,
+        gt_index.classes(image_id), pred_index.classes(image_id), method)
+    return set(np.flatnonzero(gt_match >= 0).tolist()), set(np.flatnonzero(pred_match >= 0).tolist())
 
 def draw_boxes(image, gt_list, pred_list, matched_gt, matched_pred):
     # GT는 흰색(255,255,255), 매칭된 예측은 초록색(0,255,0), 매칭 안 된 예측은 노랑(0,255,255), 놓친 GT는 빨강(0,0,255)
@@ -60,7 +36,7 @@ def draw_boxes(image, gt_list, pred_list, matched_gt, matched_pred):
             cv2.rectangle(image, (x, y), (x + w, y + h), (0, 0, 255), 1)
     return image
 
-def evaluate_map(gt_json_path, pred_json_path, images_dir, output_dir, iou_threshold=0.75):
+def evaluate_map(gt_json_path, pred_json_path, images_dir, output_dir, iou_threshold=0.75, match_method='greedy'):
     # 클래스 매핑 (예시)
     category_map = {
         'Chip': 0,
@@ -80,6 +56,10 @@ def evaluate_map(gt_json_path, pred_json_path, images_dir, output_dir, iou_thres
     gt_data = load_json(gt_json_path)
     pred_data = load_json(pred_json_path)
     
+    # 이미지 ID별 GT/예측 인덱스 (한 번만 정렬해 두고 이미지마다 구간으로 꺼낸다)
+    gt_index = AnnotationIndex(gt_data["annotations"])
+    pred_index = AnnotationIndex(pred_data)
+    
     # 이미지 ID -> 파일명
     image_id_to_file = {img["id"]: img["file_name"] for img in gt_data["images"]}
 
@@ -106,11 +86,11 @@ def evaluate_map(gt_json_path, pred_json_path, images_dir, output_dir, iou_thres
             continue
         
         # 이 이미지에 해당하는 GT와 예측만 필터링
-        gt_list = [ann for ann in gt_data["annotations"] if ann["image_id"] == image_id]
-        pred_list = [ann for ann in pred_data if ann["image_id"] == image_id]
+        gt_list = gt_index.records(image_id)
+        pred_list = pred_index.records(image_id)
         
         # 매칭
-        matched_gt, matched_pred = match_boxes(gt_list, pred_list, iou_threshold)
+        matched_gt, matched_pred = match_boxes(gt_index, pred_index, image_id, iou_threshold, match_method)
         
         # 시각화 이미지 저장
         vis_image = draw_boxes(image, gt_list, pred_list, matched_gt, matched_pred)
@@ -172,4 +152,4 @@ if __name__ == "__main__":
     pred_json = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/runs/detect/val4/predictions_fixed.json"
     images_dir = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/val/images"
     output_dir = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/runs/detect/val4/visualization"
-    evaluate_map(gt_json, pred_json, images_dir, output_dir, iou_threshold=0.75)
+    evaluate_map(gt_json, pred_json, images_dir, output_dir, iou_threshold=0.75, match_method='greedy')
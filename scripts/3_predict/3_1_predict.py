@@ -1,15 +1,52 @@
+import os
+import sys
+
 from ultralytics import YOLO
 
-# 모델 로드
-model = YOLO('/home/a/A_2024_selfcode/PCB/scripts/runs/obb/train24/weights/best.pt')
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from predict_stream import CocoJsonlSink, RenderSink, TxtSink, run_prediction
+from tiled_inference import TiledPredictor
+
+MODEL_PATH = '/home/a/A_2024_selfcode/PCB/scripts/runs/obb/train24/weights/best.pt'
+SOURCE_DIR = '/home/a/A_2024_selfcode/PCB/dataset/test/images'
+OUTPUT_DIR = '/home/a/A_2024_selfcode/PCB/scripts/runs/obb/predict_stream'
+CONF = 0.1
+IMGSZ = 800
 
+# 스트리밍 추론 설정 (결과를 메모리에 모으지 않고, 저장은 백그라운드 스레드가 맡는다)
+BATCH = 16             # 한 번에 모델에 넣는 이미지 수
+DECODE_WORKERS = 4     # 이미지 디코딩 스레드 수
+SAVE_TXT = True        # labels/*.txt (save_txt와 같은 형식)
+SAVE_JSONL = True      # predictions.jsonl (COCO 결과 레코드, 한 줄에 검출 하나)
+SAVE_IMAGES = True     # 검출 결과를 그린 이미지
+
+# True면 원본 해상도(3904×3904)를 겹치는 타일로 잘라 추론한다 (작은 부품 검출용)
+TILED = False
+TILE_SIZE = 1600       # 원본 픽셀 기준 타일 크기 (IMGSZ로 줄여서 추론한다)
+TILE_OVERLAP = 0.2
+TILE_BATCH = 8         # 한 번에 모델에 넣는 타일 수
+TILED_IMAGES = 2       # 타일 추론 때 한 번에 들고 있는 원본 수 (원본 하나가 약 45MB)
+MERGE = 'nms'          # 'nms' 또는 'wbf' (wbf는 일반 박스 모델만)
+
+# 모델 로드
+model = YOLO(MODEL_PATH)
+obb = model.task == 'obb'
 
-# 모델 추론 실행 
-results = model.predict(
-    source='/home/a/A_2024_selfcode/PCB/dataset/test/images',
-    save=True,        # 이미지만 저장
-    save_txt=True,    # 라벨 텍스트 파일도 저장
-    conf=0.1
-)
+tiled = None
+if TILED:
+    # 타일 결과는 원본 좌표로 합쳐서 일반 추론과 같은 모양으로 싱크에 넘어간다
+    tiled = TiledPredictor(model, tile_size=TILE_SIZE, overlap=TILE_OVERLAP, imgsz=IMGSZ,
+                           batch=TILE_BATCH, conf=CONF, merge=MERGE)
 
+sinks = []
+if SAVE_TXT:
+    sinks.append(TxtSink(os.path.join(OUTPUT_DIR, 'labels'), obb=obb))
+if SAVE_JSONL:
+    sinks.append(CocoJsonlSink(os.path.join(OUTPUT_DIR, 'predictions.jsonl')))
+if SAVE_IMAGES:
+    sinks.append(RenderSink(OUTPUT_DIR, class_names=model.names))
 
+# 모델 추론 실행
+run_prediction(model, SOURCE_DIR, sinks, batch=TILED_IMAGES if TILED else BATCH, imgsz=IMGSZ, conf=CONF,
+               decode_workers=DECODE_WORKERS, tiled=tiled)
@@ -0,0 +1,62 @@
+# scripts/annotation_index.py
+# COCO annotation / 예측 목록을 image_id별로 묶는 인덱스 (평가/시각화 스크립트 공용)
+# 이미지마다 전체 목록을 훑는 대신 ([ann for ann in anns if ann["image_id"] == image_id]),
+# image_id로 한 번 argsort해서 같은 이미지의 항목이 연속된 구간이 되게 하고 {image_id: (시작, 끝)}만 기억한다.
+# bbox / category_id / score도 같은 순서의 NumPy 배열로 만들어 두므로, 이미지별 박스는 복사 없이 슬라이스로 꺼낸다.
+import numpy as np
+
+
+def group_indices(image_ids):
+    """
+    image_id 배열을 정렬해 같은 image_id끼리 묶는다.
+    반환값: (order, {image_id: (시작, 끝)}) — order[시작:끝]이 그 이미지 항목들의 원래 인덱스다.
+    """
+    image_ids = np.asarray(image_ids)
+    order = np.argsort(image_ids, kind='stable')
+    if len(order) == 0:
+        return order, {}
+    unique, starts = np.unique(image_ids[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+    return order, {u: (int(s), int(e)) for u, s, e in zip(unique.tolist(), starts, ends)}
+
+
+class AnnotationIndex:
+    """
+    index = AnnotationIndex(gt_data["annotations"])  # 또는 예측 목록
+    index.records(image_id) → 그 이미지의 dict 목록, index.boxes(image_id) → (k, 4) 배열
+    없는 image_id는 빈 목록 / 빈 배열을 돌려준다.
+    """
+
+    def __init__(self, annotations):
+        annotations = list(annotations)
+        order, self._spans = group_indices([ann["image_id"] for ann in annotations])
+        self._records = [annotations[i] for i in order]
+        self._boxes = np.asarray([ann["bbox"] for ann in self._records], dtype=np.float64).reshape(-1, 4)
+        self._classes = np.asarray([ann["category_id"] for ann in self._records], dtype=np.int64)
+        # GT에는 score가 없으므로 1.0으로 채운다
+        self._scores = np.asarray([ann.get("score", 1.0) for ann in self._records], dtype=np.float64)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, image_id):
+        return image_id in self._spans
+
+    def image_ids(self):
+        return list(self._spans.keys())
+
+    def span(self, image_id):
+        start, end = self._spans.get(image_id, (0, 0))
+        return slice(start, end)
+
+    def records(self, image_id):
+        return self._records[self.span(image_id)]
+
+    def boxes(self, image_id):
+        return self._boxes[self.span(image_id)]
+
+    def classes(self, image_id):
+        return self._classes[self.span(image_id)]
+
+    def scores(self, image_id):
+        return self._scores[self.span(image_id)]
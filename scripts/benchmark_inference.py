@@ -0,0 +1,240 @@
+# scripts/benchmark_inference.py
+# 학습된 체크포인트의 추론 속도 벤치마크 (CPU)
+# 단계별 지연 시간을 따로 잰다.
+#   pre   : letterbox(비율 유지 리사이즈 + 패딩), BGR→RGB, HWC→CHW, /255, 배치 묶기
+#   infer : 모델 실행 (PyTorch / ONNX Runtime / OpenVINO)
+#   nms   : ultralytics non_max_suppression (백엔드와 상관없이 같은 구현)
+#   post  : 박스를 원본 이미지 좌표로 되돌리고 numpy로 꺼내기
+# (형식 × imgsz × batch × 스레드 수) 조합마다 배치 단위 지연 시간의 p50/p95/p99와 초당 이미지 수를 표로 출력하고
+# CSV에 한 줄씩 덧붙여서, mAP만으로 고르던 run들을 속도까지 같이 비교할 수 있게 한다.
+# onnxruntime, openvino는 설치되어 있을 때만 측정한다.
+import os
+import csv
+import glob
+import time
+import importlib.util
+
+import cv2
+import numpy as np
+import torch
+from ultralytics import YOLO
+from ultralytics.utils import ops
+
+FORMATS = ('torch', 'onnx', 'openvino')
+STAGES = ('pre', 'infer', 'nms', 'post')
+PERCENTILES = (50, 95, 99)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def letterbox(image, imgsz):
+    """비율을 유지해 imgsz 정사각형에 맞추고 남는 부분은 회색(114)으로 채운다. 반환값: (이미지, 배율, (pad_x, pad_y))"""
+    h, w = image.shape[:2]
+    r = min(imgsz / h, imgsz / w)
+    nw, nh = int(round(w * r)), int(round(h * r))
+    resized = cv2.resize(image, (nw, nh), interpolation=cv2.INTER_LINEAR) if (nw, nh) != (w, h) else image
+    pad_x, pad_y = (imgsz - nw) // 2, (imgsz - nh) // 2
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    canvas[pad_y:pad_y + nh, pad_x:pad_x + nw] = resized
+    return canvas, r, (pad_x, pad_y)
+
+
+def preprocess(images, imgsz):
+    """BGR 이미지 목록을 (B, 3, imgsz, imgsz) float32 배치로 만든다."""
+    batch = np.stack([letterbox(image, imgsz)[0] for image in images])
+    batch = batch[..., ::-1].transpose(0, 3, 1, 2)
+    return np.ascontiguousarray(batch, dtype=np.float32) / 255.0
+
+
+class TorchBackend:
+    def __init__(self, checkpoint, imgsz, threads):
+        torch.set_num_threads(threads)
+        self.model = YOLO(checkpoint).model.fuse().eval()
+
+    def __call__(self, batch):
+        with torch.inference_mode():
+            out = self.model(torch.from_numpy(batch))
+        return out[0] if isinstance(out, (list, tuple)) else out
+
+
+class OnnxBackend:
+    def __init__(self, checkpoint, imgsz, threads):
+        import onnxruntime as ort
+        path = export_model(checkpoint, 'onnx', imgsz)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, batch):
+        return torch.from_numpy(self.session.run(None, {self.input_name: batch})[0])
+
+
+class OpenVinoBackend:
+    def __init__(self, checkpoint, imgsz, threads):
+        import openvino as ov
+        export_dir = export_model(checkpoint, 'openvino', imgsz)
+        xml_path = glob.glob(os.path.join(export_dir, '*.xml'))[0]
+        core = ov.Core()
+        self.model = core.compile_model(core.read_model(xml_path), 'CPU', {'INFERENCE_NUM_THREADS': threads})
+
+    def __call__(self, batch):
+        return torch.from_numpy(self.model(batch)[0])
+
+
+_BACKENDS = {'torch': TorchBackend, 'onnx': OnnxBackend, 'openvino': OpenVinoBackend}
+# 형식별로 있어야 하는 패키지
+_REQUIRES = {'torch': 'torch', 'onnx': 'onnxruntime', 'openvino': 'openvino'}
+
+
+def export_model(checkpoint, fmt, imgsz):
+    """
+    체크포인트를 dynamic 입력(batch, imgsz 가변)으로 내보낸다. 이미 내보낸 파일이 체크포인트보다 새것이면 다시 하지 않는다.
+    반환값: onnx 파일 경로 또는 openvino 디렉터리 경로
+    """
+    stem = os.path.splitext(checkpoint)[0]
+    target = stem + ('.onnx' if fmt == 'onnx' else '_openvino_model')
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(checkpoint):
+        return target
+    return YOLO(checkpoint).export(format=fmt, imgsz=imgsz, dynamic=True, verbose=False)
+
+
+def available_formats(formats):
+    """설치된 패키지로 측정할 수 있는 형식만 남긴다."""
+    available = []
+    for fmt in formats:
+        if fmt not in _BACKENDS:
+            raise ValueError(f"지원하지 않는 형식: {fmt} (가능: {', '.join(FORMATS)})")
+        if importlib.util.find_spec(_REQUIRES[fmt]) is None:
+            print(f"⚠️ {fmt} 형식을 건너뜁니다 (패키지 없음: {_REQUIRES[fmt]})")
+            continue
+        available.append(fmt)
+    return available
+
+
+def postprocess(detections, imgsz, originals, obb):
+    """NMS 결과를 원본 이미지 좌표의 numpy 배열 목록으로 되돌린다."""
+    outputs = []
+    for det, image in zip(detections, originals):
+        det = det.clone()
+        if obb:
+            det[:, :4] = ops.scale_boxes((imgsz, imgsz), det[:, :4], image.shape[:2], xywh=True)
+        else:
+            det[:, :4] = ops.scale_boxes((imgsz, imgsz), det[:, :4], image.shape[:2])
+        outputs.append(det.numpy())
+    return outputs
+
+
+def run_case(backend, images, batch_size, imgsz, obb, nc=0, conf=0.25, iou=0.7, warmup=3, iterations=20):
+    """
+    같은 입력 묶음을 iterations번 돌려 단계별 시간(ms)을 잰다. 처음 warmup번은 기록하지 않는다.
+    obb 출력은 4 + nc + 1(각도) 채널이라 nc(클래스 수)를 알려줘야 각도 채널을 클래스 점수로 읽지 않는다.
+    반환값: {단계: (iterations,) 배열} (+ 'total')
+    """
+    originals = [images[i % len(images)] for i in range(batch_size)]
+    times = {stage: [] for stage in STAGES}
+    for i in range(warmup + iterations):
+        t0 = time.perf_counter()
+        batch = preprocess(originals, imgsz)
+        t1 = time.perf_counter()
+        raw = backend(batch)
+        t2 = time.perf_counter()
+        # ultralytics predictor와 같이 detect는 nc=0(채널 수로 추정), obb는 클래스 수를 넘긴다
+        detections = ops.non_max_suppression(raw, conf, iou, nc=nc if obb else 0, rotated=obb)
+        t3 = time.perf_counter()
+        postprocess(detections, imgsz, originals, obb)
+        t4 = time.perf_counter()
+        if i >= warmup:
+            for stage, dt in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+                times[stage].append(dt * 1000)
+    result = {stage: np.asarray(values) for stage, values in times.items()}
+    result['total'] = sum(result[stage] for stage in STAGES)
+    return result
+
+
+def summarize(times, batch_size):
+    """단계별 p50, 전체 p50/p95/p99 (배치 단위 ms)와 초당 이미지 수."""
+    row = {f"{stage}_p50": float(np.percentile(times[stage], 50)) for stage in STAGES}
+    for p in PERCENTILES:
+        row[f"total_p{p}"] = float(np.percentile(times['total'], p))
+    row['img_per_s'] = batch_size * len(times['total']) / (times['total'].sum() / 1000)
+    return row
+
+
+def run_label(checkpoint):
+    """.../outputs_11class_yolo/run11/weights/best.pt → outputs_11class_yolo/run11"""
+    run_dir = os.path.dirname(os.path.dirname(os.path.abspath(checkpoint)))
+    return os.path.join(os.path.basename(os.path.dirname(run_dir)), os.path.basename(run_dir))
+
+
+def load_images(image_dir, limit=16):
+    with os.scandir(image_dir) as entries:
+        paths = sorted(e.path for e in entries if e.name.lower().endswith(IMAGE_EXTENSIONS))[:limit]
+    images = [image for image in (cv2.imread(p) for p in paths) if image is not None]
+    if not images:
+        raise ValueError(f"⚠️ 벤치마크에 쓸 이미지가 없습니다: {image_dir}")
+    return images
+
+
+def benchmark(checkpoints, image_dir, formats=('torch',), imgsz_list=(800,), batch_sizes=(1, 8),
+              thread_counts=(os.cpu_count(),), warmup=3, iterations=20, results_path=None):
+    """
+    체크포인트 × 형식 × imgsz × 스레드 수 × batch 조합을 모두 측정해 결과 행 목록을 돌려준다.
+    results_path를 주면 CSV에 덧붙인다 (처음 만들 때만 머리글을 쓴다).
+    """
+    images = load_images(image_dir, max(batch_sizes))
+    formats = available_formats(formats)
+    rows = []
+    for checkpoint in checkpoints:
+        model = YOLO(checkpoint)
+        obb, nc = model.task == 'obb', len(model.names)
+        for fmt in formats:
+            for imgsz in imgsz_list:
+                for threads in thread_counts:
+                    backend = _BACKENDS[fmt](checkpoint, imgsz, threads)
+                    for batch_size in batch_sizes:
+                        times = run_case(backend, images, batch_size, imgsz, obb, nc,
+                                         warmup=warmup, iterations=iterations)
+                        row = {'checkpoint': checkpoint, 'format': fmt, 'imgsz': imgsz, 'batch': batch_size,
+                               'threads': threads, **summarize(times, batch_size)}
+                        rows.append(row)
+                        print(f"⏳ {run_label(checkpoint)} {fmt} "
+                              f"imgsz={imgsz} batch={batch_size} threads={threads}: {row['img_per_s']:.1f} img/s")
+    if results_path and rows:
+        write_header = not os.path.exists(results_path)
+        with open(results_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            if write_header:
+                writer.writeheader()
+            writer.writerows(rows)
+    return rows
+
+
+def print_table(rows):
+    """결과 행을 비교 표로 출력한다 (시간은 배치 단위 ms)."""
+    header = (f"{'run':<32}{'fmt':<10}{'imgsz':>6}{'batch':>6}{'thr':>5}"
+              + "".join(f"{stage:>8}" for stage in STAGES)
+              + "".join(f"{'p' + str(p):>9}" for p in PERCENTILES) + f"{'img/s':>9}")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{run_label(row['checkpoint'])[-31:]:<32}{row['format']:<10}{row['imgsz']:>6}{row['batch']:>6}{row['threads']:>5}"
+              + "".join(f"{row[stage + '_p50']:>8.1f}" for stage in STAGES)
+              + "".join(f"{row[f'total_p{p}']:>9.1f}" for p in PERCENTILES) + f"{row['img_per_s']:>9.1f}")
+
+
+if __name__ == "__main__":
+    PROJECT_DIR = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo"
+    CHECKPOINTS = sorted(glob.glob(os.path.join(PROJECT_DIR, "outputs_11class_*yolo", "run*", "weights", "best.pt")))
+    IMAGE_DIR = os.path.join(PROJECT_DIR, "dataset", "val", "images")
+    RESULTS_PATH = os.path.join(PROJECT_DIR, "benchmark_inference.csv")
+
+    FORMATS_TO_RUN = ('torch', 'onnx', 'openvino')
+    IMGSZ_LIST = (640, 800, 1024)
+    BATCH_SIZES = (1, 4, 8)
+    THREAD_COUNTS = (4, os.cpu_count())
+
+    rows = benchmark(CHECKPOINTS, IMAGE_DIR, FORMATS_TO_RUN, IMGSZ_LIST, BATCH_SIZES, THREAD_COUNTS,
+                     results_path=RESULTS_PATH)
+    print_table(rows)
+    print(f"📝 결과: {RESULTS_PATH}")
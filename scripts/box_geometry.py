@@ -0,0 +1,78 @@
+# scripts/box_geometry.py
+# 축 정렬 박스의 IoU 행렬 계산 (평가/시각화 스크립트 공용)
+# GT × 예측 쌍마다 파이썬 함수를 부르는 대신, NumPy 브로드캐스팅으로 (n, m) 행렬을 한 번에 계산한다.
+# 박스가 수천 개인 보드에서도 메모리가 커지지 않도록 행을 나눠 계산한다 (한 번에 max_elements개 원소까지).
+import numpy as np
+
+BOX_FORMATS = ('xywh', 'xyxy')
+METRICS = ('iou', 'ios')
+# 한 번에 만드는 (행 × 열) 원소 수 상한 (float64 기준 중간 배열 몇 개 × 128MB 정도)
+MAX_ELEMENTS = 1 << 24
+
+
+def as_xyxy(boxes, fmt='xywh'):
+    """박스 목록을 (n, 4) float64 xyxy 배열로 바꾼다. COCO bbox는 [x, y, w, h]이므로 기본은 xywh다."""
+    if fmt not in BOX_FORMATS:
+        raise ValueError(f"지원하지 않는 박스 형식: {fmt} (가능: {', '.join(BOX_FORMATS)})")
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    if fmt == 'xyxy':
+        return boxes
+    return np.concatenate([boxes[:, :2], boxes[:, :2] + boxes[:, 2:]], axis=1)
+
+
+def box_area(xyxy):
+    return (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])
+
+
+def _overlap_block(a, area_a, b, area_b, metric):
+    """a (k, 4)와 b (m, 4) xyxy의 (k, m) 겹침."""
+    iw = np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0])
+    ih = np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1])
+    inter = np.clip(iw, 0, None) * np.clip(ih, 0, None)
+    if metric == 'ios':
+        denom = np.minimum(area_a[:, None], area_b[None, :])
+    else:
+        denom = area_a[:, None] + area_b[None, :] - inter
+    # 분모가 0인 (넓이 0) 쌍은 0으로 둔다
+    return np.divide(inter, denom, out=np.zeros_like(inter), where=denom > 0)
+
+
+def _row_chunks(n, m, max_elements):
+    step = max(1, max_elements // max(m, 1))
+    for start in range(0, n, step):
+        yield start, min(start + step, n)
+
+
+def iou_matrix(boxes_a, boxes_b, fmt='xywh', metric='iou', max_elements=MAX_ELEMENTS):
+    """
+    (n, 4)와 (m, 4) 박스의 (n, m) 겹침 행렬.
+    metric='iou'는 교집합/합집합, 'ios'는 교집합/둘 중 작은 박스 면적이다.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"지원하지 않는 겹침 기준: {metric} (가능: {', '.join(METRICS)})")
+    a, b = as_xyxy(boxes_a, fmt), as_xyxy(boxes_b, fmt)
+    area_a, area_b = box_area(a), box_area(b)
+    result = np.zeros((len(a), len(b)), dtype=np.float64)
+    if len(a) == 0 or len(b) == 0:
+        return result
+    for start, end in _row_chunks(len(a), len(b), max_elements):
+        result[start:end] = _overlap_block(a[start:end], area_a[start:end], b, area_b, metric)
+    return result
+
+
+def best_overlap(boxes_a, boxes_b, fmt='xywh', metric='iou', max_elements=MAX_ELEMENTS):
+    """
+    boxes_a 각각에 대해 가장 많이 겹치는 boxes_b의 (겹침 값, 인덱스)를 돌려준다. 전체 행렬은 만들지 않는다.
+    boxes_b가 비어 있으면 값은 0, 인덱스는 -1이다.
+    """
+    a, b = as_xyxy(boxes_a, fmt), as_xyxy(boxes_b, fmt)
+    best = np.zeros(len(a), dtype=np.float64)
+    index = np.full(len(a), -1, dtype=np.int64)
+    if len(a) == 0 or len(b) == 0:
+        return best, index
+    area_a, area_b = box_area(a), box_area(b)
+    for start, end in _row_chunks(len(a), len(b), max_elements):
+        block = _overlap_block(a[start:end], area_a[start:end], b, area_b, metric)
+        index[start:end] = block.argmax(axis=1)
+        best[start:end] = block[np.arange(end - start), index[start:end]]
+    return best, index
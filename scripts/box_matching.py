@@ -0,0 +1,119 @@
+# scripts/box_matching.py
+# 미리 계산한 IoU 행렬로 GT와 예측을 1:1 매칭한다 (box_geometry.iou_matrix와 함께 쓴다).
+#   greedy    : COCOeval과 같은 방식. 예측을 점수 내림차순으로 보면서, 아직 매칭되지 않은 GT 중 IoU가 가장 높은 것을 고른다.
+#   hungarian : IoU 합이 최대가 되는 최적 할당 (scipy.optimize.linear_sum_assignment)
+# 두 방식 모두 classes를 주면 같은 클래스끼리만 매칭하고, threshold 미만 쌍은 매칭하지 않는다.
+# 결과는 GT별 매칭된 예측 번호(gt_match)와 예측별 매칭된 GT 번호(pred_match)이며, 매칭이 없으면 -1이다.
+import numpy as np
+
+from annotation_index import group_indices
+from box_geometry import iou_matrix
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy가 없으면 hungarian만 쓸 수 없다
+    linear_sum_assignment = None
+
+MATCH_METHODS = ('greedy', 'hungarian')
+
+
+def _valid_ious(ious, threshold, gt_classes=None, pred_classes=None):
+    """threshold 미만이거나 클래스가 다른 쌍을 -1로 지운 IoU 행렬 사본."""
+    ious = np.array(ious, dtype=np.float64, copy=True)
+    if gt_classes is not None and pred_classes is not None:
+        ious[np.asarray(gt_classes)[:, None] != np.asarray(pred_classes)[None, :]] = -1
+    ious[ious < threshold] = -1
+    return ious
+
+
+def greedy_match(ious, scores=None, threshold=0.5, gt_classes=None, pred_classes=None):
+    """
+    ious: (GT 수, 예측 수) IoU 행렬, scores: 예측 점수 (없으면 입력 순서대로 본다)
+    반환값: (gt_match (G,), pred_match (P,))
+    """
+    valid = _valid_ious(ious, threshold, gt_classes, pred_classes)
+    num_gt, num_pred = valid.shape
+    gt_match = np.full(num_gt, -1, dtype=np.int64)
+    pred_match = np.full(num_pred, -1, dtype=np.int64)
+    if num_gt == 0 or num_pred == 0:
+        return gt_match, pred_match
+
+    order = np.arange(num_pred) if scores is None else np.argsort(-np.asarray(scores), kind='stable')
+    # 매칭 가능한 GT가 하나도 없는 예측은 건너뛴다
+    order = order[(valid[:, order] >= 0).any(axis=0)]
+    for p in order:
+        column = valid[:, p]
+        g = int(np.argmax(column))
+        if column[g] < 0:
+            continue
+        gt_match[g] = p
+        pred_match[p] = g
+        valid[g, :] = -1
+    return gt_match, pred_match
+
+
+def hungarian_match(ious, threshold=0.5, gt_classes=None, pred_classes=None):
+    """
+    IoU 합이 최대가 되는 1:1 매칭. 매칭 가능한 쌍이 있는 행/열만 남겨 할당 문제 크기를 줄인다.
+    반환값: (gt_match (G,), pred_match (P,))
+    """
+    if linear_sum_assignment is None:
+        raise ImportError("hungarian 매칭에는 scipy가 필요합니다 (pip install scipy)")
+    valid = _valid_ious(ious, threshold, gt_classes, pred_classes)
+    num_gt, num_pred = valid.shape
+    gt_match = np.full(num_gt, -1, dtype=np.int64)
+    pred_match = np.full(num_pred, -1, dtype=np.int64)
+    rows = np.flatnonzero((valid >= 0).any(axis=1))
+    cols = np.flatnonzero((valid >= 0).any(axis=0))
+    if len(rows) == 0:
+        return gt_match, pred_match
+
+    # 매칭할 수 없는 쌍은 가중치 0으로 두고, 할당 후 걸러낸다
+    weights = np.clip(valid[np.ix_(rows, cols)], 0, None)
+    r, c = linear_sum_assignment(weights, maximize=True)
+    ok = valid[rows[r], cols[c]] >= 0
+    gt_match[rows[r[ok]]] = cols[c[ok]]
+    pred_match[cols[c[ok]]] = rows[r[ok]]
+    return gt_match, pred_match
+
+
+def match_boxes(gt_boxes, pred_boxes, pred_scores=None, threshold=0.5, gt_classes=None, pred_classes=None,
+                method='greedy', fmt='xywh'):
+    """이미지 하나의 GT/예측 박스를 IoU 행렬로 만든 뒤 매칭한다. 반환값: (gt_match, pred_match, IoU 행렬)"""
+    if method not in MATCH_METHODS:
+        raise ValueError(f"지원하지 않는 매칭 방식: {method} (가능: {', '.join(MATCH_METHODS)})")
+    ious = iou_matrix(gt_boxes, pred_boxes, fmt)
+    if method == 'hungarian':
+        gt_match, pred_match = hungarian_match(ious, threshold, gt_classes, pred_classes)
+    else:
+        gt_match, pred_match = greedy_match(ious, pred_scores, threshold, gt_classes, pred_classes)
+    return gt_match, pred_match, ious
+
+
+def match_batch(gt_image_ids, gt_boxes, gt_classes, pred_image_ids, pred_boxes, pred_classes, pred_scores,
+                threshold=0.5, method='greedy', class_aware=True, fmt='xywh'):
+    """
+    여러 이미지의 GT/예측을 이어 붙인 배열로 받아 이미지별로 매칭한다.
+    반환값: (gt_match, pred_match) — 이어 붙인 배열 기준의 전역 인덱스이며 매칭이 없으면 -1
+    """
+    gt_boxes = np.asarray(gt_boxes, dtype=np.float64).reshape(-1, 4)
+    pred_boxes = np.asarray(pred_boxes, dtype=np.float64).reshape(-1, 4)
+    gt_classes, pred_classes = np.asarray(gt_classes), np.asarray(pred_classes)
+    pred_scores = np.asarray(pred_scores, dtype=np.float64)
+    gt_match = np.full(len(gt_boxes), -1, dtype=np.int64)
+    pred_match = np.full(len(pred_boxes), -1, dtype=np.int64)
+
+    gt_order, gt_spans = group_indices(gt_image_ids)
+    pred_order, pred_spans = group_indices(pred_image_ids)
+    for image_id, (gs, ge) in gt_spans.items():
+        if image_id not in pred_spans:
+            continue
+        ps, pe = pred_spans[image_id]
+        g, p = gt_order[gs:ge], pred_order[ps:pe]
+        local_gt, local_pred, _ = match_boxes(
+            gt_boxes[g], pred_boxes[p], pred_scores[p], threshold,
+            gt_classes[g] if class_aware else None, pred_classes[p] if class_aware else None, method, fmt)
+        hit = local_gt >= 0
+        gt_match[g[hit]] = p[local_gt[hit]]
+        pred_match[p[local_gt[hit]]] = g[hit]
+    return gt_match, pred_match
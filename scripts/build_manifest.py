@@ -0,0 +1,160 @@
+# scripts/build_manifest.py
+# 데이터셋 준비 단계별 증분 빌드용 매니페스트
+# 입력 파일의 내용 해시, 단계 파라미터, 출력 파일 목록을 기록해 두고
+# 다음 실행 때는 바뀌었거나 새로 추가된 샘플만 다시 처리하게 한다.
+import os
+import json
+import hashlib
+
+MANIFEST_VERSION = 1
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-1 해시를 계산한다."""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def params_digest(params):
+    """단계 파라미터(해상도, 클래스 매핑, 증강 설정 등)를 하나의 해시로 만든다."""
+    text = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class StageManifest:
+    """
+    한 단계(스크립트)의 매니페스트.
+    - key: 샘플 식별자 (보통 파일명)
+    - inputs: {경로: {size, mtime_ns, sha1}} — size/mtime이 같으면 해시를 다시 계산하지 않는다.
+    - outputs: 이 샘플로부터 만들어진 파일 경로 목록
+    파라미터 해시가 바뀌면 기존 기록을 모두 버리고 전체를 다시 처리한다.
+    이때 예전 기록의 출력 파일을 먼저 지워서, 새 파라미터로 만든 결과와 옛 결과(예: 이전 비율로 나눈 train/val 복사본,
+    이전 타일 크기의 타일)가 섞이지 않게 한다. 매니페스트를 읽을 수 없어 출력 목록을 모르면 output_dirs의 파일을 비운다.
+    """
+
+    def __init__(self, stage, manifest_dir, params=None, output_dirs=None):
+        os.makedirs(manifest_dir, exist_ok=True)
+        # '.json'으로 끝나지 않게 해서 JSON 디렉터리를 순회하는 단계에 섞여 들어가지 않게 한다
+        self.path = os.path.join(manifest_dir, f".{stage}.manifest")
+        self.stage = stage
+        self.params_hash = params_digest(params or {})
+        self.output_dirs = list(output_dirs or [])
+        self.entries = {}
+        self.seen = set()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 매니페스트를 읽을 수 없어 전체를 다시 처리합니다: {self.path} ({e})")
+            self._clear_output_dirs()
+            return
+        if data.get('version') != MANIFEST_VERSION or data.get('params') != self.params_hash:
+            print(f"ℹ️ [{self.stage}] 파라미터가 바뀌어 이전 출력을 지우고 전체를 다시 처리합니다.")
+            self._remove_outputs(data.get('entries', {}))
+            return
+        self.entries = data.get('entries', {})
+
+    def _remove_outputs(self, entries):
+        """이전 기록에 남은 출력 파일을 모두 지운다."""
+        removed = 0
+        for entry in entries.values():
+            for path in entry.get('outputs', []):
+                if os.path.exists(path):
+                    os.remove(path)
+                    removed += 1
+        if removed:
+            print(f"🗑️ [{self.stage}] 이전 출력 {removed}개를 지웠습니다.")
+
+    def _clear_output_dirs(self):
+        """출력 목록을 알 수 없을 때 output_dirs 안의 파일을 지운다 (숨김 파일인 매니페스트/캐시는 남긴다)."""
+        removed = 0
+        for output_dir in self.output_dirs:
+            if not os.path.isdir(output_dir):
+                continue
+            with os.scandir(output_dir) as entries:
+                for e in entries:
+                    if e.is_file() and not e.name.startswith('.'):
+                        os.remove(e.path)
+                        removed += 1
+        if removed:
+            print(f"🗑️ [{self.stage}] 출력 폴더의 파일 {removed}개를 지웠습니다.")
+
+    @staticmethod
+    def _file_state(path, previous=None):
+        st = os.stat(path)
+        if previous and previous.get('size') == st.st_size and previous.get('mtime_ns') == st.st_mtime_ns:
+            return previous
+        return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha1': file_digest(path)}
+
+    def is_current(self, key, inputs, outputs=None, **expected):
+        """
+        key의 입력 내용이 기록과 같고 출력 파일이 모두 남아 있으면 True를 돌려준다.
+        outputs를 주지 않으면 매니페스트에 기록된 출력 목록을 확인한다.
+        expected로 준 값(예: 파일이 아닌 입력의 해시)은 record 때 extra로 저장한 값과 같아야 한다.
+        """
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if entry is None or sorted(entry['inputs']) != sorted(inputs):
+            return False
+        if any(entry.get(k) != v for k, v in expected.items()):
+            return False
+
+        for path in inputs:
+            previous = entry['inputs'][path]
+            try:
+                state = self._file_state(path, previous)
+            except OSError:
+                return False
+            if state['sha1'] != previous['sha1']:
+                return False
+            # 내용은 같고 mtime만 바뀐 경우 stat 정보만 갱신해 다음 실행에서 해시를 건너뛴다
+            entry['inputs'][path] = state
+
+        expected = entry['outputs'] if outputs is None else outputs
+        return all(os.path.exists(p) for p in expected)
+
+    def record(self, key, inputs, outputs, **extra):
+        """처리가 끝난 샘플의 입력 상태와 출력 목록을 기록한다 (추가 정보는 extra로 저장)."""
+        self.seen.add(key)
+        previous = self.entries.get(key, {}).get('inputs', {})
+        self.entries[key] = {
+            'inputs': {p: self._file_state(p, previous.get(p)) for p in inputs},
+            'outputs': list(outputs),
+            **extra
+        }
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def stale_keys(self):
+        """이번 실행에서 한 번도 확인되지 않은 key (= 입력이 삭제된 샘플) 목록."""
+        return [k for k in self.entries if k not in self.seen]
+
+    def forget(self, key, remove_outputs=False):
+        """key 기록을 지우고, 필요하면 그 샘플의 출력 파일도 삭제한다."""
+        entry = self.entries.pop(key, None)
+        if entry and remove_outputs:
+            for path in entry['outputs']:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def save(self):
+        """매니페스트를 임시 파일에 쓴 뒤 교체해서, 중간에 중단돼도 기존 기록이 깨지지 않게 한다."""
+        data = {
+            'version': MANIFEST_VERSION,
+            'stage': self.stage,
+            'params': self.params_hash,
+            'entries': self.entries
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,269 @@
+# scripts/dataset_audit.py
+# 이미지/라벨 데이터셋 감사 (1_4_check, 1_5_check, 1_7_varify, 1_9_varify, plus_compare_folders 공용)
+# 디렉터리마다 os.scandir 한 번으로 목록을 만들고, 라벨 내용과 이미지 헤더를 프로세스 풀로 검사한 뒤
+# 결과를 사람이 읽는 요약과 기계가 읽는 JSON 보고서로 남긴다. (CI에서는 report['ok']로 학습 진행 여부를 판단한다)
+#
+# 검사 항목
+#   missing_labels / missing_images : 이미지와 라벨의 파일 이름(stem) 매칭
+#   duplicate_stems    : 한 폴더 안에서 확장자만 다르고 stem이 같은 파일 (예: x.jpg와 x.png — 하나만 감사된다)
+#   bad_lines          : 열 개수가 형식(yolo 5열, obb 9열 = 꼭짓점 4개)과 다르거나 숫자가 아닌 줄
+#   class_out_of_range : 클래스 ID가 정수가 아니거나 [0, nc) 범위를 벗어남 (nc는 dataset.yaml에서 읽는다)
+#   out_of_bounds      : 좌표가 [0, 1] 밖
+#   zero_area          : 폭/높이(obb는 다각형 면적)가 0인 박스
+#   duplicates         : 같은 이미지 안에서 클래스와 좌표가 같은 박스
+#   unreadable_images  : 이미지 헤더/디코딩 실패 (image_verify)
+#   image_size         : 이미지 크기가 기대 크기(예: 800×800)와 다름
+import os
+import sys
+import json
+
+import numpy as np
+import yaml
+
+from image_verify import CACHE_NAME, IMAGE_EXTENSIONS, verify_images
+from label_codec import FORMAT_COLUMNS
+from parallel_utils import chunked, imap_parallel
+
+# 좌표 범위 검사 허용 오차 (소수 6자리로 저장하면서 생기는 반올림 오차)
+COORD_EPS = 1e-6
+# 콘솔에 항목별로 보여줄 최대 개수 (보고서 JSON에는 전부 기록한다)
+MAX_PRINT = 20
+
+
+def load_num_classes(dataset_yaml):
+    """dataset.yaml의 nc (없으면 names 개수)를 읽는다."""
+    with open(dataset_yaml, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    if 'nc' in config:
+        return int(config['nc'])
+    return len(config['names'])
+
+
+def list_names(directory, extensions):
+    """os.scandir 한 번으로 extensions(소문자 확장자 튜플)에 해당하는 파일 이름(확장자 포함) 목록을 정렬해 만든다."""
+    with os.scandir(directory) as entries:
+        return sorted(e.name for e in entries if e.name.lower().endswith(extensions) and e.is_file())
+
+
+def scan_dir(directory, extensions):
+    """
+    {stem: 파일 이름}과 stem이 겹치는 파일 목록을 만든다.
+    stem이 같은 파일이 여럿이면 이름순으로 첫 파일만 남기고, 나머지는 [{'stem', 'files'}]로 따로 돌려준다.
+    """
+    found, duplicates = {}, {}
+    for name in list_names(directory, extensions):
+        stem = os.path.splitext(name)[0]
+        if stem in found:
+            duplicates.setdefault(stem, [found[stem]]).append(name)
+        else:
+            found[stem] = name
+    return found, [{'stem': stem, 'files': files} for stem, files in sorted(duplicates.items())]
+
+
+def compare_dirs(dir_a, dir_b, extensions):
+    """두 폴더에서 extensions에 해당하는 파일 이름(확장자 포함)을 비교해 (a에만, b에만) 정렬 목록을 돌려준다."""
+    names_a = set(list_names(dir_a, extensions))
+    names_b = set(list_names(dir_b, extensions))
+    return sorted(names_a - names_b), sorted(names_b - names_a)
+
+
+def _polygon_area(pts):
+    """(n, 4, 2) 꼭짓점의 다각형 면적 (신발끈 공식)."""
+    x, y = pts[..., 0], pts[..., 1]
+    return 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=1) - y * np.roll(x, -1, axis=1), axis=1))
+
+
+def audit_label_text(text, fmt='yolo', num_classes=None):
+    """
+    라벨 파일 하나의 내용을 검사한다. 줄 번호(1부터)로 문제 위치를 돌려준다.
+    반환값: {'boxes', 'classes', 'bad_lines', 'class_out_of_range', 'out_of_bounds', 'zero_area', 'duplicates'}
+    """
+    ncols = FORMAT_COLUMNS[fmt]
+    line_numbers, rows, bad_lines = [], [], []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) != ncols + 1:
+            bad_lines.append(lineno)
+            continue
+        try:
+            rows.append([float(v) for v in parts])
+        except ValueError:
+            bad_lines.append(lineno)
+            continue
+        line_numbers.append(lineno)
+
+    result = {'boxes': len(rows), 'classes': [], 'bad_lines': bad_lines, 'class_out_of_range': [],
+              'out_of_bounds': [], 'zero_area': [], 'duplicates': []}
+    if not rows:
+        return result
+
+    table = np.asarray(rows, dtype=np.float64)
+    lines = np.asarray(line_numbers)
+    cls, coords = table[:, 0], table[:, 1:]
+
+    bad_class = cls != np.round(cls)
+    if num_classes is not None:
+        bad_class |= (cls < 0) | (cls >= num_classes)
+    result['class_out_of_range'] = [[int(l), float(c)] for l, c in zip(lines[bad_class], cls[bad_class])]
+    result['classes'] = cls[~bad_class].astype(np.int64).tolist()
+
+    outside = ((coords < -COORD_EPS) | (coords > 1 + COORD_EPS)).any(axis=1)
+    result['out_of_bounds'] = lines[outside].tolist()
+
+    if fmt == 'obb':
+        zero = _polygon_area(coords.reshape(-1, 4, 2)) <= 0
+    else:
+        zero = (coords[:, 2] <= 0) | (coords[:, 3] <= 0)
+    result['zero_area'] = lines[zero].tolist()
+
+    # 소수 6자리로 맞춘 (클래스, 좌표) 행이 같으면 중복으로 본다 (처음 나온 줄은 남긴다)
+    _, first, inverse = np.unique(np.round(table, 6), axis=0, return_index=True, return_inverse=True)
+    duplicate = first[inverse.reshape(-1)] != np.arange(len(table))
+    result['duplicates'] = lines[duplicate].tolist()
+    return result
+
+
+def _audit_label_chunk(task):
+    paths, fmt, num_classes = task
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                results.append((path, audit_label_text(f.read(), fmt, num_classes), None))
+        except (OSError, UnicodeDecodeError) as e:
+            results.append((path, None, str(e)))
+    return results
+
+
+def audit_dataset(image_dir, label_dir, fmt='yolo', num_classes=None, expected_size=(800, 800),
+                  full_decode=False, check_images=True, workers=None, chunk_size=128, report_path=None):
+    """
+    이미지/라벨 폴더 한 쌍을 감사하고 보고서 딕셔너리를 돌려준다. report_path를 주면 JSON으로 저장한다.
+    expected_size=None이면 이미지 크기는 검사하지 않고, check_images=False면 이미지 헤더도 읽지 않는다.
+    """
+    images, duplicate_images = scan_dir(image_dir, IMAGE_EXTENSIONS)
+    labels, duplicate_labels = scan_dir(label_dir, ('.txt',))
+
+    issues = {
+        'missing_labels': sorted(set(images) - set(labels)),
+        'missing_images': sorted(set(labels) - set(images)),
+        'duplicate_stems': duplicate_images + duplicate_labels,
+        'unreadable_labels': [],
+        'bad_lines': [],
+        'class_out_of_range': [],
+        'out_of_bounds': [],
+        'zero_area': [],
+        'duplicates': [],
+        'unreadable_images': [],
+        'image_size': [],
+    }
+
+    # 라벨 내용 검사
+    label_paths = [os.path.join(label_dir, labels[stem]) for stem in sorted(labels)]
+    tasks = [(chunk, fmt, num_classes) for chunk in chunked(label_paths, chunk_size)]
+    num_boxes = 0
+    class_counts = np.zeros(num_classes or 0, dtype=np.int64)
+    for chunk_results in imap_parallel(_audit_label_chunk, tasks, workers=workers):
+        for path, result, error in chunk_results:
+            name = os.path.basename(path)
+            if error is not None:
+                issues['unreadable_labels'].append({'file': name, 'error': error})
+                continue
+            num_boxes += result['boxes']
+            if result['classes']:
+                counts = np.bincount(result['classes'])
+                if len(counts) > len(class_counts):
+                    class_counts = np.pad(class_counts, (0, len(counts) - len(class_counts)))
+                class_counts[:len(counts)] += counts
+            for key in ('bad_lines', 'out_of_bounds', 'zero_area', 'duplicates'):
+                if result[key]:
+                    issues[key].append({'file': name, 'lines': result[key]})
+            if result['class_out_of_range']:
+                issues['class_out_of_range'].append({'file': name, 'lines': result['class_out_of_range']})
+
+    # 이미지 헤더/크기 검사 (image_verify 캐시를 같이 쓴다)
+    if check_images and images:
+        image_paths = [os.path.join(image_dir, images[stem]) for stem in sorted(images)]
+        results = verify_images(image_paths, full=full_decode, workers=workers,
+                                cache_path=os.path.join(image_dir, CACHE_NAME))
+        for path in image_paths:
+            r = results[path]
+            if not r['ok']:
+                issues['unreadable_images'].append({'file': os.path.basename(path), 'error': r['error']})
+            elif expected_size is not None and (r['width'], r['height']) != tuple(expected_size):
+                issues['image_size'].append({'file': os.path.basename(path), 'size': [r['width'], r['height']]})
+
+    report = {
+        'image_dir': os.path.abspath(image_dir),
+        'label_dir': os.path.abspath(label_dir),
+        'format': fmt,
+        'num_classes': num_classes,
+        'expected_size': list(expected_size) if expected_size else None,
+        'summary': {
+            'images': len(images),
+            'labels': len(labels),
+            'boxes': num_boxes,
+            'class_counts': class_counts.tolist(),
+            **{key: len(value) for key, value in issues.items()},
+        },
+        'issues': issues,
+    }
+    report['ok'] = all(len(value) == 0 for value in issues.values())
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
+
+
+_ISSUE_TITLES = {
+    'missing_labels': "라벨 파일이 없는 이미지",
+    'missing_images': "이미지 파일이 없는 라벨",
+    'duplicate_stems': "stem이 같은 파일 (하나만 감사됨)",
+    'unreadable_labels': "읽을 수 없는 라벨 파일",
+    'bad_lines': "열 개수/형식이 잘못된 줄",
+    'class_out_of_range': "클래스 ID 범위 초과",
+    'out_of_bounds': "[0, 1] 밖의 좌표",
+    'zero_area': "면적이 0인 박스",
+    'duplicates': "중복 박스",
+    'unreadable_images': "손상된 이미지",
+    'image_size': "기대 크기와 다른 이미지",
+}
+
+
+def print_report(report, max_print=MAX_PRINT):
+    """감사 보고서를 사람이 읽기 쉬운 형태로 출력한다."""
+    summary = report['summary']
+    print(f">> 감사: {report['image_dir']} / {report['label_dir']} ({report['format']})")
+    print(f" - 이미지 {summary['images']}개, 라벨 {summary['labels']}개, 박스 {summary['boxes']}개")
+    if summary['class_counts']:
+        print(f" - 클래스별 박스 수: {summary['class_counts']}")
+    for key, title in _ISSUE_TITLES.items():
+        items = report['issues'][key]
+        if not items:
+            continue
+        print(f"‼️ {title}: {len(items)}개")
+        for item in items[:max_print]:
+            print("  -", item)
+        if len(items) > max_print:
+            print(f"  ... 외 {len(items) - max_print}개 (보고서 참고)")
+    if report['ok']:
+        print("✅ 모든 검사를 통과했습니다.")
+
+
+if __name__ == "__main__":
+    # CI에서: python scripts/dataset_audit.py → 문제가 있으면 종료 코드 1
+    DATASET_DIR = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset"
+    DATASET_YAML = os.path.join(DATASET_DIR, "dataset.yaml")
+    num_classes = load_num_classes(DATASET_YAML)
+
+    all_ok = True
+    for split in ["train", "val"]:
+        report = audit_dataset(os.path.join(DATASET_DIR, split, "images"), os.path.join(DATASET_DIR, split, "labels"),
+                               fmt='yolo', num_classes=num_classes,
+                               report_path=os.path.join(DATASET_DIR, f"audit_{split}.json"))
+        print_report(report)
+        all_ok &= report['ok']
+    sys.exit(0 if all_ok else 1)
@@ -0,0 +1,287 @@
+# scripts/fast_coco_eval.py
+# pycocotools.COCOeval과 같은 규칙으로 bbox AP/AR을 계산하는 평가기 (12개 stats + 클래스별 AP)
+# COCOeval은 (이미지, 클래스, 면적 구간)마다 파이썬으로 GT × 예측을 하나씩 비교해서,
+# 박스가 수천 개인 PCB 보드에서는 evaluate/accumulate가 몇 분씩 걸린다. 여기서는
+#   - IoU는 (예측 수, GT 수) 행렬로 한 번에 계산하고 (iou_fn으로 바꿀 수 있다 — 회전 박스 등)
+#   - 매칭은 예측 하나당 IoU 임계값 10개를 한꺼번에 처리하며, 가장 낮은 임계값 이상으로 겹치는 GT만 후보로 본다
+#   - 이미지 단위 작업은 프로세스 풀로 나눠 돌린다
+# 매칭 규칙(점수순, crowd GT, 무시 GT는 마지막 후보, 면적 구간 경계 포함, 101점 보간)은 COCOeval과 같다.
+# COCOeval의 maxDets=[1, 10, 100]은 박스가 100개 넘는 보드를 조용히 잘라내므로 max_dets로 바꿀 수 있게 했다
+# (stats는 COCOeval처럼 max_dets[0], [1], [2] 자리에 계산한다).
+import json
+
+import numpy as np
+
+from annotation_index import group_indices
+from box_geometry import iou_matrix
+from parallel_utils import chunked, imap_parallel, ThroughputMeter
+
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+RECALL_THRESHOLDS = np.linspace(0.0, 1.0, 101)
+AREA_RANGES = (('all', 0, 1e5 ** 2), ('small', 0, 32 ** 2), ('medium', 32 ** 2, 96 ** 2), ('large', 96 ** 2, 1e5 ** 2))
+COCO_MAX_DETS = (1, 10, 100)
+# 부품이 수천 개인 보드용
+DENSE_MAX_DETS = (100, 1000, 3000)
+
+_worker = {}
+
+
+def bbox_iou(dt_boxes, gt_boxes, gt_crowd):
+    """
+    COCO bbox IoU (예측 수, GT 수). crowd GT는 교집합 / 예측 면적으로 계산한다 (maskUtils.iou와 같다).
+    iou_fn을 바꿀 때도 이 형식(예측 기하, GT 기하, GT crowd 여부 → (D, G) 행렬)을 따른다.
+    """
+    ious = iou_matrix(dt_boxes, gt_boxes)
+    if len(ious) and np.any(gt_crowd):
+        dt_area = dt_boxes[:, 2] * dt_boxes[:, 3]
+        gt_area = gt_boxes[:, 2] * gt_boxes[:, 3]
+        crowd = np.flatnonzero(gt_crowd)
+        # IoU = I / (Ad + Ag - I) 에서 교집합 I를 되살린다
+        sub = ious[:, crowd]
+        inter = sub * (dt_area[:, None] + gt_area[None, crowd]) / (1 + sub)
+        ious[:, crowd] = np.divide(inter, dt_area[:, None], out=np.zeros_like(inter), where=dt_area[:, None] > 0)
+    return ious
+
+
+def _load(source):
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return source
+
+
+def _geometry(records, key):
+    if not records:
+        return np.zeros((0, 4), dtype=np.float64)
+    return np.asarray([r[key] for r in records], dtype=np.float64)
+
+
+def _match(ious, gt_ignore, gt_crowd):
+    """
+    점수 내림차순으로 정렬된 예측과 (무시하지 않는 GT가 앞에 오도록 정렬된) GT를 임계값별로 매칭한다.
+    반환값: (dt_matched (T, D), dt_ignore (T, D))
+    """
+    num_thr = len(IOU_THRESHOLDS)
+    num_dt, num_gt = ious.shape
+    dt_matched = np.zeros((num_thr, num_dt), dtype=bool)
+    dt_ignore = np.zeros((num_thr, num_dt), dtype=bool)
+    if num_dt == 0 or num_gt == 0:
+        return dt_matched, dt_ignore
+
+    thresholds = np.minimum(IOU_THRESHOLDS, 1 - 1e-10)
+    gt_taken = np.zeros((num_thr, num_gt), dtype=bool)
+    # 무시하지 않는 GT를 먼저 고르도록 IoU에 2를 더해 우선순위를 준다
+    priority = np.where(gt_ignore, 0.0, 2.0)
+    candidates = ious >= thresholds[0]
+    rows = np.arange(num_thr)
+    for d in np.flatnonzero(candidates.any(axis=1)):
+        cols = np.flatnonzero(candidates[d])
+        values = ious[d, cols]
+        eligible = (values[None, :] >= thresholds[:, None]) & (~gt_taken[:, cols] | gt_crowd[cols])
+        key = np.where(eligible, values + priority[cols], -1.0)
+        # COCOeval처럼 IoU가 같으면 뒤쪽 GT를 고른다
+        pick = len(cols) - 1 - np.argmax(key[:, ::-1], axis=1)
+        hit = key[rows, pick] >= 0
+        g = cols[pick[hit]]
+        gt_taken[rows[hit], g] = True
+        dt_matched[hit, d] = True
+        dt_ignore[hit, d] = gt_ignore[g]
+    return dt_matched, dt_ignore
+
+
+def evaluate_category(gt, dt, iou_fn, max_det):
+    """
+    이미지 하나, 클래스 하나의 평가. gt/dt는 (기하, 면적, crowd) / (기하, 면적, 점수) 튜플이다.
+    반환값: (점수 (D,), 매칭 (A, T, D), 무시 (A, T, D), 면적 구간별 유효 GT 수 (A,))
+    """
+    gt_geom, gt_area, gt_crowd = gt
+    dt_geom, dt_area, dt_score = dt
+    order = np.argsort(-dt_score, kind='mergesort')[:max_det]
+    dt_geom, dt_area, dt_score = dt_geom[order], dt_area[order], dt_score[order]
+    ious = iou_fn(dt_geom, gt_geom, gt_crowd) if len(order) and len(gt_area) else np.zeros((len(order), len(gt_area)))
+
+    num_area = len(AREA_RANGES)
+    matched = np.zeros((num_area, len(IOU_THRESHOLDS), len(order)), dtype=bool)
+    ignored = np.zeros_like(matched)
+    num_valid = np.zeros(num_area, dtype=np.int64)
+    for a, (_, low, high) in enumerate(AREA_RANGES):
+        gt_ignore = gt_crowd | (gt_area < low) | (gt_area > high)
+        gt_order = np.argsort(gt_ignore, kind='mergesort')
+        dt_matched, dt_ignore = _match(ious[:, gt_order], gt_ignore[gt_order], gt_crowd[gt_order])
+        # 매칭되지 않은 예측 중 면적 구간 밖의 것은 무시한다
+        outside = (dt_area < low) | (dt_area > high)
+        matched[a] = dt_matched
+        ignored[a] = dt_ignore | (~dt_matched & outside[None, :])
+        num_valid[a] = np.count_nonzero(~gt_ignore)
+    return dt_score, matched, ignored, num_valid
+
+
+def _init_worker(iou_fn, max_det):
+    _worker.update(iou_fn=iou_fn, max_det=max_det)
+
+
+def _evaluate_chunk(tasks):
+    """[(이미지 순번, {클래스 순번: (gt, dt)})] → [(이미지 순번, {클래스 순번: evaluate_category 결과})]"""
+    return [(image_pos, {k: evaluate_category(gt, dt, _worker['iou_fn'], _worker['max_det'])
+                         for k, (gt, dt) in per_class.items()})
+            for image_pos, per_class in tasks]
+
+
+def _split(records, key, cat_pos, image_pos, is_gt, use_bbox_area):
+    """기록 목록을 {이미지 순번: {클래스 순번: 튜플}}로 나눈다. 평가 대상이 아닌 이미지/클래스는 버린다."""
+    records = [r for r in records if r["image_id"] in image_pos and r["category_id"] in cat_pos]
+    order, spans = group_indices([image_pos[r["image_id"]] for r in records])
+    records = [records[i] for i in order]
+    geometry = _geometry(records, key)
+    boxes = _geometry(records, "bbox") if key != "bbox" else geometry
+    if use_bbox_area:
+        area = boxes[:, 2] * boxes[:, 3]
+    else:
+        area = np.asarray([r["area"] if "area" in r else r["bbox"][2] * r["bbox"][3] for r in records], dtype=np.float64)
+    classes = np.asarray([cat_pos[r["category_id"]] for r in records], dtype=np.int64)
+    if is_gt:
+        third = np.asarray([bool(r.get("iscrowd", 0)) for r in records], dtype=bool)
+    else:
+        third = np.asarray([r["score"] for r in records], dtype=np.float64)
+
+    grouped = {}
+    for pos, (start, end) in spans.items():
+        cls = classes[start:end]
+        grouped[pos] = {int(k): (geometry[start:end][cls == k], area[start:end][cls == k], third[start:end][cls == k])
+                        for k in np.unique(cls)}
+    return grouped
+
+
+def accumulate(per_image, num_classes, max_dets):
+    """이미지별 결과를 모아 COCOeval.accumulate와 같은 precision (T, R, K, A, M), recall (T, K, A, M)을 만든다."""
+    num_thr, num_rec, num_area = len(IOU_THRESHOLDS), len(RECALL_THRESHOLDS), len(AREA_RANGES)
+    precision = -np.ones((num_thr, num_rec, num_classes, num_area, len(max_dets)))
+    recall = -np.ones((num_thr, num_classes, num_area, len(max_dets)))
+    for k in range(num_classes):
+        # 이미지 순번 순서대로 모은다 (점수가 같을 때의 순서까지 COCOeval과 맞춘다)
+        results = [per_image[i][k] for i in sorted(per_image) if k in per_image[i]]
+        if not results:
+            continue
+        for a in range(num_area):
+            num_valid = sum(int(r[3][a]) for r in results)
+            if num_valid == 0:
+                continue
+            for m, max_det in enumerate(max_dets):
+                scores = np.concatenate([r[0][:max_det] for r in results])
+                order = np.argsort(-scores, kind='mergesort')
+                matched = np.concatenate([r[1][a][:, :max_det] for r in results], axis=1)[:, order]
+                ignored = np.concatenate([r[2][a][:, :max_det] for r in results], axis=1)[:, order]
+                tp = np.cumsum(matched & ~ignored, axis=1, dtype=np.float64)
+                fp = np.cumsum(~matched & ~ignored, axis=1, dtype=np.float64)
+                num_dt = tp.shape[1]
+                for t in range(num_thr):
+                    rc = tp[t] / num_valid
+                    pr = tp[t] / (fp[t] + tp[t] + np.spacing(1))
+                    recall[t, k, a, m] = rc[-1] if num_dt else 0
+                    if num_dt == 0:
+                        precision[t, :, k, a, m] = 0
+                        continue
+                    # 정밀도를 뒤에서부터 단조 감소하게 만든 뒤 재현율 임계값마다 읽는다
+                    pr = np.maximum.accumulate(pr[::-1])[::-1]
+                    inds = np.searchsorted(rc, RECALL_THRESHOLDS, side='left')
+                    precision[t, :, k, a, m] = np.where(inds < num_dt, pr[np.minimum(inds, num_dt - 1)], 0)
+    return precision, recall
+
+
+def _mean_valid(values):
+    values = values[values > -1]
+    return float(np.mean(values)) if len(values) else -1.0
+
+
+def summarize(precision, recall, max_dets, verbose=True):
+    """COCOeval.summarize와 같은 12개 stats를 계산하고 같은 형식으로 출력한다."""
+    area_index = {name: a for a, (name, _, _) in enumerate(AREA_RANGES)}
+    specs = [(1, None, 'all', 2), (1, 0.5, 'all', 2), (1, 0.75, 'all', 2),
+             (1, None, 'small', 2), (1, None, 'medium', 2), (1, None, 'large', 2),
+             (0, None, 'all', 0), (0, None, 'all', 1), (0, None, 'all', 2),
+             (0, None, 'small', 2), (0, None, 'medium', 2), (0, None, 'large', 2)]
+    stats = np.zeros(len(specs))
+    for i, (ap, iou_thr, area, m) in enumerate(specs):
+        s = precision if ap else recall
+        if iou_thr is not None:
+            s = s[np.flatnonzero(np.isclose(IOU_THRESHOLDS, iou_thr))]
+        s = s[..., area_index[area], m]
+        stats[i] = _mean_valid(s)
+        if verbose:
+            title = 'Average Precision  (AP)' if ap else 'Average Recall     (AR)'
+            iou_str = f"{IOU_THRESHOLDS[0]:0.2f}:{IOU_THRESHOLDS[-1]:0.2f}" if iou_thr is None else f"{iou_thr:0.2f}"
+            print(f" {title} @[ IoU={iou_str:<9} | area={area:>6s} | maxDets={max_dets[m]:>3d} ] = {stats[i]:0.3f}")
+    return stats
+
+
+def per_class_ap(precision, recall, class_names):
+    """클래스별 AP(0.50:0.95), AP50, AR (면적 all, 가장 큰 max_dets 기준). GT가 없는 클래스는 -1이다."""
+    return {name: {'AP': _mean_valid(precision[:, :, k, 0, -1]),
+                   'AP50': _mean_valid(precision[0, :, k, 0, -1]),
+                   'AR': _mean_valid(recall[:, k, 0, -1])}
+            for k, name in enumerate(class_names)}
+
+
+def print_per_class(per_class):
+    print(f"{'class':<14}{'AP':>8}{'AP50':>8}{'AR':>8}")
+    for name, row in per_class.items():
+        print(f"{name:<14}{row['AP']:>8.3f}{row['AP50']:>8.3f}{row['AR']:>8.3f}")
+
+
+def coco_evaluate(gt, dt, max_dets=COCO_MAX_DETS, iou_fn=bbox_iou, geometry_key="bbox",
+                  workers=None, chunk_size=16, verbose=True):
+    """
+    gt: COCO GT JSON 경로 또는 dict, dt: 예측 JSON 경로 또는 목록 ([{image_id, category_id, bbox, score}, ...])
+    iou_fn: (예측 기하, GT 기하, GT crowd) → (D, G) 행렬. 프로세스 풀에서 쓰려면 모듈 최상위 함수여야 한다.
+    geometry_key: iou_fn에 넘길 기하 필드 (기본 bbox). 면적 구간은 GT는 area 필드로, 예측은 bbox 넓이로 판단한다
+    (bbox가 아닌 기하를 쓰면 예측도 area 필드가 있으면 그 값을 쓴다 — 회전 박스의 다각형 넓이 등).
+    반환값: {'stats': (12,), 'per_class': {클래스 이름: {'AP', 'AP50', 'AR'}}, 'precision', 'recall'}
+    """
+    if len(max_dets) != 3:
+        raise ValueError(f"max_dets는 3개여야 합니다: {max_dets}")
+    gt_data, dt_list = _load(gt), _load(dt)
+    image_ids = sorted({img["id"] for img in gt_data["images"]})
+    categories = sorted(gt_data["categories"], key=lambda c: c["id"])
+    image_pos = {image_id: i for i, image_id in enumerate(image_ids)}
+    cat_pos = {cat["id"]: k for k, cat in enumerate(categories)}
+
+    unknown = sum(1 for r in dt_list if r["image_id"] not in image_pos)
+    if unknown:
+        print(f"⚠️ GT에 없는 image_id의 예측 {unknown}개는 평가에서 제외합니다.")
+
+    gt_groups = _split(gt_data["annotations"], geometry_key, cat_pos, image_pos, True, False)
+    # 예측 면적은 loadRes처럼 bbox 넓이로 계산한다
+    dt_groups = _split(dt_list, geometry_key, cat_pos, image_pos, False, geometry_key == "bbox")
+
+    tasks = []
+    for pos in sorted(set(gt_groups) | set(dt_groups)):
+        gt_classes, dt_classes = gt_groups.get(pos, {}), dt_groups.get(pos, {})
+        per_class = {}
+        for k in set(gt_classes) | set(dt_classes):
+            if k in gt_classes and k in dt_classes:
+                per_class[k] = (gt_classes[k], dt_classes[k])
+            elif k in gt_classes:
+                g = gt_classes[k]
+                per_class[k] = (g, (g[0][:0], np.zeros(0), np.zeros(0)))
+            else:
+                d = dt_classes[k]
+                per_class[k] = ((d[0][:0], np.zeros(0), np.zeros(0, dtype=bool)), d)
+        tasks.append((pos, per_class))
+
+    meter = ThroughputMeter("COCO 평가", total=len(tasks), unit="images") if verbose else None
+    per_image = {}
+    for results in imap_parallel(_evaluate_chunk, chunked(tasks, chunk_size), workers=workers,
+                                 initializer=_init_worker, initargs=(iou_fn, max(max_dets))):
+        for pos, per_class in results:
+            per_image[pos] = per_class
+        if meter is not None:
+            meter.update(len(results))
+    if meter is not None:
+        meter.summary()
+
+    precision, recall = accumulate(per_image, len(categories), max_dets)
+    stats = summarize(precision, recall, max_dets, verbose)
+    per_class = per_class_ap(precision, recall, [cat["name"] for cat in categories])
+    if verbose:
+        print_per_class(per_class)
+    return {'stats': stats, 'per_class': per_class, 'precision': precision, 'recall': recall}
@@ -0,0 +1,218 @@
+# scripts/image_dedup.py
+# 지각 해시(pHash/dHash)로 train/val 사이의 중복/유사 이미지를 찾는다.
+# - 이미지는 JPEG draft 모드로 작게 디코딩한 뒤 32×32 흑백으로 줄이고, 해시는 묶음 단위 행렬 연산으로 계산한다.
+# - 해시는 이미지당 uint64 두 개(pHash, dHash)로 .npz 인덱스에 저장한다.
+# - 해밍 거리는 XOR 후 바이트 단위 popcount 표로 (질의 묶음 × 전체) 행렬을 한 번에 계산한다.
+import os
+import json
+import shutil
+
+import numpy as np
+from PIL import Image
+
+from parallel_utils import chunked, imap_parallel, ThroughputMeter
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+HASH_SIZE = 8          # 8×8 = 64비트
+PHASH_SIZE = 32        # pHash는 32×32 DCT의 왼쪽 위 8×8 저주파 성분을 쓴다
+INDEX_VERSION = 1
+INDEX_NAME = ".image_hash_index.npz"
+
+# 0~255 각 바이트의 1비트 개수
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _dct_matrix(n):
+    """n×n DCT-II 정규직교 행렬."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m.astype(np.float32)
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+_BIT_WEIGHTS = (np.uint64(1) << np.arange(HASH_SIZE * HASH_SIZE, dtype=np.uint64))
+
+
+def load_thumbnail(path, size=PHASH_SIZE):
+    """JPEG은 draft 모드로 1/2~1/8 크기로 바로 디코딩한 뒤 size×size 흑백 배열로 줄인다."""
+    with Image.open(path) as img:
+        img.draft('L', (size * 4, size * 4))
+        return np.asarray(img.convert('L').resize((size, size), Image.BILINEAR), dtype=np.float32)
+
+
+def _pack_bits(bits):
+    """(N, 64) bool 행렬을 (N,) uint64로 묶는다."""
+    return (bits.astype(np.uint64) * _BIT_WEIGHTS).sum(axis=1, dtype=np.uint64)
+
+
+def phash(thumbs):
+    """(N, 32, 32) 흑백 썸네일의 pHash (N,) uint64."""
+    coeffs = np.einsum('ij,njk,lk->nil', _DCT, thumbs, _DCT)[:, :HASH_SIZE, :HASH_SIZE]
+    flat = coeffs.reshape(len(thumbs), -1)
+    # DC 성분(0, 0)은 밝기 평균이라 중앙값 계산에서 뺀다
+    median = np.median(flat[:, 1:], axis=1, keepdims=True)
+    return _pack_bits(flat > median)
+
+
+def dhash(thumbs):
+    """(N, 32, 32) 흑백 썸네일을 (8, 9)로 줄여 가로 방향 밝기 변화로 만든 dHash (N,) uint64."""
+    n = len(thumbs)
+    # 32×32 → 8×9 (블록 평균)
+    rows = thumbs.reshape(n, HASH_SIZE, PHASH_SIZE // HASH_SIZE, PHASH_SIZE).mean(axis=2)
+    cols = np.linspace(0, PHASH_SIZE, HASH_SIZE + 2).astype(int)
+    small = np.stack([rows[:, :, a:b].mean(axis=2) for a, b in zip(cols[:-1], cols[1:])], axis=2)
+    return _pack_bits((small[:, :, 1:] > small[:, :, :-1]).reshape(n, -1))
+
+
+def _hash_chunk(paths):
+    thumbs, ok, errors = [], [], []
+    for path in paths:
+        try:
+            thumbs.append(load_thumbnail(path))
+            ok.append(path)
+        except (OSError, ValueError) as e:
+            errors.append(f"{path}: {e}")
+    if not thumbs:
+        return ok, np.zeros(0, np.uint64), np.zeros(0, np.uint64), errors
+    thumbs = np.stack(thumbs)
+    return ok, phash(thumbs), dhash(thumbs), errors
+
+
+class HashIndex:
+    """이미지 경로와 pHash/dHash uint64 배열. save/load로 .npz에 저장한다."""
+
+    def __init__(self, paths, phashes, dhashes):
+        self.paths = list(paths)
+        self.phash = np.asarray(phashes, dtype=np.uint64)
+        self.dhash = np.asarray(dhashes, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def save(self, index_path):
+        np.savez(index_path, version=INDEX_VERSION, paths=np.asarray(self.paths, dtype=str),
+                 phash=self.phash, dhash=self.dhash)
+
+    @staticmethod
+    def load(index_path):
+        data = np.load(index_path)
+        if int(data['version']) != INDEX_VERSION:
+            raise ValueError(f"지원하지 않는 해시 인덱스 버전입니다: {int(data['version'])}")
+        return HashIndex(data['paths'].tolist(), data['phash'], data['dhash'])
+
+    @staticmethod
+    def build(image_dir, workers=None, chunk_size=64, index_path=None):
+        """image_dir의 모든 이미지 해시를 프로세스 풀로 계산한다. index_path가 있고 목록이 같으면 다시 쓰지 않는다."""
+        with os.scandir(image_dir) as entries:
+            paths = sorted(e.path for e in entries if e.name.lower().endswith(IMAGE_EXTENSIONS))
+        if index_path and os.path.exists(index_path):
+            cached = HashIndex.load(index_path)
+            if cached.paths == paths and _newest_mtime(paths) <= os.path.getmtime(index_path):
+                print(f"ℹ️ 해시 인덱스 재사용: {index_path} ({len(cached)}개)")
+                return cached
+
+        meter = ThroughputMeter(f"해시 계산 ({os.path.basename(image_dir.rstrip(os.sep))})", total=len(paths), unit="images")
+        all_paths, ph, dh = [], [], []
+        for ok, p, d, errors in imap_parallel(_hash_chunk, chunked(paths, chunk_size), workers=workers):
+            all_paths += ok
+            ph.append(p)
+            dh.append(d)
+            for err in errors:
+                print(f"\n❌ 해시 계산 실패: {err}")
+            meter.update(len(ok) + len(errors))
+        meter.summary()
+        index = HashIndex(all_paths,
+                          np.concatenate(ph) if ph else np.zeros(0, np.uint64),
+                          np.concatenate(dh) if dh else np.zeros(0, np.uint64))
+        if index_path:
+            index.save(index_path)
+        return index
+
+
+def _newest_mtime(paths):
+    return max((os.path.getmtime(p) for p in paths), default=0.0)
+
+
+def hamming(a, b):
+    """uint64 배열 a (n,)와 b (m,)의 (n, m) 해밍 거리 행렬."""
+    x = np.bitwise_xor(a[:, None], b[None, :])
+    return _POPCOUNT[x.view(np.uint8)].reshape(len(a), len(b), 8).sum(axis=2, dtype=np.uint8)
+
+
+def find_pairs(query, reference, phash_threshold=8, dhash_threshold=10, chunk_size=1024, same_index=False):
+    """
+    query의 각 이미지와 reference 전체를 비교해 두 해시 거리가 모두 임계값 이하인 쌍을 찾는다.
+    same_index=True면 한 인덱스 안의 중복을 찾으며, (i, j) i < j 쌍만 돌려준다.
+    반환값: [(query 경로, reference 경로, pHash 거리, dHash 거리)]
+    """
+    pairs = []
+    for start in range(0, len(query), chunk_size):
+        end = min(start + chunk_size, len(query))
+        dp = hamming(query.phash[start:end], reference.phash)
+        dd = hamming(query.dhash[start:end], reference.dhash)
+        hit = (dp <= phash_threshold) & (dd <= dhash_threshold)
+        if same_index:
+            hit &= np.arange(len(reference))[None, :] > np.arange(start, end)[:, None]
+        qi, ri = np.nonzero(hit)
+        for q, r in zip(qi.tolist(), ri.tolist()):
+            pairs.append((query.paths[start + q], reference.paths[r], int(dp[q, r]), int(dd[q, r])))
+    return pairs
+
+
+def check_leakage(train_dir, val_dir, phash_threshold=8, dhash_threshold=10, within_train=True,
+                  workers=None, report_path=None):
+    """
+    val 이미지와 거의 같은 train 이미지(누수), train 안의 중복 이미지를 찾는다.
+    해시 인덱스는 각 폴더의 .image_hash_index.npz에 남겨 다음 실행 때 재사용한다.
+    반환값: {'leaked': [(val, train, dp, dd)], 'duplicates': [(train_a, train_b, dp, dd)]}
+    """
+    train = HashIndex.build(train_dir, workers=workers, index_path=os.path.join(train_dir, INDEX_NAME))
+    val = HashIndex.build(val_dir, workers=workers, index_path=os.path.join(val_dir, INDEX_NAME))
+    result = {
+        'leaked': find_pairs(val, train, phash_threshold, dhash_threshold),
+        'duplicates': find_pairs(train, train, phash_threshold, dhash_threshold, same_index=True) if within_train else [],
+    }
+    if report_path:
+        write_report(report_path, result['leaked'], result['duplicates'])
+    return result
+
+
+def write_report(report_path, leaked, duplicates):
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'leaked_pairs': [{'query': q, 'reference': r, 'phash': p, 'dhash': d} for q, r, p, d in leaked],
+            'duplicate_pairs': [{'a': q, 'b': r, 'phash': p, 'dhash': d} for q, r, p, d in duplicates],
+        }, f, indent=2, ensure_ascii=False)
+
+
+def print_pairs(title, pairs, max_print=20):
+    if not pairs:
+        print(f"✅ {title}: 없음")
+        return
+    print(f"‼️ {title}: {len(pairs)}쌍")
+    for q, r, p, d in pairs[:max_print]:
+        print(f"  - {os.path.basename(q)} ↔ {os.path.basename(r)} (pHash {p}, dHash {d})")
+    if len(pairs) > max_print:
+        print(f"  ... 외 {len(pairs) - max_print}쌍 (보고서 참고)")
+
+
+def exclude_images(image_paths, label_dir=None, quarantine_dir=None):
+    """
+    image_paths를 학습에서 뺀다. quarantine_dir가 있으면 이미지와 같은 이름의 라벨을 그곳으로 옮기고,
+    없으면 아무것도 옮기지 않고 목록만 돌려준다.
+    """
+    image_paths = sorted(set(image_paths))
+    if quarantine_dir is None:
+        return image_paths
+    os.makedirs(os.path.join(quarantine_dir, "images"), exist_ok=True)
+    os.makedirs(os.path.join(quarantine_dir, "labels"), exist_ok=True)
+    for path in image_paths:
+        shutil.move(path, os.path.join(quarantine_dir, "images", os.path.basename(path)))
+        if label_dir:
+            label_path = os.path.join(label_dir, os.path.splitext(os.path.basename(path))[0] + ".txt")
+            if os.path.exists(label_path):
+                shutil.move(label_path, os.path.join(quarantine_dir, "labels", os.path.basename(label_path)))
+    print(f"🚚 {len(image_paths)}개 이미지를 격리했습니다: {quarantine_dir}")
+    return image_paths
@@ -0,0 +1,175 @@
+# scripts/image_resize.py
+# 원본 이미지(3904×3904)를 여러 해상도로 줄여 두는 피라미드 캐시
+# - JPEG은 draft 모드로 DCT 단계에서 1/2, 1/4, 1/8 크기로 바로 디코딩한 뒤 LANCZOS로 목표 크기에 맞춘다.
+# - 결과는 <cache_dir>/<해상도>/<원본 sha1><확장자>에 두므로, 파일 이름이 바뀌거나 같은 원본이 여러 폴더에 있어도 다시 만들지 않는다.
+# - 원본의 sha1은 (경로, 크기, mtime) 기준으로 <cache_dir>/pyramid_index.json에 기록해 두고, 바뀐 파일만 다시 읽는다.
+# - 이미 있는 해상도는 건너뛰고, 없는 해상도만 한 번의 디코딩으로 만든다 (가장 큰 해상도 기준으로 draft).
+# 새 imgsz로 실험할 때는 LEVELS에 해상도를 추가하면 그 해상도만 새로 만든다.
+import io
+import os
+import json
+import hashlib
+
+from PIL import Image
+
+from parallel_utils import imap_parallel, ThroughputMeter
+from split_backend import place_files
+
+DEFAULT_LEVELS = (800, 1280, 1600)
+INDEX_NAME = "pyramid_index.json"
+INDEX_VERSION = 1
+JPEG_QUALITY = 95
+
+
+def level_size(level):
+    """800 → (800, 800), (1280, 720) → (1280, 720)"""
+    if isinstance(level, int):
+        return level, level
+    return tuple(level)
+
+
+def level_name(level):
+    w, h = level_size(level)
+    return str(w) if w == h else f"{w}x{h}"
+
+
+def level_path(cache_dir, level, digest, ext):
+    return os.path.join(cache_dir, level_name(level), digest + ext)
+
+
+def decode_scaled(data, size):
+    """
+    인코딩된 이미지 바이트를 size 이상인 가장 작은 DCT 축소 배율로 디코딩한다 (JPEG이 아니면 원래 크기).
+    반환값: (이미지, 원본 형식)
+    """
+    img = Image.open(io.BytesIO(data))
+    fmt = img.format
+    img.draft(img.mode, size)
+    img.load()
+    return img, fmt
+
+
+def save_level(img, path, fmt, quality=JPEG_QUALITY):
+    """임시 파일에 저장한 뒤 이름을 바꿔서, 중간에 멈춰도 잘린 캐시 파일이 남지 않게 한다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    if fmt == 'JPEG':
+        img.save(tmp_path, format=fmt, quality=quality)
+    else:
+        img.save(tmp_path, format=fmt)
+    os.replace(tmp_path, path)
+
+
+def build_levels(path, levels, cache_dir, digest=None, quality=JPEG_QUALITY):
+    """
+    원본 하나의 피라미드를 만든다. 원본은 한 번만 읽어서 sha1 계산과 디코딩에 같이 쓴다.
+    반환값: (sha1, {해상도 이름: 캐시 경로}, 새로 만든 해상도 수)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    data = None
+    if digest is None:
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+
+    outputs = {level_name(level): level_path(cache_dir, level, digest, ext) for level in levels}
+    missing = [level for level in levels if not os.path.exists(outputs[level_name(level)])]
+    if not missing:
+        return digest, outputs, 0
+
+    if data is None:
+        with open(path, 'rb') as f:
+            data = f.read()
+    largest = max((level_size(level) for level in missing), key=lambda s: s[0] * s[1])
+    img, fmt = decode_scaled(data, largest)
+    for level in missing:
+        size = level_size(level)
+        resized = img if img.size == size else img.resize(size, Image.LANCZOS)
+        save_level(resized, outputs[level_name(level)], fmt, quality)
+    return digest, outputs, len(missing)
+
+
+def _build_task(task):
+    path, levels, cache_dir, digest, quality = task
+    try:
+        return path, build_levels(path, levels, cache_dir, digest, quality), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+class PyramidIndex:
+    """원본 경로 → (크기, mtime, sha1). 바뀌지 않은 원본은 sha1을 다시 계산하지 않는다."""
+
+    def __init__(self, cache_dir):
+        self.index_path = os.path.join(cache_dir, INDEX_NAME)
+        self.entries = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == INDEX_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                print(f"⚠️ 피라미드 인덱스를 읽지 못해 새로 만듭니다: {self.index_path}")
+
+    def lookup(self, path, st):
+        entry = self.entries.get(path)
+        if entry is None or entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+            return None
+        return entry['sha1']
+
+    def store(self, path, st, digest):
+        self.entries[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha1': digest}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'entries': self.entries}, f)
+        os.replace(tmp_path, self.index_path)
+
+
+def build_pyramid(paths, cache_dir, levels=DEFAULT_LEVELS, workers=None, quality=JPEG_QUALITY):
+    """
+    원본 목록의 피라미드를 프로세스 풀로 만든다.
+    반환값: {원본 경로: {해상도 이름: 캐시 경로}} (실패한 원본은 빠진다)
+    """
+    index = PyramidIndex(cache_dir)
+    tasks = []
+    for path in paths:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        tasks.append((path, tuple(levels), cache_dir, index.lookup(path, st), quality))
+
+    meter = ThroughputMeter("피라미드 생성", total=len(tasks), unit="images")
+    results = {}
+    for path, result, error in imap_parallel(_build_task, tasks, workers=workers):
+        if error is not None:
+            print(f"\n❌ 리사이즈 실패: {path}\n{error}")
+            meter.update(1, failed=1)
+            continue
+        digest, outputs, made = result
+        index.store(path, os.stat(path), digest)
+        results[path] = outputs
+        meter.update(1, created=made, reused=len(outputs) - made)
+    meter.summary()
+    index.save()
+    return results
+
+
+def export_level(pyramid, level, output_dir, mode='auto', workers=8):
+    """
+    피라미드의 한 해상도를 원본 파일 이름 그대로 output_dir에 배치한다 (기본은 reflink/hardlink, 안 되면 복사).
+    반환값: 배치한 (캐시 경로, 출력 경로) 목록
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    name = level_name(level)
+    pairs = []
+    for path, outputs in pyramid.items():
+        dst = os.path.join(output_dir, os.path.basename(path))
+        src = outputs[name]
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            continue
+        pairs.append((src, dst))
+    placed, _, _ = place_files(pairs, mode=mode, workers=workers, name=f"{name} 이미지 배치")
+    return placed
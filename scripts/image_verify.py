@@ -0,0 +1,198 @@
+# scripts/image_verify.py
+# 이미지 무결성 검사기
+#   header : 파일 앞부분의 시그니처/크기 정보와 끝부분의 종료 마커(JPEG EOI, PNG IEND)만 확인한다 (디코딩 없음)
+#   full   : header 검사 후 PIL로 전체를 디코딩한다
+# 결과는 (경로, 크기, mtime)을 키로 캐시 파일에 남겨서, 바뀌지 않은 이미지는 다시 검사하지 않는다.
+import os
+import json
+import struct
+
+from PIL import Image
+
+from parallel_utils import chunked, imap_parallel, ThroughputMeter
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+CACHE_NAME = ".image_verify_cache.json"
+CACHE_VERSION = 1
+
+JPEG_SOI = b'\xff\xd8'
+JPEG_EOI = b'\xff\xd9'
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_IEND = b'IEND\xaeB`\x82'
+# 크기 정보가 들어 있는 JPEG SOF 마커 (DHT/JPG/DAC 제외)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# 길이 필드가 없는 JPEG 마커
+_JPEG_STANDALONE = {0x01, *range(0xD0, 0xD8)}
+# 파일 끝 종료 마커 뒤에 붙을 수 있는 여분 바이트 허용 범위
+_TAIL_BYTES = 64
+
+
+def _jpeg_size(f):
+    """SOI 다음부터 세그먼트를 건너뛰며 SOF 마커의 (width, height)를 찾는다."""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':  # 채움 바이트(0xFF 반복)를 건너뛴다
+            byte = f.read(1)
+        if not byte:
+            raise ValueError("SOF 마커를 찾지 못했습니다")
+        marker = byte[0]
+        if marker in _JPEG_STANDALONE:
+            continue
+        if marker == 0xD9 or marker == 0xDA:
+            raise ValueError("SOF 마커 전에 스캔 데이터가 시작됩니다")
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            raise ValueError("세그먼트 길이가 잘렸습니다")
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in _JPEG_SOF:
+            data = f.read(5)
+            if len(data) < 5:
+                raise ValueError("SOF 세그먼트가 잘렸습니다")
+            height, width = struct.unpack('>HH', data[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _png_size(head):
+    # 시그니처(8) + IHDR 길이(4) + 'IHDR'(4) + width(4) + height(4)
+    if len(head) < 24 or head[12:16] != b'IHDR':
+        raise ValueError("IHDR 청크가 없습니다")
+    return struct.unpack('>II', head[16:24])
+
+
+def read_header(path):
+    """
+    디코딩 없이 이미지 형식, 크기, 종료 마커를 확인한다.
+    반환값: (width, height). 잘리거나 형식이 맞지 않으면 ValueError를 올린다.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        f.seek(max(0, file_size - _TAIL_BYTES))
+        tail = f.read()
+
+        if head.startswith(JPEG_SOI):
+            if JPEG_EOI not in tail:
+                raise ValueError("JPEG 종료 마커(EOI)가 없습니다 (파일이 잘렸을 수 있음)")
+            return _jpeg_size(f)
+        if head.startswith(PNG_SIGNATURE):
+            if PNG_IEND not in tail:
+                raise ValueError("PNG IEND 청크가 없습니다 (파일이 잘렸을 수 있음)")
+            return _png_size(head)
+    raise ValueError("JPEG/PNG 시그니처가 아닙니다")
+
+
+def read_image_size(path):
+    """헤더만 읽어서 (width, height)를 돌려준다. 헤더로 알 수 없으면 PIL로 연다 (디코딩은 하지 않는다)."""
+    try:
+        return read_header(path)
+    except ValueError:
+        with Image.open(path) as img:
+            return img.size
+
+
+def full_decode(path):
+    with Image.open(path) as img:
+        img.load()
+        return img.size
+
+
+def verify_image(path, full=False):
+    """이미지 하나를 검사해서 {'ok', 'width', 'height', 'error', 'mode'} 딕셔너리를 돌려준다."""
+    result = {'ok': True, 'width': None, 'height': None, 'error': None, 'mode': 'full' if full else 'header'}
+    try:
+        result['width'], result['height'] = read_header(path)
+        if full:
+            result['width'], result['height'] = full_decode(path)
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _verify_chunk(task):
+    paths, full = task
+    return [(path, verify_image(path, full)) for path in paths]
+
+
+class VerifyCache:
+    """(경로, 크기, mtime) 기준 검사 결과 캐시. full 결과는 header 요청도 만족하지만 그 반대는 아니다."""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.entries = {}
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                print(f"⚠️ 검사 캐시를 읽지 못해 새로 만듭니다: {cache_path}")
+
+    def lookup(self, path, st, full):
+        entry = self.entries.get(path)
+        if entry is None or entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+            return None
+        if full and entry['mode'] != 'full':
+            return None
+        return entry
+
+    def store(self, path, st, result):
+        self.entries[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, **result}
+
+    def save(self):
+        if not self.cache_path:
+            return
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self.entries}, f)
+        os.replace(tmp_path, self.cache_path)
+
+
+def verify_images(paths, full=False, workers=None, chunk_size=64, cache_path=None):
+    """
+    이미지 목록을 프로세스 풀로 검사한다. cache_path를 주면 바뀌지 않은 이미지는 캐시 결과를 쓴다.
+    반환값: {경로: 결과 딕셔너리}
+    """
+    cache = VerifyCache(cache_path)
+    results = {}
+    todo = []
+    stats = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            results[path] = {'ok': False, 'width': None, 'height': None, 'error': str(e), 'mode': 'stat'}
+            continue
+        stats[path] = st
+        cached = cache.lookup(path, st, full)
+        if cached is not None:
+            results[path] = cached
+        else:
+            todo.append(path)
+
+    print(f"ℹ️ 이미지 {len(paths)}개 중 캐시 사용 {len(paths) - len(todo)}개, 검사 대상 {len(todo)}개 "
+          f"({'full decode' if full else 'header'})")
+    meter = ThroughputMeter("이미지 검사", total=len(todo), unit="images")
+    tasks = [(chunk, full) for chunk in chunked(todo, chunk_size)]
+    for chunk_results in imap_parallel(_verify_chunk, tasks, workers=workers):
+        for path, result in chunk_results:
+            results[path] = result
+            cache.store(path, stats[path], result)
+        meter.update(len(chunk_results))
+    meter.summary()
+    cache.save()
+    return results
+
+
+def verify_directory(image_dir, full=False, workers=None, use_cache=True):
+    """image_dir의 모든 이미지를 검사하고, 캐시는 image_dir/.image_verify_cache.json에 둔다."""
+    with os.scandir(image_dir) as entries:
+        paths = sorted(e.path for e in entries if e.name.lower().endswith(IMAGE_EXTENSIONS))
+    cache_path = os.path.join(image_dir, CACHE_NAME) if use_cache else None
+    return verify_images(paths, full=full, workers=workers, cache_path=cache_path)
@@ -0,0 +1,61 @@
+# scripts/label_codec.py
+# YOLO/OBB txt 라벨을 한 번에 읽고 쓰는 코덱
+# - 읽기: 파일 전체를 split 한 번으로 float 배열로 만든 뒤 (n, 1 + k)로 reshape 한다.
+# - 쓰기: "%d %.6f ...\n" 한 줄 형식을 박스 수만큼 반복한 문자열에 % 포맷팅을 한 번만 적용한다.
+# 좌표는 소수 6자리로 고정하므로 str(float)로 쓰던 17자리 라벨보다 파일이 작다.
+import numpy as np
+
+FORMAT_COLUMNS = {'yolo': 4, 'obb': 8}
+DEFAULT_PRECISION = 6
+
+
+def line_format(ncols, precision=DEFAULT_PRECISION):
+    """클래스 ID 1개와 좌표 ncols개로 된 한 줄의 % 포맷 문자열."""
+    return "%d" + f" %.{precision}f" * ncols + "\n"
+
+
+def parse_labels(text, ncols=4):
+    """
+    라벨 텍스트 전체를 (classes int16 (n,), coords float32 (n, ncols)) 배열로 바꾼다.
+    열 개수가 맞지 않는 줄은 건너뛴다. 전체 값 개수만 보면 열이 남거나 모자란 줄(예: save_conf의 6열과 4열이 섞인 경우)도
+    우연히 나누어떨어질 수 있으므로, 모든 줄의 열 수가 맞을 때만 한 번에 reshape 한다.
+
+    >>> parse_labels("0 0.5 0.5 0.1 0.1 0.9\\n" * 5)[1].shape  # conf 열이 붙은 줄은 모두 건너뛴다
+    (0, 4)
+    >>> parse_labels("1 0.5 0.5 0.1 0.2\\n\\n2 0.1 0.1 0.1 0.1 0.8\\n")[0].tolist()
+    [1]
+    >>> classes, coords = parse_labels("0 0.1 0.2 0.3\\n1 0.5 0.5 0.1 0.1 0.9\\n")  # 4열 + 6열 = 2 × 5
+    >>> classes.tolist(), coords.shape
+    ([], (0, 4))
+    """
+    rows = [parts for parts in map(str.split, text.splitlines()) if parts]
+    if all(len(parts) == ncols + 1 for parts in rows):
+        table = np.array(text.split(), dtype=np.float32).reshape(-1, ncols + 1)
+    else:
+        # 열 개수가 다른 줄이 섞여 있으면 줄 단위로 걸러낸다
+        table = np.array([r for r in rows if len(r) == ncols + 1], dtype=np.float32).reshape(-1, ncols + 1)
+    return table[:, 0].astype(np.int16), table[:, 1:]
+
+
+def format_labels(classes, coords, precision=DEFAULT_PRECISION):
+    """클래스/좌표 배열 전체를 한 번의 포맷팅 호출로 라벨 텍스트로 만든다."""
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    if n == 0:
+        return ""
+    coords = coords.reshape(n, -1)
+    # 정수 클래스와 실수 좌표를 한 행에 섞어야 하므로 object 배열로 이어 붙인다
+    table = np.empty((n, coords.shape[1] + 1), dtype=object)
+    table[:, 0] = np.asarray(classes).astype(np.int64).tolist()
+    table[:, 1:] = coords.tolist()
+    return (line_format(coords.shape[1], precision) * n) % tuple(table.ravel().tolist())
+
+
+def read_labels(label_path, fmt='yolo'):
+    with open(label_path, 'r') as f:
+        return parse_labels(f.read(), FORMAT_COLUMNS[fmt])
+
+
+def write_labels(label_path, classes, coords, precision=DEFAULT_PRECISION):
+    with open(label_path, 'w') as f:
+        f.write(format_labels(classes, coords, precision))
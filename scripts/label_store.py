@@ -0,0 +1,182 @@
+# scripts/label_store.py
+# 수만 개의 YOLO .txt 라벨 파일을 하나의 열(column) 단위 바이너리 저장소로 묶는다.
+#
+# 저장소 디렉터리 구성
+#   meta.json    : 형식(yolo/obb), 좌표 열 수, 이미지 stem 목록
+#   coords.npy   : (N, 4) 또는 (N, 8) float32 — 모든 박스의 좌표를 이어 붙인 배열
+#   classes.npy  : (N,) int16 — 클래스 ID
+#   offsets.npy  : (M + 1,) int64 — i번째 이미지의 박스는 coords[offsets[i]:offsets[i + 1]]
+# 배열은 np.load(mmap_mode='r')로 열기 때문에 파일 2만 개를 여는 대신 mmap 한 번으로 모든 라벨을 읽는다.
+import os
+import json
+
+import numpy as np
+
+from label_codec import FORMAT_COLUMNS, read_labels, write_labels
+
+STORE_VERSION = 1
+
+
+def yolo_to_obb(coords):
+    """(N, 4) xywh 정규화 좌표를 (N, 8) 꼭짓점 좌표(좌상→우상→우하→좌하)로 바꾼다."""
+    coords = np.asarray(coords, dtype=np.float32).reshape(-1, 4)
+    xc, yc, w, h = coords.T
+    x1, y1, x2, y2 = xc - w / 2, yc - h / 2, xc + w / 2, yc + h / 2
+    return np.stack([x1, y1, x2, y1, x2, y2, x1, y2], axis=1)
+
+
+def obb_to_yolo(coords):
+    """(N, 8) 꼭짓점 좌표를 감싸는 축 정렬 박스 (N, 4) xywh로 바꾼다."""
+    pts = np.asarray(coords, dtype=np.float32).reshape(-1, 4, 2)
+    mins = pts.min(axis=1)
+    maxs = pts.max(axis=1)
+    return np.concatenate([(mins + maxs) / 2, maxs - mins], axis=1)
+
+
+def convert_coords(coords, src_format, dst_format):
+    if src_format == dst_format:
+        return coords
+    if src_format == 'yolo' and dst_format == 'obb':
+        return yolo_to_obb(coords)
+    if src_format == 'obb' and dst_format == 'yolo':
+        return obb_to_yolo(coords)
+    raise ValueError(f"지원하지 않는 변환: {src_format} → {dst_format}")
+
+
+class TxtLabels:
+    """txt 라벨 디렉터리를 LabelStore와 같은 방식(stems / get)으로 읽는다."""
+
+    def __init__(self, label_dir, fmt='yolo'):
+        self.label_dir = label_dir
+        self.format = fmt
+        self.output_format = fmt
+        with os.scandir(label_dir) as entries:
+            self.stems = sorted(e.name[:-4] for e in entries if e.name.endswith('.txt'))
+        self._stem_set = set(self.stems)
+
+    def __len__(self):
+        return len(self.stems)
+
+    def __contains__(self, stem):
+        return stem in self._stem_set
+
+    def get(self, stem, fmt=None):
+        if stem not in self._stem_set:
+            return None
+        classes, coords = read_labels(os.path.join(self.label_dir, stem + '.txt'), self.format)
+        return classes, convert_coords(coords, self.format, fmt or self.output_format)
+
+
+class LabelStore:
+    """
+    mmap으로 연 라벨 저장소. get(stem)은 복사 없이 배열 슬라이스를 돌려준다.
+    fmt를 주면 get(stem)이 기본으로 그 형식으로 변환해서 돌려준다 (format은 저장된 형식 그대로).
+    """
+
+    def __init__(self, store_dir, fmt=None):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"지원하지 않는 라벨 저장소 버전입니다: {meta.get('version')}")
+        self.format = meta['format']
+        if fmt is not None and fmt not in FORMAT_COLUMNS:
+            raise ValueError(f"지원하지 않는 라벨 형식: {fmt}")
+        self.output_format = fmt or self.format
+        self.stems = meta['stems']
+        self.coords = np.load(os.path.join(store_dir, 'coords.npy'), mmap_mode='r')
+        self.classes = np.load(os.path.join(store_dir, 'classes.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(store_dir, 'offsets.npy'), mmap_mode='r')
+        self._index = {stem: i for i, stem in enumerate(self.stems)}
+
+    def __len__(self):
+        return len(self.stems)
+
+    def __contains__(self, stem):
+        return stem in self._index
+
+    def slice_of(self, stem):
+        i = self._index[stem]
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def get(self, stem, fmt=None):
+        if stem not in self._index:
+            return None
+        sl = self.slice_of(stem)
+        return self.classes[sl], convert_coords(self.coords[sl], self.format, fmt or self.output_format)
+
+    def image_index(self):
+        """박스마다 속한 이미지 번호 (N,) 배열 — 전체 박스를 한 번에 다루는 벡터 연산용."""
+        counts = np.diff(np.asarray(self.offsets))
+        return np.repeat(np.arange(len(self.stems)), counts)
+
+    @staticmethod
+    def write(store_dir, stems, classes_list, coords_list, fmt='yolo'):
+        """이미지별 (classes, coords) 목록을 이어 붙여 저장소로 저장하고 LabelStore로 연다."""
+        ncols = FORMAT_COLUMNS[fmt]
+        os.makedirs(store_dir, exist_ok=True)
+        counts = np.array([len(c) for c in classes_list], dtype=np.int64)
+        offsets = np.zeros(len(stems) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        if len(classes_list):
+            classes = np.concatenate([np.asarray(c, dtype=np.int16) for c in classes_list])
+            coords = np.concatenate([np.asarray(c, dtype=np.float32).reshape(-1, ncols) for c in coords_list])
+        else:
+            classes = np.zeros(0, dtype=np.int16)
+            coords = np.zeros((0, ncols), dtype=np.float32)
+
+        np.save(os.path.join(store_dir, 'coords.npy'), coords)
+        np.save(os.path.join(store_dir, 'classes.npy'), classes)
+        np.save(os.path.join(store_dir, 'offsets.npy'), offsets)
+        with open(os.path.join(store_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': STORE_VERSION,
+                'format': fmt,
+                'num_boxes': int(offsets[-1]),
+                'stems': list(stems)
+            }, f, ensure_ascii=False)
+        return LabelStore(store_dir)
+
+
+def is_label_store(path):
+    return os.path.isfile(os.path.join(path, 'meta.json'))
+
+
+def open_labels(path, fmt='yolo'):
+    """
+    path가 라벨 저장소면 LabelStore를, txt 라벨 디렉터리면 TxtLabels를 돌려준다.
+    어느 쪽이든 get(stem)은 fmt 형식 좌표를 돌려준다 (저장소 형식이 다르면 변환한다).
+    """
+    if is_label_store(path):
+        return LabelStore(path, fmt)
+    return TxtLabels(path, fmt)
+
+
+def import_txt(label_dir, store_dir, fmt='yolo'):
+    """txt 라벨 디렉터리 전체를 저장소로 변환한다."""
+    source = TxtLabels(label_dir, fmt)
+    classes_list, coords_list = [], []
+    for stem in source.stems:
+        classes, coords = source.get(stem)
+        classes_list.append(classes)
+        coords_list.append(coords)
+    store = LabelStore.write(store_dir, source.stems, classes_list, coords_list, fmt)
+    print(f"✅ 라벨 저장소 생성: {store_dir} (이미지 {len(store)}개, 박스 {len(store.classes)}개)")
+    return store
+
+
+def export_txt(store, output_dir, fmt=None):
+    """저장소를 이미지별 txt 라벨로 풀어 쓴다. fmt를 주면 yolo ↔ obb 형식으로 변환해서 쓴다."""
+    os.makedirs(output_dir, exist_ok=True)
+    for stem in store.stems:
+        classes, coords = store.get(stem, fmt)
+        write_labels(os.path.join(output_dir, stem + '.txt'), classes, coords)
+    print(f"✅ txt 라벨 내보내기 완료: {output_dir} ({len(store)}개)")
+
+
+if __name__ == "__main__":
+    DATASET_DIR = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset"
+    for split in ["train", "val"]:
+        import_txt(os.path.join(DATASET_DIR, split, "labels"),
+                   os.path.join(DATASET_DIR, "label_store", split), fmt='yolo')
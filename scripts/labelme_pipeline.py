@@ -0,0 +1,43 @@
+# scripts/labelme_pipeline.py
+# LabelMe JSON 정리 단계 함수 모음
+# 각 단계는 data(dict)를 받아 수정된 data를 돌려주는 함수이고,
+# 파라미터가 필요한 단계는 functools.partial로 묶어서 파이프라인에 끼워 넣는다.
+from functools import partial
+
+# 0_linecolor_issue.py 에서 제거하던 필드
+REMOVED_TOP_FIELDS = ('lineColor', 'fillColor', 'imageData')
+REMOVED_SHAPE_FIELDS = ('lineColor', 'fillColor', 'flags')
+
+
+def clean_fields(data):
+    """색상/이미지 데이터처럼 학습에 필요 없는 필드를 제거한다."""
+    for key in REMOVED_TOP_FIELDS:
+        data.pop(key, None)
+    for shape in data.get('shapes', []):
+        for key in REMOVED_SHAPE_FIELDS:
+            shape.pop(key, None)
+    return data
+
+
+def filter_classes(data, category_map):
+    """category_map에 있는 클래스만 남기고, 각 shape에 category_id를 기록한다."""
+    new_shapes = []
+    for shape in data.get('shapes', []):
+        label = shape.get('label')
+        if label in category_map:
+            shape['category_id'] = category_map[label]
+            new_shapes.append(shape)
+    data['shapes'] = new_shapes
+    return data
+
+
+def class_filter(category_map):
+    """filter_classes를 파이프라인 단계로 쓸 수 있게 category_map을 묶는다 (프로세스 풀로 전달 가능)."""
+    return partial(filter_classes, category_map=category_map)
+
+
+def apply_stages(data, stages):
+    """단계 함수들을 순서대로 적용한다."""
+    for stage in stages:
+        data = stage(data)
+    return data
@@ -0,0 +1,121 @@
+# scripts/labelme_stream.py
+# imageData(base64 이미지)를 디코딩하지 않고 LabelMe JSON을 읽고 쓰는 바이트 단위 스캐너
+#
+# LabelMe 파일은 수 MB짜리 imageData 문자열을 품고 있는 경우가 많은데,
+# json.load는 이 문자열을 통째로 str로 만든 뒤에야 pop 할 수 있다.
+# 여기서는 파일을 mmap으로 열어 "imageData" 값의 바이트 범위만 찾아내고,
+# 그 범위를 null로 바꾼 나머지 바이트만 json.loads 한다.
+# (LabelMe의 중첩 객체(flags 등)에는 "imageData" 키가 없다고 가정한다.)
+import os
+import re
+import json
+import mmap
+
+_IMAGE_DATA_KEY = b'"imageData"'
+_KEY_SEPARATOR = re.compile(rb'[ \t\r\n]*:[ \t\r\n]*')
+_BACKSLASH = 0x5C
+_QUOTE = 0x22
+
+# load_labelme_header가 돌려주는 필드
+HEADER_FIELDS = ('shapes', 'imagePath', 'imageWidth', 'imageHeight')
+
+
+def _string_end(buf, start):
+    """start 위치의 여는 따옴표부터 닫는 따옴표 다음 위치를 찾는다 (내용은 복사하지 않는다)."""
+    pos = start + 1
+    while True:
+        quote = buf.find(b'"', pos)
+        if quote < 0:
+            raise ValueError("닫히지 않은 문자열")
+        # 바로 앞의 역슬래시 개수가 짝수면 이스케이프되지 않은 닫는 따옴표이다
+        k = quote - 1
+        while buf[k] == _BACKSLASH:
+            k -= 1
+        if (quote - 1 - k) % 2 == 0:
+            return quote + 1
+        pos = quote + 1
+
+
+def image_data_spans(buf):
+    """buf(bytes/mmap)에서 "imageData" 문자열 값의 (시작, 끝) 바이트 범위 목록을 돌려준다."""
+    spans = []
+    pos = 0
+    while True:
+        i = buf.find(_IMAGE_DATA_KEY, pos)
+        if i < 0:
+            return spans
+        pos = i + len(_IMAGE_DATA_KEY)
+        # 다른 문자열 안에 이스케이프되어 들어 있는 \"imageData\" 는 키가 아니다
+        if i > 0 and buf[i - 1] == _BACKSLASH:
+            continue
+        sep = _KEY_SEPARATOR.match(buf, pos)
+        if sep is None:
+            continue
+        value_start = sep.end()
+        if value_start < len(buf) and buf[value_start] == _QUOTE:
+            value_end = _string_end(buf, value_start)
+            spans.append((value_start, value_end))
+            pos = value_end
+
+
+def _open_mmap(f):
+    if os.fstat(f.fileno()).st_size == 0:
+        raise ValueError("빈 파일입니다")
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_labelme(json_path):
+    """
+    LabelMe JSON을 읽되 imageData는 할당하지 않고 None으로 채워서 돌려준다.
+    JSON 형식이 잘못되었으면 json.JSONDecodeError(ValueError)를 그대로 올린다.
+    """
+    with open(json_path, 'rb') as f, _open_mmap(f) as buf:
+        parts = []
+        prev = 0
+        for start, end in image_data_spans(buf):
+            parts.append(buf[prev:start])
+            parts.append(b'null')
+            prev = end
+        parts.append(buf[prev:])
+    return json.loads(b''.join(parts))
+
+
+def load_labelme_header(json_path):
+    """shapes, imagePath, imageWidth, imageHeight 중 파일에 있는 필드만 골라서 돌려준다."""
+    data = load_labelme(json_path)
+    return {key: data[key] for key in HEADER_FIELDS if key in data}
+
+
+def dump_labelme(data, output_path, image_data_source=None, indent=4, ensure_ascii=True):
+    """
+    LabelMe JSON을 저장한다.
+    image_data_source(원본 JSON 경로)를 주면 원본의 imageData 바이트를 디코딩 없이 그대로 복사해 넣는다.
+    data에 imageData 키가 없으면(정리 단계에서 제거된 경우) 일반 json.dump와 같다.
+    """
+    if image_data_source is None or 'imageData' not in data:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
+        return
+
+    data = dict(data)
+    data['imageData'] = None
+    text = json.dumps(data, indent=indent, ensure_ascii=ensure_ascii)
+    marker = '"imageData": null'
+    split_at = text.find(marker)
+    head = text[:split_at + len('"imageData": ')].encode('utf-8')
+    tail = text[split_at + len(marker):].encode('utf-8')
+
+    with open(image_data_source, 'rb') as src, _open_mmap(src) as buf:
+        spans = image_data_spans(buf)
+        # 입력과 출력이 같은 파일일 수 있으므로 임시 파일에 쓴 뒤 교체한다
+        tmp_path = output_path + '.tmp'
+        with open(tmp_path, 'wb') as out:
+            out.write(head)
+            if spans:
+                start, end = spans[-1]
+                with memoryview(buf) as view:
+                    out.write(view[start:end])
+            else:
+                out.write(b'null')
+            out.write(tail)
+    os.replace(tmp_path, output_path)
@@ -0,0 +1,173 @@
+# scripts/labelme_to_yolo.py
+# LabelMe JSON → YOLO txt 병렬 변환 엔진
+import os
+from collections import Counter
+
+import numpy as np
+
+from label_codec import format_labels
+from labelme_stream import load_labelme, dump_labelme
+from parallel_utils import chunked, default_workers, imap_parallel, ThroughputMeter
+
+
+def shapes_to_polygons(shapes, class_names, image_width, image_height):
+    """
+    LabelMe shapes를 정규화된 꼭짓점 배열로 한 번에 변환한다.
+    꼭짓점 2개(사각형 → 4개로 확장)와 4개(다각형)만 지원한다.
+    반환값: (class_ids (N,), points (N, 4, 2) [0..1], 스킵 사유 Counter)
+    """
+    class_ids = []
+    polygons = []
+    skipped = Counter()
+
+    for shape in shapes:
+        label = shape.get('label', 'unknown')
+        points = shape.get('points', [])
+
+        if label not in class_names:
+            skipped[f"알 수 없는 라벨 '{label}'"] += 1
+            continue
+
+        if len(points) == 2:
+            # 꼭짓점이 2개면 4개로 늘려서 다각형과 같은 배열 모양으로 맞춘다
+            (x1, y1), (x2, y2) = points
+            points = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+        elif len(points) != 4:
+            skipped[f"지원하지 않는 도형 (points = {len(points)}개)"] += 1
+            continue
+
+        class_ids.append(class_names[label])
+        polygons.append(points)
+
+    if not polygons:
+        return np.zeros(0, dtype=np.int32), np.zeros((0, 4, 2), dtype=np.float64), skipped
+
+    pts = np.asarray(polygons, dtype=np.float64)
+    # (원본 → 목표 해상도 변환 후 목표 해상도로 나누는 것은 원본 해상도로 나누는 것과 같다)
+    pts /= np.array([image_width, image_height], dtype=np.float64)
+    return np.asarray(class_ids, dtype=np.int32), pts, skipped
+
+
+def shapes_to_yolo(shapes, class_names, image_width, image_height):
+    """
+    LabelMe shapes를 YOLO 형식 배열로 한 번에 변환한다.
+    모든 도형의 points를 (N, 4, 2) 배열 하나로 모아 min/max를 벡터 연산으로 처리한다 (다각형 → AABB).
+    반환값: (class_ids (N,), xywh (N, 4), 스킵 사유 Counter)
+    """
+    class_ids, pts, skipped = shapes_to_polygons(shapes, class_names, image_width, image_height)
+    mins = pts.min(axis=1)
+    maxs = pts.max(axis=1)
+
+    xywh = np.empty((len(pts), 4), dtype=np.float64)
+    xywh[:, :2] = (mins + maxs) / 2
+    xywh[:, 2:] = maxs - mins
+    return class_ids, xywh, skipped
+
+
+def _label_path(output_dir, json_path):
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(json_path))[0] + ".txt")
+
+
+def _output_paths(json_path, output_dir, json_output_dir=None):
+    outputs = [_label_path(output_dir, json_path)]
+    if json_output_dir:
+        outputs.append(os.path.join(json_output_dir, os.path.basename(json_path)))
+    return outputs
+
+
+def convert_json_file(json_path, output_dir, class_names, image_width, image_height,
+                      stages=(), json_output_dir=None):
+    """
+    JSON 하나를 한 번만 읽어서 stages(정리/필터 단계)를 적용하고,
+    json_output_dir가 있으면 정리된 JSON을, 항상 같은 이름의 YOLO .txt를 저장한다.
+    (박스 수, 스킵 Counter)를 돌려준다.
+    """
+    # imageData는 읽지 않고, 정리 단계 뒤에도 남아 있으면 원본 바이트를 그대로 복사해 저장한다
+    data = load_labelme(json_path)
+
+    for stage in stages:
+        data = stage(data)
+
+    if json_output_dir:
+        dump_labelme(data, os.path.join(json_output_dir, os.path.basename(json_path)),
+                     image_data_source=json_path, ensure_ascii=False)
+
+    class_ids, xywh, skipped = shapes_to_yolo(data.get('shapes', []), class_names, image_width, image_height)
+
+    label_path = _label_path(output_dir, json_path)
+    with open(label_path, 'w', encoding='utf-8') as out_f:
+        out_f.write(format_labels(class_ids, xywh))
+    return len(class_ids), skipped
+
+
+def _convert_chunk(task):
+    """워커 프로세스에서 JSON 묶음을 변환한다. 파일별 출력 대신 묶음 단위 집계만 돌려준다."""
+    json_paths, output_dir, class_names, image_width, image_height, stages, json_output_dir = task
+    n_boxes = 0
+    skipped = Counter()
+    errors = []
+    converted = []
+    for json_path in json_paths:
+        try:
+            boxes, file_skipped = convert_json_file(json_path, output_dir, class_names, image_width, image_height,
+                                                    stages, json_output_dir)
+        except (OSError, ValueError) as e:
+            errors.append(f"{json_path}: {e}")
+            continue
+        n_boxes += boxes
+        skipped.update(file_skipped)
+        converted.append(json_path)
+    return len(json_paths), n_boxes, skipped, errors, converted
+
+
+def convert_directory(json_dir, output_dir, class_names, image_width, image_height,
+                      workers=None, chunk_size=64, manifest=None, stages=(), json_output_dir=None):
+    """
+    json_dir의 모든 JSON을 프로세스 풀로 나눠 변환한다.
+    진행률과 초당 처리량(파일/박스)만 출력하고, 스킵/오류는 마지막에 모아서 보여준다.
+    manifest(StageManifest)를 주면 내용이 바뀌지 않은 JSON은 건너뛰고 변환 결과를 기록한다.
+    stages(labelme_pipeline 단계 함수)와 json_output_dir를 주면 정리/필터/YOLO 변환을 한 번의 읽기로 처리한다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if json_output_dir:
+        os.makedirs(json_output_dir, exist_ok=True)
+    json_paths = sorted(os.path.join(json_dir, f) for f in os.listdir(json_dir) if f.endswith(".json"))
+    if not json_paths:
+        print("❗ JSON 파일이 없습니다.")
+        return None
+
+    if manifest is not None:
+        total = len(json_paths)
+        json_paths = [p for p in json_paths
+                      if not manifest.is_current(os.path.basename(p), [p],
+                                                 _output_paths(p, output_dir, json_output_dir))]
+        print(f"ℹ️ 변경 없음 스킵: {total - len(json_paths)}개, 변환 대상: {len(json_paths)}개")
+
+    workers = workers or default_workers()
+    tasks = [(chunk, output_dir, class_names, image_width, image_height, tuple(stages), json_output_dir)
+             for chunk in chunked(json_paths, chunk_size)]
+
+    meter = ThroughputMeter("라벨 변환", total=len(json_paths))
+    skipped = Counter()
+    errors = []
+    for n_files, n_boxes, chunk_skipped, chunk_errors, converted in imap_parallel(_convert_chunk, tasks,
+                                                                                   workers=workers):
+        meter.update(n_files, boxes=n_boxes)
+        skipped.update(chunk_skipped)
+        errors.extend(chunk_errors)
+        if manifest is not None:
+            for json_path in converted:
+                manifest.record(os.path.basename(json_path), [json_path],
+                                _output_paths(json_path, output_dir, json_output_dir))
+
+    if manifest is not None:
+        for key in manifest.stale_keys():
+            manifest.forget(key, remove_outputs=True)
+        manifest.save()
+
+    summary = meter.summary()
+    for reason, count in skipped.most_common():
+        print(f"⚠️ 스킵: {reason} × {count}")
+    for err in errors:
+        print(f"❌ 변환 실패: {err}")
+    return summary
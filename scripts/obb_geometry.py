@@ -0,0 +1,175 @@
+# scripts/obb_geometry.py
+# 회전 박스(OBB)의 IoU 행렬과 OBB용 COCO 방식 평가 (0_for_obb 파이프라인 공용)
+# 꼭짓점 4개 다각형(볼록 사각형)끼리의 교집합 넓이를 쌍마다 한꺼번에 계산한다.
+#   교집합 다각형의 꼭짓점 = (B 안에 있는 A의 꼭짓점) ∪ (A 안에 있는 B의 꼭짓점) ∪ (A 변과 B 변의 교점)
+#   → 최대 4 + 4 + 16개 점을 무게중심 기준 각도로 정렬해 신발끈 공식으로 넓이를 구한다.
+# 감싸는 축 정렬 박스가 겹치는 쌍만 계산하므로 이미지당 박스가 수천 개여도 대부분의 쌍은 건너뛴다.
+import numpy as np
+
+from box_geometry import METRICS, MAX_ELEMENTS
+from fast_coco_eval import coco_evaluate, DENSE_MAX_DETS
+
+# 한 점을 '안쪽'으로 볼 때 허용하는 변 바깥 거리 (픽셀) — 변 위의 꼭짓점도 안쪽으로 센다
+_EPS = 1e-6
+# 쌍 하나당 만드는 후보 점 수
+_POINTS_PER_PAIR = 24
+
+
+def rbox_to_polygons(rboxes):
+    """(n, 5) [x_center, y_center, w, h, theta(rad)] → (n, 4, 2) 꼭짓점 (ultralytics xywhr2xyxyxyxy와 같은 순서)."""
+    rboxes = np.asarray(rboxes, dtype=np.float64).reshape(-1, 5)
+    center = rboxes[:, None, :2]
+    cos, sin = np.cos(rboxes[:, 4]), np.sin(rboxes[:, 4])
+    vec1 = np.stack([rboxes[:, 2] / 2 * cos, rboxes[:, 2] / 2 * sin], axis=1)[:, None, :]
+    vec2 = np.stack([-rboxes[:, 3] / 2 * sin, rboxes[:, 3] / 2 * cos], axis=1)[:, None, :]
+    signs = np.array([[1, 1], [1, -1], [-1, -1], [-1, 1]], dtype=np.float64)
+    return center + signs[None, :, :1] * vec1 + signs[None, :, 1:] * vec2
+
+
+def as_polygons(polygons):
+    """꼭짓점 8개 목록 또는 (n, 4, 2) 배열을 (n, 4, 2) float64로 바꾼다."""
+    return np.asarray(polygons, dtype=np.float64).reshape(-1, 4, 2)
+
+
+def _cross(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _signed_area(polygons):
+    nxt = np.roll(polygons, -1, axis=-2)
+    return 0.5 * _cross(polygons, nxt).sum(axis=-1)
+
+
+def polygon_area(polygons):
+    return np.abs(_signed_area(as_polygons(polygons)))
+
+
+def _ccw(polygons):
+    """꼭짓점 순서를 반시계 방향으로 맞춘다 (안쪽 판정이 변 방향에 따라 달라지므로)."""
+    flip = _signed_area(polygons) < 0
+    polygons = polygons.copy()
+    polygons[flip] = polygons[flip, ::-1]
+    return polygons
+
+
+def _inside(points, polygons):
+    """points (P, K, 2)가 반시계 볼록 다각형 polygons (P, 4, 2) 안(경계 포함)에 있는지 (P, K)."""
+    start = polygons[:, None, :, :]
+    edge = np.roll(polygons, -1, axis=1)[:, None, :, :] - start
+    length = np.maximum(np.linalg.norm(edge, axis=-1), 1e-12)
+    distance = _cross(edge, points[:, :, None, :] - start) / length
+    return (distance >= -_EPS).all(axis=-1)
+
+
+def _pair_intersection(a, b):
+    """반시계 사각형 쌍 a, b (P, 4, 2)의 교집합 넓이 (P,)."""
+    num = len(a)
+    # 변과 변의 교점: a_i + t·r = b_j + u·s (0 ≤ t, u ≤ 1)
+    r = (np.roll(a, -1, axis=1) - a)[:, :, None, :]
+    s = (np.roll(b, -1, axis=1) - b)[:, None, :, :]
+    qp = b[:, None, :, :] - a[:, :, None, :]
+    denom = _cross(r, s)
+    parallel = np.abs(denom) < 1e-12
+    denom = np.where(parallel, 1.0, denom)
+    t = _cross(qp, s) / denom
+    u = _cross(qp, r) / denom
+    crossing = ~parallel & (t >= -1e-9) & (t <= 1 + 1e-9) & (u >= -1e-9) & (u <= 1 + 1e-9)
+    crossing_points = a[:, :, None, :] + t[..., None] * r
+
+    points = np.concatenate([a, b, crossing_points.reshape(num, 16, 2)], axis=1)
+    valid = np.concatenate([_inside(a, b), _inside(b, a), crossing.reshape(num, 16)], axis=1)
+    count = valid.sum(axis=1)
+
+    # 유효한 점의 무게중심을 기준으로 각도순 정렬. 유효하지 않은 점은 뒤로 보낸 뒤 첫 점으로 채운다 (넓이에 영향 없음)
+    center = (points * valid[..., None]).sum(axis=1) / np.maximum(count, 1)[:, None]
+    offset = points - center[:, None, :]
+    angle = np.where(valid, np.arctan2(offset[..., 1], offset[..., 0]), np.inf)
+    order = np.argsort(angle, axis=1)
+    points = np.take_along_axis(points, order[..., None], axis=1)
+    valid = np.take_along_axis(valid, order, axis=1)
+    points = np.where(valid[..., None], points, points[:, :1, :])
+    area = 0.5 * np.abs(_cross(points, np.roll(points, -1, axis=1)).sum(axis=1))
+    return np.where(count >= 3, area, 0.0)
+
+
+def _candidate_pairs(a, b, max_elements):
+    """감싸는 축 정렬 박스가 겹치는 (i, j) 쌍. 행을 나눠서 (n, m) 불리언 행렬 전체를 만들지 않는다."""
+    lo_a, hi_a = a.min(axis=1), a.max(axis=1)
+    lo_b, hi_b = b.min(axis=1), b.max(axis=1)
+    step = max(1, max_elements // max(len(b), 1))
+    rows, cols = [], []
+    for start in range(0, len(a), step):
+        end = min(start + step, len(a))
+        hit = ((lo_a[start:end, None, :] < hi_b[None, :, :]) & (lo_b[None, :, :] < hi_a[start:end, None, :])).all(axis=-1)
+        r, c = np.nonzero(hit)
+        rows.append(r + start)
+        cols.append(c)
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def intersection_matrix(polygons_a, polygons_b, max_elements=MAX_ELEMENTS):
+    """(n, 4, 2)와 (m, 4, 2) 회전 박스의 (n, m) 교집합 넓이."""
+    a, b = _ccw(as_polygons(polygons_a)), _ccw(as_polygons(polygons_b))
+    result = np.zeros((len(a), len(b)), dtype=np.float64)
+    if len(a) == 0 or len(b) == 0:
+        return result
+    rows, cols = _candidate_pairs(a, b, max_elements)
+    step = max(1, max_elements // _POINTS_PER_PAIR)
+    for start in range(0, len(rows), step):
+        r, c = rows[start:start + step], cols[start:start + step]
+        result[r, c] = _pair_intersection(a[r], b[c])
+    return result
+
+
+def rotated_iou_matrix(polygons_a, polygons_b, metric='iou', max_elements=MAX_ELEMENTS):
+    """
+    (n, 4, 2)와 (m, 4, 2) 회전 박스의 (n, m) 겹침 행렬.
+    metric='iou'는 교집합/합집합, 'ios'는 교집합/둘 중 작은 박스 넓이다 (box_geometry.iou_matrix와 같다).
+    """
+    if metric not in METRICS:
+        raise ValueError(f"지원하지 않는 겹침 기준: {metric} (가능: {', '.join(METRICS)})")
+    inter = intersection_matrix(polygons_a, polygons_b, max_elements)
+    area_a, area_b = polygon_area(polygons_a), polygon_area(polygons_b)
+    if metric == 'ios':
+        denom = np.minimum(area_a[:, None], area_b[None, :])
+    else:
+        denom = area_a[:, None] + area_b[None, :] - inter
+    return np.divide(inter, denom, out=np.zeros_like(inter), where=denom > 0)
+
+
+def rotated_nms(polygons, scores, classes, threshold=0.5, metric='iou'):
+    """회전 박스 클래스별 NMS (tiled_inference.nms와 같은 방식). 반환값: 남길 인덱스 (점수 내림차순)."""
+    polygons = as_polygons(polygons)
+    if len(polygons) == 0:
+        return np.zeros(0, dtype=np.int64)
+    # 클래스마다 좌표를 떨어뜨려 다른 클래스끼리는 겹치지 않게 한다
+    offset = (np.abs(polygons).max() + 1) * np.asarray(classes, dtype=np.float64)
+    shifted = polygons + offset[:, None, None]
+    order = np.argsort(-np.asarray(scores), kind='stable')
+    keep = []
+    while len(order):
+        i = order[0]
+        keep.append(i)
+        if len(order) == 1:
+            break
+        rest = order[1:]
+        order = rest[rotated_iou_matrix(shifted[i], shifted[rest], metric)[0] <= threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def obb_iou(dt_polygons, gt_polygons, gt_crowd):
+    """fast_coco_eval의 iou_fn 형식: (예측 수, GT 수) 회전 IoU. crowd GT는 교집합 / 예측 넓이다."""
+    inter = intersection_matrix(dt_polygons, gt_polygons)
+    dt_area, gt_area = polygon_area(dt_polygons), polygon_area(gt_polygons)
+    denom = np.where(np.asarray(gt_crowd, dtype=bool)[None, :], dt_area[:, None], dt_area[:, None] + gt_area[None, :] - inter)
+    return np.divide(inter, denom, out=np.zeros_like(inter), where=denom > 0)
+
+
+def obb_coco_evaluate(gt, dt, max_dets=DENSE_MAX_DETS, workers=None, verbose=True):
+    """
+    회전 박스 기준 COCO 방식 AP/AR. GT annotation과 예측에는 "poly" (픽셀 꼭짓점 8개)가 있어야 하고,
+    면적 구간(small/medium/large)은 "area" (다각형 넓이)로 나눈다.
+    반환값은 fast_coco_eval.coco_evaluate와 같다.
+    """
+    return coco_evaluate(gt, dt, max_dets=max_dets, iou_fn=obb_iou, geometry_key="poly",
+                         workers=workers, verbose=verbose)
@@ -0,0 +1,219 @@
+# scripts/online_aug_dataset.py
+# 증강 이미지를 디스크에 10배로 만들어 두는 대신, 학습 중에 DataLoader 워커가 바로 증강해서 배치를 만든다.
+# - pcb_augment.get_augmentation()과 같은 변환(bbox-safe crop 포함)과 ValueError 재시도 규칙을 그대로 쓴다.
+# - OnlineAugDataset / build_dataloader : 순수 PyTorch 학습 루프용
+# - OnlineAugTrainer                     : ultralytics 학습에 그대로 끼워 넣는 DetectionTrainer
+# 오프라인 경로(1_2_1_yolo_aug.py → 1_6_split.py)는 그대로 남아 있다.
+import os
+import random
+
+import cv2
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
+from ultralytics.data import YOLODataset
+from ultralytics.models.yolo.detect import DetectionTrainer
+from ultralytics.utils import colorstr
+from ultralytics.utils.instance import Instances
+from ultralytics.utils.torch_utils import de_parallel
+
+from label_store import open_labels
+from pcb_augment import get_augmentation, replay_sample, sample_seed
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def augment_with_retry(transform, image, classes, coords, seed_key=None, base_seed=0, max_attempts=3):
+    """
+    이미지 하나에 증강을 적용한다. ValueError가 나면 max_attempts번까지 다시 시도하고,
+    끝내 실패하면 원본을 그대로 돌려준다.
+    seed_key를 주면 (base_seed, seed_key, 시도 번호)로 시드를 정해 같은 키는 항상 같은 결과가 나온다.
+    반환값: (이미지, classes (n,), xywh (n, 4))
+    """
+    bboxes = np.asarray(coords, dtype=np.float64).reshape(-1, 4).tolist()
+    categories = np.asarray(classes).reshape(-1).tolist()
+    if not bboxes:
+        return image, np.zeros(0, dtype=np.int64), np.zeros((0, 4), dtype=np.float32)
+
+    for attempt in range(max_attempts):
+        try:
+            if seed_key is None:
+                augmented = transform(image=image, bboxes=bboxes, category=categories)
+            else:
+                augmented = replay_sample(transform, image, bboxes, categories,
+                                          sample_seed(base_seed, seed_key, attempt))
+        except ValueError:
+            continue
+        return (augmented['image'],
+                np.asarray(augmented['category'], dtype=np.int64),
+                np.asarray(augmented['bboxes'], dtype=np.float32).reshape(-1, 4))
+    return image, np.asarray(categories, dtype=np.int64), np.asarray(bboxes, dtype=np.float32)
+
+
+class OnlineAugDataset(Dataset):
+    """
+    이미지 폴더와 라벨(txt 폴더 또는 라벨 저장소)을 읽어, 한 epoch에 원본 하나를 repeats번 서로 다르게 증강해 내보낸다.
+    __getitem__은 (이미지 텐서 (3, imgsz, imgsz) float [0..1], 라벨 (n, 5) [cls, x, y, w, h])을 돌려준다.
+    """
+
+    def __init__(self, image_dir, label_dir, imgsz=800, repeats=10, augment=True, base_seed=0):
+        self.image_dir = image_dir
+        self.label_dir = label_dir
+        self.imgsz = imgsz
+        self.repeats = repeats if augment else 1
+        self.augment = augment
+        self.base_seed = base_seed
+        self.epoch = 0
+        self.transform = None  # 워커 프로세스 안에서 처음 쓸 때 만든다
+
+        labels = open_labels(label_dir)
+        self.image_paths = sorted(
+            os.path.join(image_dir, f) for f in os.listdir(image_dir)
+            if f.lower().endswith(IMAGE_EXTENSIONS) and os.path.splitext(f)[0] in labels
+        )
+        self.labels = None
+
+    def __len__(self):
+        return len(self.image_paths) * self.repeats
+
+    def set_epoch(self, epoch):
+        """epoch마다 다른(그러나 재현 가능한) 증강이 나오도록 시드에 epoch을 섞는다. 매 epoch 시작 전에 호출한다."""
+        self.epoch = epoch
+
+    def __getitem__(self, index):
+        if self.labels is None:
+            # 라벨 저장소(mmap)는 워커마다 따로 연다
+            self.labels = open_labels(self.label_dir)
+        image_path = self.image_paths[index % len(self.image_paths)]
+        image = cv2.imread(image_path)
+        if image is None:
+            raise FileNotFoundError(f"이미지를 읽을 수 없습니다: {image_path}")
+        classes, coords = self.labels.get(os.path.splitext(os.path.basename(image_path))[0], 'yolo')
+
+        if self.augment:
+            if self.transform is None:
+                self.transform = get_augmentation()
+            image, classes, coords = augment_with_retry(self.transform, image, classes, coords,
+                                                        seed_key=f"{self.epoch}:{index}", base_seed=self.base_seed)
+        else:
+            classes = np.asarray(classes, dtype=np.int64)
+            coords = np.asarray(coords, dtype=np.float32)
+
+        # RandomSizedBBoxSafeCrop(640)을 거친 이미지와 원본(800)을 한 배치로 묶기 위해 같은 크기로 맞춘다 (좌표는 정규화되어 있어 그대로 쓴다)
+        if image.shape[:2] != (self.imgsz, self.imgsz):
+            image = cv2.resize(image, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
+        image = np.ascontiguousarray(image[:, :, ::-1].transpose(2, 0, 1))  # BGR → RGB, HWC → CHW
+
+        target = np.concatenate([classes.reshape(-1, 1).astype(np.float32), coords.reshape(-1, 4)], axis=1)
+        return torch.from_numpy(image).float().div_(255.0), torch.from_numpy(target)
+
+
+def collate_fn(batch):
+    """이미지는 (B, 3, H, W)로 쌓고, 라벨은 앞에 배치 번호를 붙인 (N, 6) [batch_idx, cls, x, y, w, h]로 이어 붙인다."""
+    images, targets = zip(*batch)
+    labeled = []
+    for i, target in enumerate(targets):
+        batch_idx = torch.full((len(target), 1), i, dtype=target.dtype)
+        labeled.append(torch.cat([batch_idx, target], dim=1))
+    return torch.stack(images, 0), torch.cat(labeled, 0)
+
+
+def _seed_worker(worker_id):
+    # 워커마다 OpenCV 스레드는 끄고, torch가 정해 준 워커 시드로 random/np.random을 맞춘다
+    cv2.setNumThreads(0)
+    seed = torch.initial_seed() % 2 ** 32
+    np.random.seed(seed)
+    random.seed(seed)
+
+
+def build_dataloader(image_dir, label_dir, batch_size=8, imgsz=800, repeats=10, augment=True,
+                     workers=8, base_seed=0, shuffle=True):
+    """OnlineAugDataset을 워커 프로세스에서 증강하는 DataLoader로 감싼다."""
+    dataset = OnlineAugDataset(image_dir, label_dir, imgsz=imgsz, repeats=repeats, augment=augment, base_seed=base_seed)
+    generator = torch.Generator()
+    generator.manual_seed(base_seed)
+    return DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=shuffle,
+        num_workers=workers,
+        collate_fn=collate_fn,
+        worker_init_fn=_seed_worker,
+        generator=generator,
+        pin_memory=torch.cuda.is_available(),
+        persistent_workers=False  # epoch마다 set_epoch 값을 워커에 다시 넘겨주기 위해 워커를 새로 띄운다
+    )
+
+
+# ---------------------------------------------------------------------------
+# ultralytics 학습 연동
+# ---------------------------------------------------------------------------
+
+
+class AlbumentationsYOLODataset(YOLODataset):
+    """ultralytics YOLODataset이 이미지를 읽은 직후(모자이크 등 자체 증강 전)에 PCB 증강을 적용한다."""
+
+    def get_image_and_label(self, index):
+        label = super().get_image_and_label(index)
+        if not self.augment:
+            return label
+        if getattr(self, 'pcb_transform', None) is None:
+            self.pcb_transform = get_augmentation()
+
+        instances = label['instances']
+        instances.convert_bbox(format='xywh')
+        if not instances.normalized:
+            h, w = label['img'].shape[:2]
+            instances.normalize(w, h)
+        image, classes, coords = augment_with_retry(self.pcb_transform, label['img'], label['cls'], instances.bboxes)
+
+        label['img'] = image
+        label['resized_shape'] = image.shape[:2]
+        label['cls'] = classes.reshape(-1, 1).astype(np.float32)
+        label['instances'] = Instances(coords.reshape(-1, 4), np.zeros((0, 1000, 2), dtype=np.float32),
+                                       bbox_format='xywh', normalized=True)
+        return label
+
+
+class OnlineAugTrainer(DetectionTrainer):
+    """학습용 데이터셋만 AlbumentationsYOLODataset으로 바꾼 DetectionTrainer."""
+
+    def build_dataset(self, img_path, mode="train", batch=None):
+        if mode != "train":
+            return super().build_dataset(img_path, mode, batch)
+        gs = max(int(de_parallel(self.model).stride.max() if self.model else 0), 32)
+        return AlbumentationsYOLODataset(
+            img_path=img_path,
+            imgsz=self.args.imgsz,
+            batch_size=batch,
+            augment=True,
+            hyp=self.args,
+            rect=self.args.rect,
+            cache=self.args.cache or None,
+            single_cls=self.args.single_cls or False,
+            stride=gs,
+            pad=0.0,
+            prefix=colorstr(f"{mode}: "),
+            task=self.args.task,
+            classes=self.args.classes,
+            data=self.data,
+            fraction=self.args.fraction,
+        )
+
+
+if __name__ == "__main__":
+    # 원본 이미지(train/images)만으로 학습하고, 증강은 학습 중에 만든다 (yolo_augmented_output 불필요)
+    trainer = OnlineAugTrainer(overrides={
+        "model": "yolo11l.yaml",
+        "data": "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/dataset.yaml",
+        "epochs": 1000,
+        "patience": 50,
+        "batch": 2,
+        "imgsz": 800,
+        "workers": 8,
+        "device": 0,
+        "seed": 0,
+        "project": "outputs_11class_aug_yolo",
+        "name": "run_online_aug",
+    })
+    trainer.train()
@@ -0,0 +1,85 @@
+# scripts/parallel_utils.py
+# 여러 스크립트가 함께 쓰는 프로세스 풀 실행기와 처리량(throughput) 집계기
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def default_workers():
+    """사용 가능한 CPU 코어 수를 돌려준다 (최소 1)."""
+    return max(1, os.cpu_count() or 1)
+
+
+def chunked(items, size):
+    """리스트를 size 크기의 묶음으로 나눈다."""
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def imap_parallel(func, items, workers=None, chunksize=1, initializer=None, initargs=()):
+    """
+    func를 items 각각에 적용한 결과를 입력 순서대로 하나씩 돌려준다.
+    workers가 1이면 프로세스를 띄우지 않고 현재 프로세스에서 바로 실행한다 (디버깅용).
+    """
+    workers = workers or default_workers()
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield func(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        for result in pool.map(func, items, chunksize=chunksize):
+            yield result
+
+
+class ThroughputMeter:
+    """
+    처리한 항목 수와 부가 카운터(예: 박스 수)를 누적하고,
+    일정 간격으로 진행률을 한 줄에 덮어쓰며 마지막에 초당 처리량 요약을 출력한다.
+    """
+
+    def __init__(self, name, total=None, unit="files", interval=1.0):
+        self.name = name
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.count = 0
+        self.counters = {}
+        self.start = time.perf_counter()
+        self._last_print = 0.0
+
+    def update(self, n=1, **counters):
+        self.count += n
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+        now = time.perf_counter()
+        if now - self._last_print >= self.interval:
+            self._last_print = now
+            self._print_progress(now)
+
+    def _print_progress(self, now):
+        elapsed = max(now - self.start, 1e-9)
+        total = f"/{self.total}" if self.total else ""
+        sys.stdout.write(
+            f"\r⏳ {self.name}: {self.count}{total} {self.unit} "
+            f"({self.count / elapsed:.1f} {self.unit}/s)"
+        )
+        sys.stdout.flush()
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def summary(self):
+        """누적된 처리량을 출력하고 요약 딕셔너리를 돌려준다."""
+        elapsed = max(self.elapsed(), 1e-9)
+        if self._last_print:
+            sys.stdout.write("\n")
+        print(f"✅ {self.name} 완료: {self.count} {self.unit}, {elapsed:.2f}s "
+              f"({self.count / elapsed:.1f} {self.unit}/s)")
+        for key, value in self.counters.items():
+            print(f" - {key}: {value} ({value / elapsed:.1f}/s)")
+        return {"count": self.count, "elapsed": elapsed, **self.counters}
@@ -0,0 +1,323 @@
+# scripts/pcb_augment.py
+# 1_2_1_yolo_aug.py 의 증강 파이프라인과 병렬 실행기
+# - 워커 프로세스마다 A.Compose를 한 번만 만들어 재사용한다.
+# - 샘플마다 (BASE_SEED, 이미지 이름, 시도 번호)로 시드를 정해서 워커 배치와 상관없이 결과가 같다.
+# - JPEG/라벨 저장은 워커 안의 백그라운드 스레드가 크기 제한 큐를 통해 처리한다.
+# - 샘플마다 시드와 적용된 변환 파라미터를 기록해 두면 디스크에 저장하지 않고도 필요할 때 다시 만들 수 있다.
+import os
+import json
+import queue
+import random
+import hashlib
+import threading
+
+import cv2
+import numpy as np
+import albumentations as A
+
+from label_codec import format_labels
+from label_store import open_labels
+from parallel_utils import chunked, imap_parallel, ThroughputMeter
+
+
+SAMPLE_INDEX_NAME = "aug_samples.jsonl"
+
+
+# 다양한 증강 기법을 적용한다.
+# replay=True면 ReplayCompose로 감싸서 샘플마다 실제로 적용된 변환과 파라미터를 결과에 함께 돌려준다.
+def get_augmentation(replay=False):
+    compose = A.ReplayCompose if replay else A.Compose
+    return compose([
+        A.HorizontalFlip(p=0.5),
+        A.VerticalFlip(p=0.2),
+        A.RandomRotate90(p=0.5),
+        A.ShiftScaleRotate(shift_limit=0.0625, scale_limit=0.1, rotate_limit=15,
+                           interpolation=cv2.INTER_LINEAR, border_mode=cv2.BORDER_CONSTANT, p=0.5),
+        A.RandomSizedBBoxSafeCrop(height=640, width=640, p=0.5),
+        A.RandomBrightnessContrast(brightness_limit=0.3, contrast_limit=0.3, p=0.5),
+        A.HueSaturationValue(hue_shift_limit=20, sat_shift_limit=20, val_shift_limit=20, p=0.5),
+        A.MotionBlur(blur_limit=7, p=0.3),
+        A.GaussNoise(var_limit=(5.0, 20.0), p=0.3),
+        A.CLAHE(clip_limit=2.0, tile_grid_size=(8, 8), p=0.3)
+    ], bbox_params=A.BboxParams(format='yolo', label_fields=['category']))
+
+
+def sample_seed(base_seed, name, attempt):
+    """(기준 시드, 이미지 이름, 시도 번호)로부터 32비트 시드를 만든다."""
+    digest = hashlib.sha1(f"{base_seed}:{name}:{attempt}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'little')
+
+
+def seed_transform(transform, seed):
+    """albumentations가 쓰는 난수 상태를 seed로 맞춘다 (구버전은 random/np.random 전역 상태를 쓴다)."""
+    random.seed(seed)
+    np.random.seed(seed)
+    if hasattr(transform, 'set_random_seed'):
+        transform.set_random_seed(seed)
+
+
+def replay_sample(transform, image, bboxes, categories, seed):
+    """seed로 난수 상태를 맞춘 뒤 변환을 한 번 적용한다. 같은 파이프라인과 seed면 항상 같은 결과가 나온다."""
+    seed_transform(transform, seed)
+    return transform(image=image, bboxes=bboxes, category=categories)
+
+
+def generate_augmentations(transform, image, bboxes, categories, name, num_augmentations, base_seed):
+    """
+    한 이미지에서 num_augmentations개의 증강 결과를 만든다.
+    ValueError(박스가 잘려 나가는 등)가 나면 다음 시드로 재시도하며, 최대 num_augmentations * 3번 시도한다.
+    (번호, 시드, 증강 결과 dict)를 하나씩 돌려준다.
+    """
+    successful = 0
+    attempts = 0
+    max_attempts = num_augmentations * 3  # 실패 시 재시도 최대 횟수 설정
+    while successful < num_augmentations and attempts < max_attempts:
+        seed = sample_seed(base_seed, name, attempts)
+        attempts += 1
+        try:
+            augmented = replay_sample(transform, image, bboxes, categories, seed)
+        except ValueError as e:
+            print(f"Warning: Augmentation failed for {name} with error: {e}. Retrying...")
+            continue
+        successful += 1
+        yield successful, seed, augmented
+
+
+def _to_jsonable(value):
+    """replay 파라미터에서 numpy 스칼라는 파이썬 값으로 바꾸고, 배열(노이즈 등)은 None으로 버린다."""
+    if isinstance(value, dict):
+        return {k: _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def applied_transforms(replay):
+    """ReplayCompose의 replay 기록에서 실제로 적용된 변환의 이름과 파라미터만 뽑는다."""
+    applied = []
+    stack = list(replay.get('transforms', []))
+    while stack:
+        t = stack.pop(0)
+        if t.get('transforms'):
+            stack[:0] = t['transforms']
+        elif t.get('applied'):
+            applied.append({'transform': t.get('__class_fullname__'), 'params': _to_jsonable(t.get('params'))})
+    return applied
+
+
+def load_sample_index(index_path):
+    """aug_samples.jsonl을 {증강 이미지 이름: 기록} 딕셔너리로 읽는다."""
+    records = {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records[record['name']] = record
+    return records
+
+
+def write_sample_index(manifest, index_path):
+    """StageManifest에 이미지별로 기록된 샘플 정보를 한 줄에 하나씩 JSONL로 내보낸다."""
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for key in sorted(manifest.entries):
+            for record in manifest.entries[key].get('samples', []):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, index_path)
+
+
+class AsyncWriter:
+    """크기 제한 큐와 백그라운드 스레드로 이미지/라벨 파일을 저장한다. 큐가 가득 차면 put이 기다린다."""
+
+    def __init__(self, maxsize=32):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.errors = []
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                kind, path, payload = item
+                if kind == 'image':
+                    if not cv2.imwrite(path, payload):
+                        raise OSError(f"이미지 저장 실패: {path}")
+                else:
+                    with open(path, 'w') as f:
+                        f.write(payload)
+            except Exception as e:
+                self.errors.append(e)
+            finally:
+                self.queue.task_done()
+
+    def put_image(self, path, image):
+        self.queue.put(('image', path, image))
+
+    def put_text(self, path, text):
+        self.queue.put(('text', path, text))
+
+    def flush(self):
+        """큐에 쌓인 쓰기를 모두 끝내고, 실패한 쓰기가 있으면 예외를 올린다."""
+        self.queue.join()
+        if self.errors:
+            errors, self.errors = self.errors, []
+            raise errors[0]
+
+    def close(self):
+        self.flush()
+        self.queue.put(None)
+        self.thread.join()
+
+
+# 워커 프로세스별 상태 (증강 파이프라인과 쓰기 스레드를 재사용한다)
+_worker = {}
+
+
+def _init_worker(output_dir, num_augmentations, base_seed, queue_size, materialize=True):
+    cv2.setNumThreads(0)  # 프로세스 수만큼 이미 병렬이므로 OpenCV 내부 스레드는 끈다
+    _worker.update(
+        transform=get_augmentation(replay=True),
+        writer=AsyncWriter(queue_size),
+        output_dir=output_dir,
+        num_augmentations=num_augmentations,
+        base_seed=base_seed,
+        materialize=materialize
+    )
+
+
+def augment_image(image_path, classes, coords, label_name):
+    """
+    워커 안에서 이미지 하나를 증강한다.
+    materialize면 저장을 쓰기 큐에 넘기고, 아니면 샘플 기록만 남긴다.
+    (생성한 파일 경로 목록, 샘플 기록 목록)을 돌려준다.
+    """
+    outputs, samples = [], []
+    image = cv2.imread(image_path)
+    if image is None:
+        print(f"Error: Could not read image {image_path}")
+        return outputs, samples
+
+    bboxes = np.asarray(coords, dtype=np.float64).tolist()
+    categories = np.asarray(classes).tolist()
+    if not bboxes:
+        print(f"Warning: No valid bounding boxes found in {label_name}")
+        return outputs, samples
+
+    output_dir = _worker['output_dir']
+    writer = _worker['writer']
+    image_name = os.path.basename(image_path)
+    for n, seed, augmented in generate_augmentations(_worker['transform'], image, bboxes, categories,
+                                                     image_name, _worker['num_augmentations'], _worker['base_seed']):
+        aug_image_name = f"aug_{n}_" + image_name
+        aug_label_name = f"aug_{n}_" + label_name
+        samples.append({
+            'name': aug_image_name,
+            'label': aug_label_name,
+            'source': image_path,
+            'source_label': label_name,
+            'seed': seed,
+            'transforms': applied_transforms(augmented.get('replay', {}))
+        })
+        if _worker['materialize']:
+            aug_image_path = os.path.join(output_dir, aug_image_name)
+            aug_label_path = os.path.join(output_dir, aug_label_name)
+            writer.put_image(aug_image_path, augmented['image'])
+            writer.put_text(aug_label_path, format_labels(augmented['category'], augmented['bboxes']))
+            outputs += [aug_image_path, aug_label_path]
+
+    if len(samples) < _worker['num_augmentations']:
+        print(f"Warning: Only {len(samples)} augmentations were generated for {image_path}.")
+    return outputs, samples
+
+
+def _augment_chunk(tasks):
+    results = [(task[0], *augment_image(*task)) for task in tasks]
+    # 묶음이 끝날 때 쓰기를 모두 마쳐야 메인 프로세스가 결과를 매니페스트에 기록할 수 있다
+    _worker['writer'].flush()
+    return results
+
+
+def run_augmentation(tasks, output_dir, num_augmentations=10, base_seed=0,
+                     workers=None, chunk_size=4, queue_size=32, materialize=True):
+    """
+    tasks: (이미지 경로, 클래스 배열, xywh 배열, 라벨 파일명) 목록.
+    프로세스 풀로 증강하고, (이미지 경로, 생성한 파일 목록, 샘플 기록 목록)을 하나씩 돌려주며 진행률/처리량을 출력한다.
+    materialize=False면 파일은 쓰지 않고 샘플 기록(시드, 적용된 변환)만 만든다.
+    """
+    meter = ThroughputMeter("증강", total=len(tasks), unit="images")
+    initargs = (output_dir, num_augmentations, base_seed, queue_size, materialize)
+    for results in imap_parallel(_augment_chunk, chunked(tasks, chunk_size), workers=workers,
+                                 initializer=_init_worker, initargs=initargs):
+        for image_path, outputs, samples in results:
+            meter.update(1, samples=len(samples))
+            yield image_path, outputs, samples
+    meter.summary()
+
+
+# ---------------------------------------------------------------------------
+# 샘플 기록으로부터 증강 결과를 다시 만든다
+# ---------------------------------------------------------------------------
+
+def regenerate_sample(record, label_source, transform=None):
+    """
+    샘플 기록 하나를 다시 만들어 (이미지, 클래스 배열, xywh 배열)을 돌려준다.
+    replay 파라미터에는 노이즈 배열 같은 큰 값이 빠져 있으므로, 기록된 시드로 같은 파이프라인을 다시 돌려서 만든다.
+    """
+    transform = transform or get_augmentation(replay=True)
+    image = cv2.imread(record['source'])
+    if image is None:
+        raise FileNotFoundError(f"원본 이미지를 읽을 수 없습니다: {record['source']}")
+    labels = label_source.get(os.path.splitext(record['source_label'])[0])
+    if labels is None:
+        raise FileNotFoundError(f"원본 라벨이 없습니다: {record['source_label']}")
+    classes, coords = labels
+    augmented = replay_sample(transform, image, np.asarray(coords, dtype=np.float64).tolist(),
+                              np.asarray(classes).tolist(), record['seed'])
+    return augmented['image'], np.asarray(augmented['category']), np.asarray(augmented['bboxes'])
+
+
+def _init_regenerate_worker(label_dir, output_dir, queue_size):
+    cv2.setNumThreads(0)
+    _worker.update(
+        transform=get_augmentation(replay=True),
+        writer=AsyncWriter(queue_size),
+        label_source=open_labels(label_dir),
+        output_dir=output_dir
+    )
+
+
+def _regenerate_chunk(records):
+    done = []
+    for record in records:
+        try:
+            image, classes, bboxes = regenerate_sample(record, _worker['label_source'], _worker['transform'])
+        except (OSError, ValueError) as e:
+            print(f"❌ 재생성 실패: {record['name']}: {e}")
+            continue
+        _worker['writer'].put_image(os.path.join(_worker['output_dir'], record['name']), image)
+        _worker['writer'].put_text(os.path.join(_worker['output_dir'], record['label']), format_labels(classes, bboxes))
+        done.append(record['name'])
+    _worker['writer'].flush()
+    return done
+
+
+def regenerate_samples(records, label_dir, output_dir, workers=None, chunk_size=8, queue_size=32):
+    """샘플 기록 목록을 프로세스 풀로 다시 만들어 output_dir에 저장하고, 만든 이미지 이름 목록을 돌려준다."""
+    os.makedirs(output_dir, exist_ok=True)
+    meter = ThroughputMeter("증강 재생성", total=len(records), unit="samples")
+    done = []
+    for names in imap_parallel(_regenerate_chunk, chunked(records, chunk_size), workers=workers,
+                               initializer=_init_regenerate_worker, initargs=(label_dir, output_dir, queue_size)):
+        meter.update(len(names))
+        done.extend(names)
+    meter.summary()
+    return done
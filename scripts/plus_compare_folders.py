@@ -1,23 +1,14 @@
 import os
 
+from dataset_audit import compare_dirs
+from image_dedup import HashIndex, find_pairs, print_pairs
+
 def compare_folders(folder1, folder2):
-    folder1_files = set(os.listdir(folder1))
-    folder2_files = set(os.listdir(folder2))
-    
-    image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp'}
-    json_extension = '.json'
-    
-    folder1_images = {f for f in folder1_files if os.path.splitext(f)[1].lower() in image_extensions}
-    folder2_images = {f for f in folder2_files if os.path.splitext(f)[1].lower() in image_extensions}
+    # 폴더마다 os.scandir 한 번으로 목록을 만들어 파일 이름을 비교한다
+    image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
     
-    folder1_jsons = {f for f in folder1_files if f.endswith(json_extension)}
-    folder2_jsons = {f for f in folder2_files if f.endswith(json_extension)}
-    
-    unmatched_images_in_folder1 = folder1_images - folder2_images
-    unmatched_images_in_folder2 = folder2_images - folder1_images
-    
-    unmatched_jsons_in_folder1 = folder1_jsons - folder2_jsons
-    unmatched_jsons_in_folder2 = folder2_jsons - folder1_jsons
+    unmatched_images_in_folder1, unmatched_images_in_folder2 = compare_dirs(folder1, folder2, image_extensions)
+    unmatched_jsons_in_folder1, unmatched_jsons_in_folder2 = compare_dirs(folder1, folder2, ('.json',))
     
     print("=== 매칭되지 않는 이미지 파일 ===")
     print("폴더1에만 있는 이미지 파일:", unmatched_images_in_folder1)
@@ -27,8 +18,19 @@ def compare_folders(folder1, folder2):
     print("폴더1에만 있는 JSON 파일:", unmatched_jsons_in_folder1)
     print("폴더2에만 있는 JSON 파일:", unmatched_jsons_in_folder2)
 
+def compare_near_duplicates(folder1, folder2, phash_threshold=8, dhash_threshold=10):
+    # 이름이 달라도 내용이 거의 같은 이미지(다시 라벨링된 중복)를 지각 해시로 찾는다
+    index1 = HashIndex.build(folder1)
+    index2 = HashIndex.build(folder2)
+    pairs = find_pairs(index1, index2, phash_threshold, dhash_threshold)
+    renamed = [pair for pair in pairs if os.path.basename(pair[0]) != os.path.basename(pair[1])]
+    print("\n=== 이름은 다르지만 내용이 거의 같은 이미지 ===")
+    print_pairs("폴더1 ↔ 폴더2", renamed)
+    return pairs
+
 # 🔥 폴더 경로를 여기에 직접 입력
 folder1_path = "/home/a/A_2024_selfcode/PCB/dataset/0_raw_data/kbs_dragged2/before"
 folder2_path = "/home/a/A_2024_selfcode/PCB/GT/kbs_only_rect_and_draged"
 
 compare_folders(folder1_path, folder2_path)
+compare_near_duplicates(folder1_path, folder2_path)
@@ -0,0 +1,221 @@
+# scripts/predict_stream.py
+# 결과를 메모리에 모으지 않는 스트리밍 추론 실행기
+# - 이미지 디코딩은 스레드 풀이 lookahead장 앞서 읽어 둔다 (cv2.imread는 GIL을 놓으므로 스레드로 충분하다).
+# - 디코딩된 이미지를 batch장씩 묶어 model.predict(또는 TiledPredictor.predict)에 넣고, 이미지별 결과를 하나씩 내보낸다.
+# - 출력(YOLO txt, COCO JSON lines, 그린 이미지)은 싱크마다 크기 제한 큐와 백그라운드 스레드로 저장하므로
+#   모델이 디스크 쓰기를 기다리지 않고, 큐가 가득 차면 그만큼만 기다려서 메모리는 일정하게 유지된다.
+import os
+import json
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from label_codec import write_labels
+from parallel_utils import ThroughputMeter
+from tiled_inference import IMAGE_EXTENSIONS, normalized_labels, read_result
+
+
+def list_images(source_dir):
+    with os.scandir(source_dir) as entries:
+        return sorted(e.path for e in entries if e.name.lower().endswith(IMAGE_EXTENSIONS))
+
+
+def prefetch_images(paths, workers=4, lookahead=32):
+    """경로 순서대로 (경로, BGR 이미지 또는 None)을 돌려준다. 항상 lookahead장까지만 미리 읽어 둔다."""
+    paths = iter(paths)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for path in paths:
+            pending.append((path, pool.submit(cv2.imread, path)))
+            if len(pending) >= lookahead:
+                break
+        while pending:
+            path, future = pending.popleft()
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append((next_path, pool.submit(cv2.imread, next_path)))
+            yield path, future.result()
+
+
+def _predict_batch(model, images, imgsz, conf, iou, obb, tiled):
+    if tiled is not None:
+        return tiled.predict(images)
+    outputs = []
+    for image, result in zip(images, model.predict(images, imgsz=imgsz, conf=conf, iou=iou, verbose=False)):
+        boxes, polygons, scores, classes = read_result(result, obb)
+        h, w = image.shape[:2]
+        output = {'boxes': boxes, 'scores': scores, 'classes': classes, 'size': (w, h)}
+        if obb:
+            output['polygons'] = polygons
+        outputs.append(output)
+    return outputs
+
+
+def stream_predict(model, paths, batch=16, imgsz=800, conf=0.25, iou=0.7, decode_workers=4, lookahead=None,
+                   tiled=None):
+    """
+    paths를 batch장씩 추론하며 (경로, 이미지, 결과 딕셔너리)를 하나씩 돌려준다.
+    결과 딕셔너리는 tiled_inference와 같은 모양이다: {'boxes' xyxy, 'scores', 'classes', 'size' (w, h)[, 'polygons']}
+    tiled(TiledPredictor)를 주면 각 묶음을 타일 추론으로 처리한다.
+    """
+    obb = getattr(model, 'task', None) == 'obb'
+    pending = []
+
+    def run():
+        images = [image for _, image in pending]
+        for (path, image), output in zip(pending, _predict_batch(model, images, imgsz, conf, iou, obb, tiled)):
+            yield path, image, output
+
+    for path, image in prefetch_images(paths, decode_workers, lookahead or batch * 2):
+        if image is None:
+            print(f"\n❌ 이미지를 불러올 수 없습니다: {path}")
+            continue
+        pending.append((path, image))
+        if len(pending) == batch:
+            yield from run()
+            pending = []
+    if pending:
+        yield from run()
+
+
+class BackgroundSink:
+    """크기 제한 큐와 백그라운드 스레드로 결과를 저장하는 싱크의 공통 부분. 하위 클래스는 write만 구현한다."""
+
+    def __init__(self, maxsize=64):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.errors = []
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                self.write(*item)
+            except Exception as e:
+                self.errors.append(e)
+            finally:
+                self.queue.task_done()
+
+    def write(self, path, image, result):
+        raise NotImplementedError
+
+    def finish(self):
+        """모든 쓰기가 끝난 뒤 백그라운드 스레드에서 한 번 호출된다 (파일 닫기 등)."""
+
+    def submit(self, path, image, result):
+        self.queue.put((path, image, result))
+
+    def close(self):
+        """큐에 쌓인 쓰기를 모두 끝내고 스레드를 멈춘다. 실패한 쓰기가 있으면 예외를 올린다."""
+        self.queue.join()
+        self.queue.put(None)
+        self.thread.join()
+        self.finish()
+        if self.errors:
+            raise self.errors[0]
+
+
+class TxtSink(BackgroundSink):
+    """ultralytics save_txt와 같은 형식의 라벨 파일 (검출이 없는 이미지는 파일을 만들지 않는다)."""
+
+    def __init__(self, label_dir, obb=False, save_conf=False, maxsize=64):
+        os.makedirs(label_dir, exist_ok=True)
+        self.label_dir = label_dir
+        self.obb = obb
+        self.save_conf = save_conf
+        super().__init__(maxsize)
+
+    def write(self, path, image, result):
+        if len(result['classes']) == 0:
+            return
+        classes, coords = normalized_labels(result, self.obb)
+        if self.save_conf:
+            coords = np.concatenate([coords, result['scores'].reshape(-1, 1)], axis=1)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        write_labels(os.path.join(self.label_dir, stem + '.txt'), classes, coords)
+
+
+class CocoJsonlSink(BackgroundSink):
+    """
+    검출 하나당 한 줄의 COCO 결과 레코드 {"image_id": stem, "category_id", "bbox": [x, y, w, h], "score"[, "poly"]}.
+    ultralytics predictions.json과 같은 필드라서 load_jsonl로 읽어 기존 변환 스크립트(fix_predictions 등)에 넘길 수 있다.
+    """
+
+    def __init__(self, jsonl_path, maxsize=64):
+        os.makedirs(os.path.dirname(os.path.abspath(jsonl_path)), exist_ok=True)
+        self.file = open(jsonl_path, 'w', encoding='utf-8')
+        super().__init__(maxsize)
+
+    def write(self, path, image, result):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        boxes = result['boxes']
+        xywh = np.round(np.concatenate([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]], axis=1), 3).tolist()
+        scores = np.round(result['scores'], 5).tolist()
+        polys = np.round(result['polygons'].reshape(-1, 8), 3).tolist() if 'polygons' in result else None
+        lines = []
+        for i, cls in enumerate(result['classes'].tolist()):
+            record = {'image_id': stem, 'category_id': int(cls), 'bbox': xywh[i], 'score': scores[i]}
+            if polys is not None:
+                record['poly'] = polys[i]
+            lines.append(json.dumps(record))
+        if lines:
+            self.file.write("\n".join(lines) + "\n")
+
+    def finish(self):
+        self.file.close()
+
+
+class RenderSink(BackgroundSink):
+    """검출 결과를 그린 이미지를 저장한다 (model.predict(save=True) 대신)."""
+
+    def __init__(self, output_dir, class_names=None, line_width=2, maxsize=16):
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.class_names = class_names or {}
+        self.line_width = line_width
+        super().__init__(maxsize)
+
+    def write(self, path, image, result):
+        canvas = image.copy()
+        for i, cls in enumerate(result['classes'].tolist()):
+            color = tuple(int(c) for c in np.random.default_rng(cls).integers(0, 255, 3))
+            if 'polygons' in result:
+                pts = result['polygons'][i].astype(np.int32)
+                cv2.polylines(canvas, [pts], True, color, self.line_width)
+                x, y = pts[0]
+            else:
+                x1, y1, x2, y2 = result['boxes'][i].astype(int).tolist()
+                cv2.rectangle(canvas, (x1, y1), (x2, y2), color, self.line_width)
+                x, y = x1, y1
+            label = f"{self.class_names.get(cls, cls)} {result['scores'][i]:.2f}"
+            cv2.putText(canvas, label, (int(x), int(y) - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        if not cv2.imwrite(os.path.join(self.output_dir, os.path.basename(path)), canvas):
+            raise OSError(f"이미지 저장 실패: {path}")
+
+
+def load_jsonl(jsonl_path):
+    """CocoJsonlSink 파일을 COCO 결과 리스트로 읽는다."""
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run_prediction(model, source_dir, sinks, batch=16, imgsz=800, conf=0.25, iou=0.7, decode_workers=4, tiled=None):
+    """source_dir의 이미지를 스트리밍으로 추론하고 결과를 싱크들에 넘긴다. 끝나면 싱크를 모두 닫는다."""
+    paths = list_images(source_dir)
+    meter = ThroughputMeter("추론", total=len(paths), unit="images")
+    try:
+        for path, image, result in stream_predict(model, paths, batch, imgsz, conf, iou, decode_workers, tiled=tiled):
+            for sink in sinks:
+                sink.submit(path, image, result)
+            meter.update(1, detections=len(result['classes']))
+    finally:
+        for sink in sinks:
+            sink.close()
+    return meter.summary()
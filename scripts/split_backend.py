@@ -0,0 +1,111 @@
+# scripts/split_backend.py
+# train/val 분할 스크립트가 파일을 "배치"하는 방식
+#   hardlink : 같은 inode를 가리키는 링크를 만든다 (추가 용량/복사 없음, 같은 파일 시스템만 가능)
+#   reflink  : copy-on-write 복제 (btrfs/XFS 등). 내용은 공유하지만 한쪽을 고쳐도 다른 쪽은 바뀌지 않는다
+#   symlink  : 원본을 가리키는 심볼릭 링크
+#   copy     : shutil.copy2 (스레드 풀로 여러 파일을 동시에 복사한다)
+#   auto     : reflink → hardlink → copy 순서로 되는 방식을 쓴다
+# 주의: hardlink/symlink로 배치한 파일을 제자리에서 수정하면 원본도 함께 바뀐다.
+#       분할 결과를 직접 고치는 단계가 있으면 reflink나 copy를 쓴다.
+import os
+import shutil
+import errno
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from parallel_utils import ThroughputMeter
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MODES = ('auto', 'reflink', 'hardlink', 'symlink', 'copy')
+FICLONE = 0x40049409  # linux/fs.h 의 _IOW(0x94, 9, int)
+
+# 파일 시스템이 해당 방식을 지원하지 않을 때 나는 오류 (다음 방식으로 넘어간다)
+_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EMLINK, errno.ENOSYS}
+
+
+def reflink(src, dst):
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink를 지원하지 않는 플랫폼입니다", dst)
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _symlink(src, dst):
+    os.symlink(os.path.abspath(src), dst)
+
+
+_PLACERS = {
+    'reflink': reflink,
+    'hardlink': os.link,
+    'symlink': _symlink,
+    'copy': shutil.copy2,
+}
+_AUTO_ORDER = ('reflink', 'hardlink', 'copy')
+
+
+def _remove_existing(dst):
+    # 링크는 대상이 있으면 실패하고, 기존 하드링크에 copy2로 덮어쓰면 원본까지 바뀌므로 먼저 지운다
+    if os.path.lexists(dst):
+        os.unlink(dst)
+
+
+def place_file(src, dst, mode='auto'):
+    """src를 dst에 mode 방식으로 배치하고 실제로 쓴 방식을 돌려준다."""
+    if mode not in MODES:
+        raise ValueError(f"지원하지 않는 분할 방식: {mode} (가능: {', '.join(MODES)})")
+    _remove_existing(dst)
+    if mode != 'auto':
+        _PLACERS[mode](src, dst)
+        return mode
+
+    for candidate in _AUTO_ORDER:
+        try:
+            _PLACERS[candidate](src, dst)
+            return candidate
+        except OSError as e:
+            if candidate == 'copy' or e.errno not in _UNSUPPORTED:
+                raise
+            _remove_existing(dst)
+
+
+def place_files(pairs, mode='auto', workers=8, name="파일 배치"):
+    """
+    (src, dst) 목록을 스레드 풀로 배치한다. 파일마다 출력하지 않고 진행률과 방식별 개수만 요약한다.
+    실패한 파일은 (src, dst, 오류) 목록으로 돌려준다.
+    반환값: (성공한 (src, dst) 목록, 방식별 Counter, 실패 목록)
+    """
+    pairs = list(pairs)
+    meter = ThroughputMeter(name, total=len(pairs))
+    placed, modes, failures = [], Counter(), []
+
+    def _place(pair):
+        try:
+            return pair, place_file(pair[0], pair[1], mode), None
+        except OSError as e:
+            return pair, None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for pair, used, error in pool.map(_place, pairs):
+            if error is None:
+                placed.append(pair)
+                modes[used] += 1
+            else:
+                failures.append((*pair, error))
+            meter.update(1)
+
+    meter.summary()
+    for used, count in modes.most_common():
+        print(f" - {used}: {count}개")
+    for src, dst, error in failures:
+        print(f"❌ 배치 실패: {src} → {dst}: {error}")
+    return placed, modes, failures
@@ -0,0 +1,164 @@
+# scripts/split_index.py
+# 파일을 옮기거나 복사하지 않는 train/val/test 분할
+# 하나의 이미지 풀(pool/images + pool/labels)에서 분할마다 이미지 경로 목록(train.txt, val.txt, test.txt)만 만든다.
+# ultralytics는 dataset.yaml의 train/val에 목록 파일을 그대로 받으며, 라벨은 경로의 /images/를 /labels/로 바꿔 찾는다.
+#
+# 분할 디렉터리 구성 (<split_root>/<버전>/)
+#   train.txt, val.txt, test.txt : 이미지 절대 경로 목록
+#   split.json                   : 시드, 비율, 개수, 이미지 풀 목록 해시
+#   dataset.yaml                 : 기본 dataset.yaml의 train/val/test만 목록 파일로 바꾼 설정
+import os
+import json
+import hashlib
+
+import numpy as np
+import yaml
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+SPLIT_NAMES = ('train', 'val', 'test')
+
+
+def build_pool(pool_dir, image_exts=IMAGE_EXTENSIONS):
+    """pool_dir/images 중 pool_dir/labels에 같은 이름의 txt가 있는 이미지의 절대 경로를 정렬해서 돌려준다."""
+    image_dir = os.path.join(pool_dir, "images")
+    label_dir = os.path.join(pool_dir, "labels")
+    with os.scandir(label_dir) as entries:
+        label_stems = {e.name[:-4] for e in entries if e.name.endswith('.txt')}
+    with os.scandir(image_dir) as entries:
+        images = [os.path.abspath(e.path) for e in entries
+                  if e.name.lower().endswith(image_exts) and os.path.splitext(e.name)[0] in label_stems]
+    return sorted(images)
+
+
+def pool_digest(paths):
+    """이미지 풀 목록의 해시 (같은 시드라도 풀이 바뀌면 다른 분할임을 알 수 있게 기록한다)."""
+    return hashlib.sha1("\n".join(paths).encode('utf-8')).hexdigest()
+
+
+def random_split(paths, ratios=None, seed=0):
+    """
+    정렬된 경로 목록을 시드 고정 순열로 섞은 뒤 비율대로 나눈다. 같은 풀과 시드면 항상 같은 분할이 나온다.
+    ratios: {'train': 0.8, 'val': 0.2, 'test': 0.0} (합이 1이 아니면 비율로 정규화한다)
+    """
+    ratios = ratios or {'train': 0.8, 'val': 0.2}
+    paths = np.asarray(sorted(paths), dtype=object)
+    order = np.random.default_rng(seed).permutation(len(paths))
+
+    names = [n for n in SPLIT_NAMES if ratios.get(n, 0) > 0]
+    weights = np.array([ratios[n] for n in names], dtype=np.float64)
+    bounds = np.round(np.cumsum(weights / weights.sum()) * len(paths)).astype(int)
+    splits = {}
+    start = 0
+    for name, end in zip(names, bounds):
+        splits[name] = sorted(paths[order[start:end]].tolist())
+        start = end
+    return splits
+
+
+def kfold_splits(paths, k=5, seed=0):
+    """시드 고정 순열을 k개 묶음으로 나눠, fold마다 {'train': ..., 'val': ...}를 돌려준다."""
+    paths = np.asarray(sorted(paths), dtype=object)
+    order = np.random.default_rng(seed).permutation(len(paths))
+    folds = np.array_split(order, k)
+    result = []
+    for i in range(k):
+        train_idx = np.concatenate([f for j, f in enumerate(folds) if j != i])
+        result.append({'train': sorted(paths[train_idx].tolist()), 'val': sorted(paths[folds[i]].tolist())})
+    return result
+
+
+def next_version(split_root):
+    """split_root 아래 v001, v002 ... 중 다음 번호를 돌려준다."""
+    versions = []
+    if os.path.isdir(split_root):
+        for name in os.listdir(split_root):
+            if name.startswith('v') and name[1:].isdigit():
+                versions.append(int(name[1:]))
+    return f"v{max(versions, default=0) + 1:03d}"
+
+
+def write_split(split_dir, splits, base_yaml=None, meta=None):
+    """
+    분할 하나를 목록 파일로 저장한다. base_yaml을 주면 그 설정에서 train/val/test만 목록 파일로 바꾼 dataset.yaml도 쓴다.
+    반환값: dataset.yaml 경로 (base_yaml이 없으면 None)
+    """
+    os.makedirs(split_dir, exist_ok=True)
+    list_files = {}
+    for name, paths in splits.items():
+        list_path = os.path.join(split_dir, f"{name}.txt")
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write("".join(p + "\n" for p in paths))
+        list_files[name] = os.path.abspath(list_path)
+
+    info = dict(meta or {})
+    info['counts'] = {name: len(paths) for name, paths in splits.items()}
+    with open(os.path.join(split_dir, "split.json"), 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=4, ensure_ascii=False)
+
+    if base_yaml is None:
+        return None
+    return write_dataset_yaml(os.path.join(split_dir, "dataset.yaml"), list_files, base_yaml)
+
+
+def write_dataset_yaml(output_path, list_files, base_yaml):
+    """base_yaml(기존 dataset.yaml)을 읽어 train/val/test 경로만 list_files로 바꿔 저장한다."""
+    with open(base_yaml, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    for name in SPLIT_NAMES:
+        config.pop(name, None)
+    config.pop('path', None)
+    config = {**list_files, **config}
+    with open(output_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+    return output_path
+
+
+def load_split(split_dir):
+    """write_split으로 저장한 분할을 {이름: 경로 목록}으로 읽는다."""
+    splits = {}
+    for name in SPLIT_NAMES:
+        list_path = os.path.join(split_dir, f"{name}.txt")
+        if os.path.exists(list_path):
+            with open(list_path, 'r', encoding='utf-8') as f:
+                splits[name] = [line.strip() for line in f if line.strip()]
+    return splits
+
+
+def create_split(pool_dir, split_root, ratios=None, seed=0, base_yaml=None, version=None, splits=None):
+    """이미지 풀에서 새 버전의 분할을 만들고 분할 디렉터리 경로를 돌려준다. splits를 주면 그 배정을 그대로 쓴다."""
+    paths = build_pool(pool_dir)
+    if not paths:
+        raise ValueError(f"⚠️ 이미지와 라벨이 매칭된 파일이 없습니다: {pool_dir}")
+    version = version or next_version(split_root)
+    split_dir = os.path.join(split_root, version)
+    write_split(split_dir, splits or random_split(paths, ratios, seed), base_yaml, meta={
+        'version': version,
+        'pool': os.path.abspath(pool_dir),
+        'pool_size': len(paths),
+        'pool_sha1': pool_digest(paths),
+        'seed': seed,
+        'ratios': ratios or {'train': 0.8, 'val': 0.2},
+    })
+    return split_dir
+
+
+def create_kfold(pool_dir, split_root, k=5, seed=0, base_yaml=None, version=None):
+    """k-fold 분할을 <버전>/fold0 ... fold{k-1} 로 만들고 fold 디렉터리 목록을 돌려준다."""
+    paths = build_pool(pool_dir)
+    if not paths:
+        raise ValueError(f"⚠️ 이미지와 라벨이 매칭된 파일이 없습니다: {pool_dir}")
+    version = version or next_version(split_root)
+    fold_dirs = []
+    for i, splits in enumerate(kfold_splits(paths, k, seed)):
+        fold_dir = os.path.join(split_root, version, f"fold{i}")
+        write_split(fold_dir, splits, base_yaml, meta={
+            'version': version,
+            'fold': i,
+            'k': k,
+            'pool': os.path.abspath(pool_dir),
+            'pool_size': len(paths),
+            'pool_sha1': pool_digest(paths),
+            'seed': seed,
+        })
+        fold_dirs.append(fold_dir)
+    return fold_dirs
@@ -0,0 +1,187 @@
+# scripts/stratified_split.py
+# 클래스 × 크기(COCO small/medium/large) 기준 반복적 다중 라벨 층화 분할 (iterative stratification)
+# 이미지 하나에는 여러 클래스/크기의 박스가 섞여 있으므로, 이미지마다 (클래스 × 크기) 박스 개수 벡터를 만들고
+# 가장 드문 라벨부터 그 라벨을 가진 이미지를 "그 라벨이 가장 부족한 fold"에 배정한다.
+# BGA/Crystal/MELF처럼 드문 클래스가 train/val 어느 한쪽에 몰리지 않게 해서 val mAP 편차를 줄인다.
+import os
+
+import numpy as np
+
+from label_store import LabelStore, obb_to_yolo, open_labels
+
+# COCO 면적 구간 (픽셀²): small < 32², medium < 96², large
+SIZE_BUCKETS = ('small', 'medium', 'large')
+SIZE_THRESHOLDS = (32 ** 2, 96 ** 2)
+
+
+def load_boxes(label_source):
+    """라벨 저장소/txt 폴더에서 (stems, 박스별 이미지 번호, 클래스, xywh)를 한 번에 모은다."""
+    stems = list(label_source.stems)
+    if isinstance(label_source, LabelStore):
+        coords = np.asarray(label_source.coords)
+        if label_source.format != 'yolo':
+            coords = obb_to_yolo(coords)
+        return stems, label_source.image_index(), np.asarray(label_source.classes, dtype=np.int64), coords
+
+    image_index, classes, coords = [], [], []
+    for i, stem in enumerate(stems):
+        cls, xywh = label_source.get(stem, 'yolo')
+        image_index.append(np.full(len(cls), i, dtype=np.int64))
+        classes.append(cls.astype(np.int64))
+        coords.append(xywh.reshape(-1, 4))
+    if not stems:
+        return stems, np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros((0, 4), np.float32)
+    return stems, np.concatenate(image_index), np.concatenate(classes), np.concatenate(coords)
+
+
+def size_bucket(coords, image_width=800, image_height=800):
+    """정규화 xywh의 픽셀 면적으로 COCO 크기 구간 번호(0=small, 1=medium, 2=large)를 매긴다."""
+    area = coords[:, 2] * image_width * coords[:, 3] * image_height
+    return np.searchsorted(np.asarray(SIZE_THRESHOLDS), area, side='right')
+
+
+def count_matrix(image_index, labels, num_images, num_labels):
+    """(이미지 수, 라벨 수) 박스 개수 행렬을 bincount 한 번으로 만든다."""
+    labels = np.asarray(labels)
+    bad = (labels < 0) | (labels >= num_labels)
+    if bad.any():
+        raise ValueError(f"라벨 번호가 범위(0~{num_labels - 1})를 벗어났습니다: {np.unique(labels[bad]).tolist()}")
+    flat = np.bincount(image_index * num_labels + labels, minlength=num_images * num_labels)
+    return flat.reshape(num_images, num_labels)
+
+
+def iterative_stratify(counts, ratios, seed=0, fixed=None):
+    """
+    counts: (이미지 수, 라벨 수) 박스 개수 행렬
+    ratios: fold별 비율 (예: [0.8, 0.2] 또는 k-fold면 [1/k] * k)
+    fixed : 이미 배정된 이미지의 fold 번호 (배정 안 됨은 -1). 기존 배정을 유지하고 나머지만 채운다.
+    반환값: 이미지별 fold 번호 (n,)
+    """
+    rng = np.random.default_rng(seed)
+    counts = np.asarray(counts, dtype=np.int64)
+    n_images, n_labels = counts.shape
+    ratios = np.asarray(ratios, dtype=np.float64)
+    ratios = ratios / ratios.sum()
+
+    fold = np.full(n_images, -1, dtype=np.int64) if fixed is None else np.asarray(fixed, dtype=np.int64).copy()
+    # fold별로 앞으로 더 받아야 할 라벨 개수와 이미지 수 (이미 배정된 몫은 미리 뺀다)
+    desired_labels = np.outer(ratios, counts.sum(axis=0)).astype(np.float64)
+    desired_images = ratios * n_images
+    for f in range(len(ratios)):
+        assigned = fold == f
+        desired_labels[f] -= counts[assigned].sum(axis=0)
+        desired_images[f] -= assigned.sum()
+
+    remaining = fold < 0
+    remaining_counts = counts[remaining].sum(axis=0)
+    # 같은 조건이면 무작위로 고르기 위해 이미지 순서를 섞어 둔다
+    order = rng.permutation(n_images)
+
+    while remaining.any():
+        active = np.flatnonzero(remaining_counts > 0)
+        if len(active) == 0:
+            # 박스가 없는 이미지는 이미지 수 비율만 맞춘다
+            for i in order[remaining[order]]:
+                f = int(np.argmax(desired_images))
+                fold[i] = f
+                desired_images[f] -= 1
+            break
+
+        # 남은 개수가 가장 적은 (가장 드문) 라벨부터 배정한다
+        label = active[np.argmin(remaining_counts[active])]
+        candidates = order[remaining[order] & (counts[order, label] > 0)]
+        for i in candidates:
+            need = desired_labels[:, label]
+            best = np.flatnonzero(need == need.max())
+            if len(best) > 1:
+                # 동률이면 이미지 수가 더 부족한 fold, 그래도 같으면 무작위
+                img_need = desired_images[best]
+                best = best[img_need == img_need.max()]
+            f = int(best[rng.integers(len(best))]) if len(best) > 1 else int(best[0])
+            fold[i] = f
+            desired_labels[f] -= counts[i]
+            desired_images[f] -= 1
+            remaining[i] = False
+            remaining_counts -= counts[i]
+    return fold
+
+
+def distribution_report(fold, image_index, classes, buckets, num_classes, num_folds, fold_names=None, class_names=None):
+    """
+    fold별 (클래스 × 크기) 박스 수를 전체 박스에 대해 bincount 한 번으로 집계하고 표로 출력한다.
+    반환값: {'class': (fold, class) 개수, 'size': (fold, 3) 개수, 'images': (fold,) 이미지 수}
+    """
+    fold_names = fold_names or [f"fold{i}" for i in range(num_folds)]
+    class_names = class_names or [str(c) for c in range(num_classes)]
+    box_fold = fold[image_index]
+    joint = np.bincount((box_fold * num_classes + classes) * len(SIZE_BUCKETS) + buckets,
+                        minlength=num_folds * num_classes * len(SIZE_BUCKETS))
+    joint = joint.reshape(num_folds, num_classes, len(SIZE_BUCKETS))
+    per_class = joint.sum(axis=2)
+    per_size = joint.sum(axis=1)
+    images = np.bincount(fold, minlength=num_folds)
+
+    total_class = np.maximum(per_class.sum(axis=0), 1)
+    total_size = np.maximum(per_size.sum(axis=0), 1)
+    header = "".join(f"{name:>16}" for name in fold_names)
+    print(f"{'':<12}{header}")
+    print(f"{'images':<12}" + "".join(f"{n:>16}" for n in images))
+    for c in range(num_classes):
+        row = "".join(f"{per_class[f, c]:>9} ({per_class[f, c] / total_class[c]:>4.0%})" for f in range(num_folds))
+        print(f"{class_names[c]:<12}{row}")
+    for b, bucket in enumerate(SIZE_BUCKETS):
+        row = "".join(f"{per_size[f, b]:>9} ({per_size[f, b] / total_size[b]:>4.0%})" for f in range(num_folds))
+        print(f"{bucket:<12}{row}")
+    return {'class': per_class, 'size': per_size, 'images': images}
+
+
+def select_images(stems, image_index, classes, coords, only):
+    """only(stem 집합)에 든 이미지와 그 박스만 남기고 이미지 번호를 다시 매긴다."""
+    keep = np.array([stem in only for stem in stems], dtype=bool)
+    new_index = np.cumsum(keep) - 1
+    box_keep = keep[image_index]
+    stems = [stem for stem, k in zip(stems, keep) if k]
+    return stems, new_index[image_index[box_keep]], classes[box_keep], coords[box_keep]
+
+
+def stratified_split(label_path, ratios, num_classes, seed=0, image_size=(800, 800), fixed=None,
+                     fold_names=None, class_names=None, fmt='yolo', only=None):
+    """
+    라벨 저장소 또는 txt 폴더(label_path)를 층화 분할한다.
+    fixed는 {stem: fold 번호}로 기존 배정을 넘기고, only(stem 집합)를 주면 그 이미지만 분할한다.
+    반환값: ({stem: fold 번호}, 분포 보고서)
+    """
+    stems, image_index, classes, coords = load_boxes(open_labels(label_path, fmt))
+    if only is not None:
+        stems, image_index, classes, coords = select_images(stems, image_index, classes, coords, set(only))
+    # 클래스 번호가 범위를 벗어난 박스는 다른 이미지의 칸으로 세어지지 않게 빼고 알린다
+    valid = (classes >= 0) & (classes < num_classes)
+    if not valid.all():
+        print(f"⚠️ 클래스 번호가 0~{num_classes - 1} 범위를 벗어난 박스 {int((~valid).sum())}개를 제외합니다: "
+              f"{np.unique(classes[~valid]).tolist()}")
+        image_index, classes, coords = image_index[valid], classes[valid], coords[valid]
+    buckets = size_bucket(coords, *image_size)
+    labels = classes * len(SIZE_BUCKETS) + buckets
+    counts = count_matrix(image_index, labels, len(stems), num_classes * len(SIZE_BUCKETS))
+
+    fixed_array = None
+    if fixed:
+        fixed_array = np.array([fixed.get(stem, -1) for stem in stems], dtype=np.int64)
+    fold = iterative_stratify(counts, ratios, seed, fixed_array)
+    report = distribution_report(fold, image_index, classes, buckets, num_classes, len(ratios), fold_names, class_names)
+    return dict(zip(stems, fold.tolist())), report
+
+
+def stratified_kfold(label_path, k, num_classes, seed=0, image_size=(800, 800), class_names=None, fmt='yolo',
+                     only=None):
+    """k-fold 층화 분할. fold마다 {'train': stems, 'val': stems} 목록을 돌려준다 (only는 stratified_split과 같다)."""
+    assignment, _ = stratified_split(label_path, [1.0 / k] * k, num_classes, seed, image_size,
+                                     fold_names=[f"fold{i}" for i in range(k)], class_names=class_names, fmt=fmt,
+                                     only=only)
+    stems = np.array(list(assignment.keys()), dtype=object)
+    fold = np.array(list(assignment.values()))
+    return [{'train': sorted(stems[fold != i].tolist()), 'val': sorted(stems[fold == i].tolist())} for i in range(k)]
+
+
+def stems_to_paths(stems, image_dir, ext='.jpg'):
+    return [os.path.abspath(os.path.join(image_dir, stem + ext)) for stem in stems]
@@ -1,8 +1,9 @@
 import os
 import shutil
-import json
 import math
 
+from labelme_stream import load_labelme, dump_labelme
+
 # Function to calculate the slope of a polygon
 def calculate_slope(points):
     if len(points) < 2:
@@ -39,8 +40,8 @@ def process_files_in_directory(input_dir, output_dir):
                 json_path = os.path.join(root, file)
                 image_path = os.path.splitext(json_path)[0] + ".jpg"  # Assuming image extension is .jpg
 
-                with open(json_path, "r") as json_file:
-                    data = json.load(json_file)
+                # Read without decoding the embedded base64 imageData
+                data = load_labelme(json_path)
 
                 # Modify the JSON data
                 modified_data = convert_polygons_to_rectangles(data)
@@ -54,9 +55,8 @@ def process_files_in_directory(input_dir, output_dir):
                 output_json_path = os.path.join(output_subdir, file)
                 output_image_path = os.path.join(output_subdir, os.path.basename(image_path))
 
-                # Save the modified JSON file
-                with open(output_json_path, "w") as output_json_file:
-                    json.dump(modified_data, output_json_file, indent=4)
+                # Save the modified JSON file (imageData bytes are copied over from the source as-is)
+                dump_labelme(modified_data, output_json_path, image_data_source=json_path)
 
                 # Copy the image file
                 if os.path.exists(image_path):
@@ -7,6 +7,8 @@ from matplotlib.patches import Rectangle
 from matplotlib.widgets import RectangleSelector
 from shutil import copy2
 
+from labelme_stream import load_labelme
+
 # Global variable to store drag regions
 drag_regions = []
 
@@ -46,8 +48,8 @@ def check_overlap(rect1, rect2):
 def process_image_and_json(image_path, json_path, output_dir):
     global drag_regions
 
-    with open(json_path, 'r') as f:
-        json_data = json.load(f)
+    # imageData is re-encoded from the modified image below, so skip decoding the old one
+    json_data = load_labelme(json_path)
 
     # Load the image
     image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
@@ -98,8 +100,7 @@ def main(input_image_folder, input_json_folder, output_folder):
                 drag_regions = []
 
                 # Load image and JSON
-                with open(json_path, 'r') as f:
-                    json_data = json.load(f)
+                json_data = load_labelme(json_path)
 
                 fig, ax, image = draw_labels(image_path, json_data)
 
@@ -1,13 +1,13 @@
-from pycocotools.coco import COCO
-from pycocotools.cocoeval import COCOeval
-import json
+import os
+import sys
 
-# COCO 데이터셋 로드
-coco_gt = COCO("/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/coco_gt.json")  # COCO 검증 데이터셋 (Ground Truth)
-coco_dt = coco_gt.loadRes("/home/a/A_2024_selfcode/CLASS-PCB_Yolo/runs/detect/val4/predictions.json")  # YOLO의 예측 결과 JSON
+# scripts/ 폴더의 공용 모듈을 불러오기 위해 경로를 추가한다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fast_coco_eval import coco_evaluate, DENSE_MAX_DETS
 
-# 평가 객체 생성
-coco_eval = COCOeval(coco_gt, coco_dt, "bbox")  # bbox 평가
-coco_eval.evaluate()
-coco_eval.accumulate()
-coco_eval.summarize()  # 결과 출력
+# COCO 데이터셋 (Ground Truth)과 YOLO의 예측 결과 JSON
+gt_json = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/dataset/coco_gt.json"
+dt_json = "/home/a/A_2024_selfcode/CLASS-PCB_Yolo/runs/detect/val4/predictions.json"
+
+# bbox 평가 (COCOeval과 같은 12개 지표 + 클래스별 AP 출력)
+coco_evaluate(gt_json, dt_json, max_dets=DENSE_MAX_DETS)
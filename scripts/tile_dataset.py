@@ -0,0 +1,225 @@
+# scripts/tile_dataset.py
+# 원본 보드 이미지(3904×3904)를 겹치는 N×N 타일로 잘라 학습용 데이터셋을 만든다.
+# 전체를 800으로 줄이면 Chip/CSolder 같은 작은 부품이 몇 픽셀이 되므로, 원본 해상도 그대로(또는 조금만 줄여서) 자른다.
+# - 라벨은 정규화 좌표(yolo xywh 또는 obb 꼭짓점 8개)라서 원본 크기만 곱하면 픽셀 좌표가 된다 (800 라벨을 그대로 쓸 수 있다).
+# - 박스는 타일 영역으로 잘라내고, 잘린 뒤 남은 면적 비율(visibility)이 min_visibility보다 작으면 버린다.
+# - OBB는 타일 안에 완전히 들어가는 다각형은 그대로 두고, 경계에 걸친 다각형만 잘라낸 뒤 최소 외접 회전 사각형으로 바꾼다.
+# - 이미지마다 워커 하나가 디코딩, 자르기, 저장을 모두 하므로 타일 저장도 병렬로 이뤄진다.
+# 타일 배치는 tiled_inference.tile_grid와 같아서, 타일 추론과 학습 타일의 축척을 맞출 수 있다.
+import os
+import hashlib
+
+import cv2
+import numpy as np
+
+from label_codec import write_labels
+from label_store import open_labels
+from parallel_utils import chunked, imap_parallel, ThroughputMeter
+from tiled_inference import tile_grid
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def _polygon_area(pts):
+    """(n, k, 2) 다각형 면적 (신발끈 공식)."""
+    x, y = pts[..., 0], pts[..., 1]
+    return 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=-1) - y * np.roll(x, -1, axis=-1), axis=-1))
+
+
+def clip_polygon(points, x0, y0, x1, y1):
+    """다각형 하나(k, 2)를 축 정렬 사각형으로 잘라낸다 (Sutherland–Hodgman). 남는 게 없으면 빈 배열."""
+    poly = [tuple(p) for p in points]
+    # (축, 경계값, 안쪽이 큰 쪽인지)
+    for axis, bound, keep_greater in ((0, x0, True), (0, x1, False), (1, y0, True), (1, y1, False)):
+        if not poly:
+            break
+        inside = [(p[axis] >= bound) if keep_greater else (p[axis] <= bound) for p in poly]
+        clipped = []
+        for i, p in enumerate(poly):
+            q = poly[i - 1]
+            if inside[i] != inside[i - 1]:
+                t = (bound - q[axis]) / (p[axis] - q[axis])
+                clipped.append((q[0] + t * (p[0] - q[0]), q[1] + t * (p[1] - q[1])))
+            if inside[i]:
+                clipped.append(p)
+        poly = clipped
+    return np.asarray(poly, dtype=np.float64).reshape(-1, 2)
+
+
+def clip_boxes(xyxy, region):
+    """
+    픽셀 xyxy 박스(n, 4)를 타일 영역으로 자른다.
+    반환값: (잘린 박스 (n, 4), 남은 면적 비율 (n,))
+    """
+    x0, y0, x1, y1 = region
+    clipped = np.stack([np.clip(xyxy[:, 0], x0, x1), np.clip(xyxy[:, 1], y0, y1),
+                        np.clip(xyxy[:, 2], x0, x1), np.clip(xyxy[:, 3], y0, y1)], axis=1)
+    area = (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])
+    kept = (clipped[:, 2] - clipped[:, 0]) * (clipped[:, 3] - clipped[:, 1])
+    return clipped, kept / np.maximum(area, 1e-9)
+
+
+def clip_polygons(polygons, region):
+    """
+    픽셀 꼭짓점 (n, 4, 2)를 타일 영역으로 자른다. 완전히 안쪽/바깥쪽인 다각형은 벡터 연산으로 처리하고,
+    경계에 걸친 것만 하나씩 잘라 최소 외접 회전 사각형(cv2.minAreaRect)의 꼭짓점 4개로 바꾼다.
+    반환값: (잘린 꼭짓점 (n, 4, 2), 남은 면적 비율 (n,))
+    """
+    x0, y0, x1, y1 = region
+    mins, maxs = polygons.min(axis=1), polygons.max(axis=1)
+    inside = (mins[:, 0] >= x0) & (mins[:, 1] >= y0) & (maxs[:, 0] <= x1) & (maxs[:, 1] <= y1)
+    outside = (maxs[:, 0] <= x0) | (maxs[:, 1] <= y0) | (mins[:, 0] >= x1) | (mins[:, 1] >= y1)
+
+    clipped = polygons.astype(np.float64).copy()
+    visibility = np.where(inside, 1.0, 0.0)
+    areas = _polygon_area(polygons)
+    for i in np.flatnonzero(~inside & ~outside):
+        poly = clip_polygon(polygons[i], x0, y0, x1, y1)
+        if len(poly) < 3:
+            continue
+        visibility[i] = _polygon_area(poly) / max(areas[i], 1e-9)
+        clipped[i] = cv2.boxPoints(cv2.minAreaRect(poly.astype(np.float32)))
+    return clipped, visibility
+
+
+def tile_labels(classes, coords, region, image_width, image_height, fmt='yolo', min_visibility=0.5, min_size=2):
+    """
+    이미지 하나의 정규화 라벨을 타일 하나의 정규화 라벨로 바꾼다.
+    min_visibility보다 적게 남거나 잘린 뒤 폭/높이가 min_size 픽셀보다 작은 박스는 버린다.
+    반환값: (classes, coords) — 좌표는 타일 크기로 다시 정규화한 [0, 1] 값
+    """
+    x0, y0, x1, y1 = region
+    tw, th = x1 - x0, y1 - y0
+    scale = np.array([image_width, image_height], dtype=np.float64)
+    if fmt == 'obb':
+        pts = np.asarray(coords, dtype=np.float64).reshape(-1, 4, 2) * scale
+        clipped, visibility = clip_polygons(pts, region)
+        size = clipped.max(axis=1) - clipped.min(axis=1)
+        keep = (visibility >= min_visibility) & (size[:, 0] >= min_size) & (size[:, 1] >= min_size)
+        out = (clipped[keep] - [x0, y0]) / [tw, th]
+        return classes[keep], np.clip(out, 0, 1).reshape(-1, 8)
+
+    xywh = np.asarray(coords, dtype=np.float64).reshape(-1, 4)
+    xyxy = np.concatenate([(xywh[:, :2] - xywh[:, 2:] / 2) * scale, (xywh[:, :2] + xywh[:, 2:] / 2) * scale], axis=1)
+    clipped, visibility = clip_boxes(xyxy, region)
+    w, h = clipped[:, 2] - clipped[:, 0], clipped[:, 3] - clipped[:, 1]
+    keep = (visibility >= min_visibility) & (w >= min_size) & (h >= min_size)
+    c = clipped[keep]
+    out = np.stack([((c[:, 0] + c[:, 2]) / 2 - x0) / tw, ((c[:, 1] + c[:, 3]) / 2 - y0) / th,
+                    (c[:, 2] - c[:, 0]) / tw, (c[:, 3] - c[:, 1]) / th], axis=1)
+    return classes[keep], out
+
+
+def tile_name(stem, region):
+    return f"{stem}_x{region[0]}_y{region[1]}"
+
+
+_worker = {}
+
+
+def _init_worker(output_dir, fmt, tile_size, overlap, output_size, min_visibility, keep_empty):
+    cv2.setNumThreads(0)
+    _worker.update(output_dir=output_dir, fmt=fmt, tile_size=tile_size, overlap=overlap, output_size=output_size,
+                   min_visibility=min_visibility, keep_empty=keep_empty)
+
+
+def tile_image(image_path, classes, coords):
+    """
+    원본 하나를 타일로 잘라 images/labels에 저장한다. 설정은 _init_worker로 받은 값을 쓴다.
+    반환값: (저장한 파일 목록, 타일 수, 박스 수)
+    """
+    cfg = _worker
+    image = cv2.imread(image_path)
+    if image is None:
+        raise ValueError(f"이미지를 불러올 수 없습니다: {image_path}")
+    h, w = image.shape[:2]
+    stem, ext = os.path.splitext(os.path.basename(image_path))
+    image_dir = os.path.join(cfg['output_dir'], "images")
+    label_dir = os.path.join(cfg['output_dir'], "labels")
+
+    outputs, n_tiles, n_boxes = [], 0, 0
+    for region in tile_grid(w, h, cfg['tile_size'], cfg['overlap']).tolist():
+        tile_classes, tile_coords = tile_labels(classes, coords, region, w, h, cfg['fmt'], cfg['min_visibility'])
+        if len(tile_classes) == 0 and not cfg['keep_empty']:
+            continue
+        x0, y0, x1, y1 = region
+        crop = image[y0:y1, x0:x1]
+        if cfg['output_size'] and crop.shape[:2] != (cfg['output_size'], cfg['output_size']):
+            crop = cv2.resize(crop, (cfg['output_size'], cfg['output_size']), interpolation=cv2.INTER_AREA)
+        name = tile_name(stem, region)
+        tile_path = os.path.join(image_dir, name + ext)
+        label_path = os.path.join(label_dir, name + ".txt")
+        cv2.imwrite(tile_path, crop)
+        write_labels(label_path, tile_classes, tile_coords)
+        outputs += [tile_path, label_path]
+        n_tiles += 1
+        n_boxes += len(tile_classes)
+    return outputs, n_tiles, n_boxes
+
+
+def _tile_chunk(tasks):
+    results = []
+    for image_path, classes, coords in tasks:
+        try:
+            results.append((image_path, *tile_image(image_path, classes, coords), None))
+        except Exception as e:
+            results.append((image_path, [], 0, 0, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def tile_dataset(image_dir, label_path, output_dir, fmt='yolo', tile_size=1600, overlap=0.2, output_size=800,
+                 min_visibility=0.5, keep_empty=False, workers=None, chunk_size=4, manifest=None):
+    """
+    image_dir의 원본과 label_path(txt 폴더 또는 라벨 저장소)의 라벨로 타일 데이터셋을 output_dir/images, labels에 만든다.
+    output_size를 주면 타일을 그 크기로 줄여 저장한다 (None이면 원본 해상도 그대로).
+    manifest(StageManifest)를 주면 원본 이미지와 라벨이 바뀌지 않은 이미지는 건너뛴다.
+    """
+    os.makedirs(os.path.join(output_dir, "images"), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, "labels"), exist_ok=True)
+    label_source = open_labels(label_path, fmt)
+    with os.scandir(image_dir) as entries:
+        image_paths = sorted(e.path for e in entries if e.name.lower().endswith(IMAGE_EXTENSIONS))
+
+    tasks, digests, skipped, missing = [], {}, 0, 0
+    for image_path in image_paths:
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        labels = label_source.get(stem)
+        if labels is None:
+            missing += 1
+            continue
+        label_digest = hashlib.sha1(labels[0].tobytes() + labels[1].tobytes()).hexdigest()
+        if manifest is not None and manifest.is_current(stem, [image_path], label_digest=label_digest):
+            skipped += 1
+            continue
+        digests[image_path] = label_digest
+        # 저장소 라벨은 mmap 슬라이스이므로 워커로 넘기기 전에 복사한다
+        tasks.append((image_path, np.array(labels[0]), np.array(labels[1])))
+    print(f"ℹ️ 라벨 없음 {missing}개, 변경 없음 스킵 {skipped}개, 타일 생성 대상 {len(tasks)}개")
+
+    meter = ThroughputMeter("타일 생성", total=len(tasks), unit="images")
+    errors = []
+    initargs = (output_dir, fmt, tile_size, overlap, output_size, min_visibility, keep_empty)
+    for results in imap_parallel(_tile_chunk, chunked(tasks, chunk_size), workers=workers,
+                                 initializer=_init_worker, initargs=initargs):
+        for image_path, outputs, n_tiles, n_boxes, error in results:
+            if error is not None:
+                errors.append(f"{image_path}: {error}")
+                continue
+            if manifest is not None:
+                stem = os.path.splitext(os.path.basename(image_path))[0]
+                previous = manifest.get(stem)
+                # 타일 배치가 바뀌어 예전 타일 중 이번에 만들지 않은 것은 지운다
+                for path in set(previous['outputs'] if previous else []) - set(outputs):
+                    if os.path.exists(path):
+                        os.remove(path)
+                manifest.record(stem, [image_path], outputs, label_digest=digests[image_path])
+        meter.update(len(results), tiles=sum(r[2] for r in results), boxes=sum(r[3] for r in results))
+
+    if manifest is not None:
+        for key in manifest.stale_keys():
+            manifest.forget(key, remove_outputs=True)
+        manifest.save()
+    summary = meter.summary()
+    for err in errors:
+        print(f"❌ 타일 생성 실패: {err}")
+    return summary
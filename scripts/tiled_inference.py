@@ -0,0 +1,257 @@
+# scripts/tiled_inference.py
+# 3904×3904 원본을 겹치는 타일로 잘라 추론하고, 타일 경계의 중복 검출을 합쳐 원본 좌표의 박스를 돌려준다.
+# 학습은 3904 → 800으로 줄인 이미지로 했기 때문에 Chip/CSolder 같은 작은 부품은 통째로 추론하면 몇 픽셀밖에 안 된다.
+# 타일 크기(TILE_SIZE)를 imgsz보다 크게 잡으면 학습 때와 비슷한 축척을 유지하면서 작은 부품의 해상도를 높일 수 있다.
+#
+# - 타일은 여러 이미지에 걸쳐 batch 개씩 묶어 model.predict에 한 번에 넣는다 (CPU에서도 호출 횟수를 줄인다).
+# - include_full=True면 전체 이미지를 줄여서 한 번 더 추론해, 타일보다 큰 부품도 놓치지 않는다.
+# - 병합: 'nms' (점수 순 억제) 또는 'wbf' (겹치는 박스를 점수 가중 평균으로 합침). 같은 클래스끼리만 합친다.
+#   타일 경계에서 잘린 박스는 온전한 박스와 IoU가 낮으므로 match_metric='ios'(작은 박스 기준 겹침 비율)를 기본으로 쓴다.
+# - OBB 모델은 꼭짓점 4개 다각형을 돌려주며, 병합할 때는 다각형끼리의 회전 박스 겹침을 잰다 (nms만 지원).
+import os
+
+import cv2
+import numpy as np
+
+from box_geometry import METRICS, iou_matrix
+from obb_geometry import rotated_nms
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+MERGE_METHODS = ('nms', 'wbf')
+
+
+def tile_grid(width, height, tile_size, overlap=0.2):
+    """
+    이미지를 tile_size 정사각형 타일로 덮는 (x0, y0, x1, y1) 목록 (n, 4).
+    타일 간격은 tile_size × (1 - overlap)이고, 마지막 타일은 이미지 끝에 맞춘다.
+    """
+    def starts(length):
+        if length <= tile_size:
+            return np.array([0])
+        stride = max(1, int(round(tile_size * (1 - overlap))))
+        s = np.arange(0, length - tile_size, stride)
+        return np.append(s, length - tile_size)
+
+    xs, ys = starts(width), starts(height)
+    x0, y0 = np.meshgrid(xs, ys)
+    x0, y0 = x0.ravel(), y0.ravel()
+    return np.stack([x0, y0, np.minimum(x0 + tile_size, width), np.minimum(y0 + tile_size, height)], axis=1)
+
+
+def nms(boxes, scores, classes, threshold=0.5, metric='iou'):
+    """클래스별 NMS. 클래스마다 좌표를 떨어뜨려 한 번의 반복으로 처리한다. 반환값: 남길 인덱스 (점수 내림차순)."""
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=np.int64)
+    offset = (boxes.max() + 1) * classes.astype(boxes.dtype)
+    shifted = boxes + offset[:, None]
+    order = np.argsort(-scores, kind='stable')
+    keep = []
+    while len(order):
+        i = order[0]
+        keep.append(i)
+        if len(order) == 1:
+            break
+        rest = order[1:]
+        order = rest[iou_matrix(shifted[i], shifted[rest], 'xyxy', metric)[0] <= threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def weighted_box_fusion(boxes, scores, classes, threshold=0.55, metric='iou'):
+    """
+    클래스별 WBF. 점수 순으로 보면서 이미 만든 묶음(합친 박스)과 threshold 넘게 겹치면 그 묶음에 넣고,
+    묶음 좌표는 점수 가중 평균, 점수는 묶음의 최고 점수로 한다.
+    반환값: (boxes, scores, classes)
+    """
+    out_boxes, out_scores, out_classes = [], [], []
+    for c in np.unique(classes):
+        idx = np.flatnonzero(classes == c)
+        idx = idx[np.argsort(-scores[idx], kind='stable')]
+        fused = np.zeros((0, 4), dtype=np.float64)
+        weight_sum = np.zeros(0)
+        coord_sum = np.zeros((0, 4))
+        best = np.zeros(0)
+        for i in idx:
+            if len(fused):
+                overlap = iou_matrix(boxes[i], fused, 'xyxy', metric)[0]
+                j = int(np.argmax(overlap))
+                if overlap[j] > threshold:
+                    weight_sum[j] += scores[i]
+                    coord_sum[j] += scores[i] * boxes[i]
+                    fused[j] = coord_sum[j] / weight_sum[j]
+                    continue
+            fused = np.vstack([fused, boxes[i]])
+            weight_sum = np.append(weight_sum, scores[i])
+            coord_sum = np.vstack([coord_sum, scores[i] * boxes[i]])
+            best = np.append(best, scores[i])
+        out_boxes.append(fused)
+        out_scores.append(best)
+        out_classes.append(np.full(len(fused), c, dtype=classes.dtype))
+    if not out_boxes:
+        return boxes[:0], scores[:0], classes[:0]
+    return np.concatenate(out_boxes), np.concatenate(out_scores), np.concatenate(out_classes)
+
+
+def polygons_to_xyxy(polygons):
+    """(n, 4, 2) 다각형을 감싸는 축 정렬 박스 (n, 4)."""
+    return np.concatenate([polygons.min(axis=1), polygons.max(axis=1)], axis=1)
+
+
+def _empty(obb):
+    result = {'boxes': np.zeros((0, 4), np.float32), 'scores': np.zeros(0, np.float32), 'classes': np.zeros(0, np.int64)}
+    if obb:
+        result['polygons'] = np.zeros((0, 4, 2), np.float32)
+    return result
+
+
+def read_result(result, obb):
+    """ultralytics Results 하나에서 (boxes xyxy, polygons 또는 None, scores, classes)를 numpy로 꺼낸다."""
+    if obb:
+        polygons = result.obb.xyxyxyxy.cpu().numpy().reshape(-1, 4, 2)
+        return (polygons_to_xyxy(polygons), polygons,
+                result.obb.conf.cpu().numpy(), result.obb.cls.cpu().numpy().astype(np.int64))
+    return (result.boxes.xyxy.cpu().numpy(), None,
+            result.boxes.conf.cpu().numpy(), result.boxes.cls.cpu().numpy().astype(np.int64))
+
+
+class TiledPredictor:
+    """
+    ultralytics 모델(YOLO 인스턴스)을 감싸서 원본 해상도 이미지를 타일 단위로 추론한다.
+    predict(images)는 이미지마다 {'boxes' (n, 4) xyxy 원본 픽셀, 'scores', 'classes', 'size' (w, h)[, 'polygons' (n, 4, 2)]}를
+    돌려준다.
+    """
+
+    def __init__(self, model, tile_size=1600, overlap=0.2, imgsz=800, batch=8, conf=0.1, iou=0.5,
+                 merge='nms', merge_threshold=0.5, match_metric='ios', include_full=True, drop_edge=True):
+        if merge not in MERGE_METHODS:
+            raise ValueError(f"지원하지 않는 병합 방식: {merge} (가능: {', '.join(MERGE_METHODS)})")
+        if match_metric not in METRICS:
+            raise ValueError(f"지원하지 않는 겹침 기준: {match_metric} (가능: {', '.join(METRICS)})")
+        self.model = model
+        self.obb = getattr(model, 'task', None) == 'obb'
+        if self.obb and merge == 'wbf':
+            raise ValueError("OBB 모델은 nms 병합만 지원합니다")
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.imgsz = imgsz
+        self.batch = batch
+        self.conf = conf
+        self.iou = iou
+        self.merge = merge
+        self.merge_threshold = merge_threshold
+        self.match_metric = match_metric
+        self.include_full = include_full
+        # 타일 안쪽 경계(이미지 가장자리가 아닌 쪽)에 붙은 검출은 잘린 부품일 가능성이 높아 버린다
+        # (겹치는 이웃 타일에서 온전한 모습으로 다시 검출된다)
+        self.drop_edge = drop_edge
+        self.edge_margin = 2
+
+    def _predict_batch(self, crops):
+        return self.model.predict(crops, imgsz=self.imgsz, conf=self.conf, iou=self.iou, verbose=False)
+
+    def _jobs(self, image):
+        """이미지 하나의 (잘라낸 이미지, x0, y0, 타일 영역) 목록. 전체 이미지 추론은 타일 영역이 None이다."""
+        h, w = image.shape[:2]
+        jobs = []
+        for x0, y0, x1, y1 in tile_grid(w, h, self.tile_size, self.overlap).tolist():
+            jobs.append((image[y0:y1, x0:x1], x0, y0, (x0, y0, x1, y1)))
+        if self.include_full and len(jobs) > 1:
+            jobs.append((image, 0, 0, None))
+        return jobs
+
+    def _edge_mask(self, boxes, region, width, height):
+        """타일 내부 경계에 닿은 박스 (이미지 바깥 경계에 닿은 건 남긴다)."""
+        x0, y0, x1, y1 = region
+        m = self.edge_margin
+        touch = np.zeros(len(boxes), dtype=bool)
+        if x0 > 0:
+            touch |= boxes[:, 0] <= x0 + m
+        if y0 > 0:
+            touch |= boxes[:, 1] <= y0 + m
+        if x1 < width:
+            touch |= boxes[:, 2] >= x1 - m
+        if y1 < height:
+            touch |= boxes[:, 3] >= y1 - m
+        return touch
+
+    def _merge(self, parts):
+        if not parts:
+            return _empty(self.obb)
+        boxes = np.concatenate([p[0] for p in parts]).astype(np.float64)
+        scores = np.concatenate([p[2] for p in parts])
+        classes = np.concatenate([p[3] for p in parts])
+        if self.merge == 'wbf':
+            boxes, scores, classes = weighted_box_fusion(boxes, scores, classes, self.merge_threshold, self.match_metric)
+            return {'boxes': boxes.astype(np.float32), 'scores': scores.astype(np.float32), 'classes': classes}
+
+        if self.obb:
+            polygons = np.concatenate([p[1] for p in parts]).astype(np.float64)
+            keep = rotated_nms(polygons, scores, classes, self.merge_threshold, self.match_metric)
+        else:
+            keep = nms(boxes, scores, classes, self.merge_threshold, self.match_metric)
+        result = {'boxes': boxes[keep].astype(np.float32), 'scores': scores[keep].astype(np.float32),
+                  'classes': classes[keep]}
+        if self.obb:
+            result['polygons'] = polygons[keep].astype(np.float32)
+        return result
+
+    def predict(self, images):
+        """
+        images: BGR numpy 배열 또는 이미지 경로 목록. 모든 이미지의 타일을 모아 batch 개씩 추론한다.
+        반환값: 이미지별 검출 딕셔너리 목록 (입력 순서)
+        """
+        jobs = []  # (이미지 번호, 잘라낸 이미지, x0, y0, 타일 영역)
+        sizes = []
+        for n, image in enumerate(images):
+            if isinstance(image, str):
+                path = image
+                image = cv2.imread(path)
+                if image is None:
+                    raise ValueError(f"이미지를 불러올 수 없습니다: {path}")
+            sizes.append(image.shape[:2])
+            jobs.extend((n, *job) for job in self._jobs(image))
+
+        parts = [[] for _ in sizes]
+        for start in range(0, len(jobs), self.batch):
+            batch = jobs[start:start + self.batch]
+            results = self._predict_batch([job[1] for job in batch])
+            for (n, _, x0, y0, region), result in zip(batch, results):
+                boxes, polygons, scores, classes = read_result(result, self.obb)
+                shift = np.array([x0, y0, x0, y0], dtype=boxes.dtype)
+                boxes = boxes + shift
+                if polygons is not None:
+                    polygons = polygons + np.array([x0, y0], dtype=polygons.dtype)
+                if self.drop_edge and region is not None and len(boxes):
+                    h, w = sizes[n]
+                    keep = ~self._edge_mask(boxes, region, w, h)
+                    boxes, scores, classes = boxes[keep], scores[keep], classes[keep]
+                    if polygons is not None:
+                        polygons = polygons[keep]
+                parts[n].append((boxes, polygons, scores, classes))
+        merged = [self._merge(p) for p in parts]
+        for result, (h, w) in zip(merged, sizes):
+            result['size'] = (w, h)
+        return merged
+
+    def predict_directory(self, image_dir, images_per_call=4):
+        """image_dir의 이미지를 images_per_call장씩 추론하며 (경로, 검출 결과)를 하나씩 돌려준다."""
+        with os.scandir(image_dir) as entries:
+            paths = sorted(e.path for e in entries if e.name.lower().endswith(IMAGE_EXTENSIONS))
+        for start in range(0, len(paths), images_per_call):
+            chunk = paths[start:start + images_per_call]
+            for path, result in zip(chunk, self.predict(chunk)):
+                yield path, result
+
+
+def normalized_labels(result, obb):
+    """
+    검출 결과를 라벨 파일용 (classes, coords)로 바꾼다 (result['size']로 정규화).
+    obb면 꼭짓점 8개(x1 y1 ... y4), 아니면 YOLO (x_center, y_center, w, h). 좌표는 [0, 1]로 정규화한다.
+    """
+    width, height = result['size']
+    if obb:
+        pts = result['polygons'] / np.array([width, height], dtype=np.float32)
+        return result['classes'], np.clip(pts, 0, 1).reshape(-1, 8)
+    b = result['boxes']
+    xywh = np.stack([(b[:, 0] + b[:, 2]) / 2 / width, (b[:, 1] + b[:, 3]) / 2 / height,
+                     (b[:, 2] - b[:, 0]) / width, (b[:, 3] - b[:, 1]) / height], axis=1)
+    return result['classes'], np.clip(xywh, 0, 1)